@@ -0,0 +1,60 @@
+"""A script to compare the latency and tracking error of the inverse kinematics (`end_effector`)
+and the damped least-squares jacobian (`end_effector_dls`) end-effector controllers
+while following a circle in the workspace"""
+import time as time
+import numpy as np
+from lanro_gym.simulation import PyBulletSimulation
+from lanro_gym.robots import Panda
+
+total_steps = 500
+circle_radius = 0.1
+circle_steps = 250
+
+# forward kinematics of the joint targets with a second robot
+fk_sim = PyBulletSimulation()
+fk_robot = Panda(fk_sim)
+
+
+def target_error(target_pos, target_orn, joint_angles):
+    fk_sim.set_joint_angles(fk_robot.body_name, fk_robot.arm_joints, joint_angles)
+    link_state = fk_sim.get_link_state(fk_robot.body_name, fk_robot.ee_link)
+    pos_error = np.linalg.norm(np.array(link_state[0]) - target_pos)
+    orn_error = 2 * np.arccos(np.clip(np.abs(np.dot(link_state[1], target_orn)), 0, 1))
+    return pos_error, orn_error
+
+
+for action_type in ['end_effector', 'end_effector_dls']:
+    sim = PyBulletSimulation()
+    robot = Panda(sim, fixed_gripper=True, action_type=action_type)
+    robot.reset()
+    circle_center = robot.get_ee_position() - np.array([circle_radius, 0, 0])
+    target_orn = np.array(robot.default_arm_orn_RPY) / np.linalg.norm(robot.default_arm_orn_RPY)
+    latencies, solution_errors, tracking_errors, orn_errors = [], [], [], []
+    goto_joint_poses = robot.goto_joint_poses
+    joint_targets = []
+
+    def recording_goto_joint_poses(joint_poses, gripper):
+        joint_targets.append(np.array(joint_poses)[:robot.num_DOF])
+        goto_joint_poses(joint_poses, gripper)
+
+    robot.goto_joint_poses = recording_goto_joint_poses
+    for step in range(total_steps):
+        angle = 2 * np.pi * (step + 1) / circle_steps
+        waypoint = circle_center + circle_radius * np.array([np.cos(angle), np.sin(angle), 0])
+        action = np.clip((waypoint - robot.get_ee_position()) / robot.max_joint_change, -1, 1)
+        ee_target = robot.get_ee_position() + action * robot.max_joint_change
+        start_t = time.perf_counter()
+        robot.set_action(action)
+        latencies.append(time.perf_counter() - start_t)
+        solution_errors.append(target_error(ee_target, target_orn, joint_targets[-1])[0])
+        sim.step()
+        tracking_errors.append(np.linalg.norm(robot.get_ee_position() - ee_target))
+        ee_orn = sim.get_link_state(robot.body_name, robot.ee_link)[1]
+        orn_errors.append(2 * np.arccos(np.clip(np.abs(np.dot(ee_orn, target_orn)), 0, 1)))
+    sim.close()
+    latencies = np.array(latencies) * 1e6
+    print(f"{action_type}: set_action median {np.median(latencies):.0f} us, p95 {np.percentile(latencies, 95):.0f} us, "
+          f"joint target error median {np.median(solution_errors) * 1000:.3f} mm, "
+          f"tracking error median {np.median(tracking_errors) * 1000:.3f} mm, "
+          f"p95 {np.percentile(tracking_errors, 95) * 1000:.3f} mm, "
+          f"orientation deviation median {np.degrees(np.median(orn_errors)):.3f} deg")
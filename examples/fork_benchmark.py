@@ -0,0 +1,34 @@
+"""A script to measure the time to the first step and the memory of each worker of a
+`lanro_gym.vector.SharedMemoryVectorEnv` for different start methods of the worker processes"""
+import time as time
+import numpy as np
+import lanro_gym
+from lanro_gym import vector
+
+env_id = "PandaNLPush2ColorShapeSizeHIAR-v0"
+num_envs = 4
+
+
+def memory_mb(pid: int):
+    """Resident and proportional set size of a process, shared pages count fully to the
+    resident set size, but are split among the sharing processes in the proportional set size"""
+    memory = {}
+    with open(f"/proc/{pid}/smaps_rollup") as smaps:
+        for line in smaps:
+            name, value = line.split(":", 1) if ":" in line else (line, "")
+            if name in ("Rss", "Pss"):
+                memory[name] = int(value.split()[0]) / 1024
+    return memory["Rss"], memory["Pss"]
+
+
+if __name__ == "__main__":
+    for context in ["spawn", "forkserver", "fork"]:
+        start_t = time.perf_counter()
+        vec_env = vector.make(env_id, num_envs, context=context)
+        vec_env.reset(seed=0)
+        vec_env.step(np.zeros(vec_env.action_space.shape, dtype=np.float32))
+        first_step_t = time.perf_counter() - start_t
+        worker_memory = np.array([memory_mb(process.pid) for process in vec_env.processes])
+        vec_env.close()
+        print(f"{env_id} {num_envs} workers {context}: first step after {first_step_t:.2f} s, "
+              f"RSS {worker_memory[:, 0].mean():.0f} MB, PSS {worker_memory[:, 1].mean():.0f} MB per worker")
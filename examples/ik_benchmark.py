@@ -0,0 +1,98 @@
+"""A script to compare the accuracy and latency of the inverse kinematics settings for the end-effector action types
+and of planning many poses at once with the analytic inverse kinematics"""
+import time as time
+import numpy as np
+from lanro_gym.simulation import PyBulletSimulation
+from lanro_gym.robots import Panda
+
+total_steps = 300
+action_types = ['end_effector', 'absolute_rpy', 'relative_rpy', 'absolute_quat', 'relative_quat']
+ik_settings = [
+    dict(ik_max_iterations=100, ik_residual_threshold=1e-5, ik_warm_start=False),
+    dict(ik_max_iterations=100, ik_residual_threshold=1e-5, ik_warm_start=True),
+    dict(ik_max_iterations=20, ik_residual_threshold=1e-4, ik_warm_start=True),
+    dict(ik_max_iterations=5, ik_residual_threshold=1e-3, ik_warm_start=True),
+    dict(ik_max_iterations=1, ik_residual_threshold=1e-3, ik_warm_start=True),
+    dict(ik_solver='analytic'),
+]
+total_plan_poses = 1000
+
+# forward kinematics of the solutions with a second robot
+fk_sim = PyBulletSimulation()
+fk_robot = Panda(fk_sim)
+
+
+def pose_error(target_pos, target_orn, joint_angles):
+    fk_sim.set_joint_angles(fk_robot.body_name, fk_robot.arm_joints, joint_angles)
+    link_state = fk_sim.get_link_state(fk_robot.body_name, fk_robot.ee_link)
+    pos_error = np.linalg.norm(np.array(link_state[4]) - target_pos)
+    orn_error = 0.0
+    if target_orn is not None:
+        target_orn = np.array(target_orn) / np.linalg.norm(target_orn)
+        orn_error = 2 * np.arccos(np.clip(np.abs(np.dot(link_state[5], target_orn)), 0, 1))
+    return pos_error, orn_error
+
+
+def sample_action(robot, action_type, np_random):
+    if action_type.startswith('absolute'):
+        # absolute poses close to the current end-effector pose
+        pos = robot.get_ee_position() + np_random.uniform(-0.05, 0.05, 3)
+        rpy = robot.sim.get_euler_from_quaternion(robot.default_arm_orn_RPY) + np_random.uniform(-0.1, 0.1, 3)
+        if action_type == 'absolute_rpy':
+            return np.concatenate([pos, rpy])
+        return np.concatenate([pos, robot.sim.get_quaternion_from_euler(rpy)])
+    return robot.action_space.sample()
+
+
+for action_type in action_types:
+    for ik_setting in ik_settings:
+        sim = PyBulletSimulation()
+        robot = Panda(sim, fixed_gripper=True, action_type=action_type, **ik_setting)
+        robot.action_space.seed(0)
+        robot.reset()
+        np_random = np.random.default_rng(0)
+        latencies, pos_errors, orn_errors = [], [], []
+        solve = robot.inverse_kinematics
+
+        def timed_inverse_kinematics(pos, orn=None):
+            start_t = time.perf_counter()
+            joint_angles = solve(pos, orn)
+            latencies.append(time.perf_counter() - start_t)
+            pos_error, orn_error = pose_error(pos, orn, joint_angles)
+            pos_errors.append(pos_error)
+            orn_errors.append(orn_error)
+            return joint_angles
+
+        robot.inverse_kinematics = timed_inverse_kinematics
+        for _ in range(total_steps):
+            robot.set_action(sample_action(robot, action_type, np_random))
+            sim.step()
+        sim.close()
+        print(f"{action_type} {ik_setting}: {np.mean(latencies) * 1e6:.0f} us, "
+              f"position error median {np.median(pos_errors) * 1000:.3f} mm, "
+              f"p95 {np.percentile(pos_errors, 95) * 1000:.3f} mm, "
+              f"orientation error median {np.degrees(np.median(orn_errors)):.3f} deg")
+
+# batch planning of poses, e.g. the waypoints of scripted demonstrations
+sim = PyBulletSimulation()
+robot = Panda(sim, fixed_gripper=True)
+robot.reset()
+np_random = np.random.default_rng(0)
+positions = robot.get_ee_position() + np_random.uniform(-0.15, 0.15, (total_plan_poses, 3))
+rpys = sim.get_euler_from_quaternion(robot.default_arm_orn_RPY) + np_random.uniform(-0.3, 0.3, (total_plan_poses, 3))
+orientations = np.array([sim.get_quaternion_from_euler(rpy) for rpy in rpys])
+start_t = time.perf_counter()
+pybullet_solutions = [robot.inverse_kinematics(pos, orn) for pos, orn in zip(positions, orientations)]
+pybullet_time = time.perf_counter() - start_t
+start_t = time.perf_counter()
+analytic_solutions = robot.analytic_inverse_kinematics(positions, orientations)
+analytic_time = time.perf_counter() - start_t
+sim.close()
+for solver, solutions, plan_time in [('pybullet', pybullet_solutions, pybullet_time),
+                                     ('analytic', analytic_solutions, analytic_time)]:
+    solved = [(pos, orn, joint_angles) for pos, orn, joint_angles in zip(positions, orientations, solutions)
+              if not np.isnan(joint_angles[0])]
+    pos_errors, orn_errors = np.array([pose_error(*solution) for solution in solved]).T
+    print(f"plan {total_plan_poses} poses with {solver}: {plan_time / total_plan_poses * 1e6:.0f} us per pose, "
+          f"{len(solved)} solved, position error median {np.median(pos_errors) * 1000:.3f} mm, "
+          f"orientation error median {np.degrees(np.median(orn_errors)):.3f} deg")
@@ -0,0 +1,60 @@
+"""A script to measure the IK cache on the scripted grasping trajectories of `scripted_grasp.py`,
+which are replayed in a second pass, e.g., to record the same demonstrations with other observations"""
+import gymnasium as gym
+import lanro_gym
+import time as time
+import numpy as np
+from lanro_gym.robots.ik_cache import IKCache
+
+total_ep = 20
+ik_cache_settings = [
+    None,
+    dict(),
+    dict(warm_start_radius=0.0),
+    dict(pos_resolution=5e-3, joint_resolution=2e-2, warm_start_radius=0.0),
+]
+
+
+def run_episode(env, seed):
+    obs, info = env.reset(seed=seed)
+    goal_pos = env.unwrapped.sim.get_base_position(env.unwrapped.task.goal_object_body_key)
+    for i in range(env._max_episode_steps * 2):
+        ee_pos = obs['observation'][:3]
+        if i < 35:
+            action = np.concatenate((goal_pos - ee_pos, [1]))
+        elif i < 45:
+            action = np.concatenate((goal_pos - ee_pos, [-1]))
+        else:
+            action = np.array([0, 0, 0.05, -1])
+        obs, *_ = env.step(action)
+    return obs['observation'][:3]
+
+
+baseline_ee_positions = None
+for ik_cache_setting in ik_cache_settings:
+    env = gym.make("PandaNLLift2Shape-v0")
+    robot = env.unwrapped.robot
+    if ik_cache_setting is not None:
+        robot.ik_cache = IKCache(4096, robot.num_DOF, **ik_cache_setting)
+    goto = robot.goto
+    goto_times = []
+
+    def timed_goto(*args, **kwargs):
+        start_t = time.perf_counter()
+        goto(*args, **kwargs)
+        goto_times.append(time.perf_counter() - start_t)
+
+    robot.goto = timed_goto
+    for replay in range(2):
+        goto_times.clear()
+        if robot.ik_cache is not None:
+            robot.ik_cache.hits = robot.ik_cache.misses = robot.ik_cache.warm_starts = 0
+        final_ee_positions = np.array([run_episode(env, seed) for seed in range(total_ep)])
+        if baseline_ee_positions is None:
+            baseline_ee_positions = final_ee_positions
+        ee_deviation = np.linalg.norm(final_ee_positions - baseline_ee_positions, axis=1).max() * 1000
+        stats = robot.ik_cache.get_stats() if robot.ik_cache is not None else {}
+        goto_times_us = np.array(goto_times) * 1e6
+        print(f"{ik_cache_setting} pass {replay}: goto median {np.median(goto_times_us):.0f} us, "
+              f"mean {np.mean(goto_times_us):.0f} us, max final end-effector deviation {ee_deviation:.2f} mm, {stats}")
+    env.close()
@@ -0,0 +1,15 @@
+"""A script to measure the time to import lanro_gym in a fresh process"""
+import subprocess
+import sys
+import numpy as np
+
+total_runs = 20
+import_code = ("import time; import gymnasium; start_t = time.perf_counter(); import lanro_gym; "
+               "print(time.perf_counter() - start_t)")
+
+import_times = [
+    float(subprocess.check_output([sys.executable, "-c", import_code]).decode().strip().split('\n')[-1])
+    for _ in range(total_runs)
+]
+import_times = np.array(import_times) * 1000
+print(f"import lanro_gym: mean {import_times.mean():.1f} ms, median {np.median(import_times):.1f} ms")
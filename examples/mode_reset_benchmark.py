@@ -0,0 +1,22 @@
+"""A script to compare the reset latency of language-conditioned environments across all object modes"""
+import gymnasium as gym
+import lanro_gym
+from lanro_gym.registration import NL_MODES
+import time as time
+import numpy as np
+
+total_resets = 200
+
+for mode in NL_MODES:
+    for action_repair in ["", "AR"]:
+        env_id = f"PandaNLPush3{'' if mode == 'Default' else mode}{action_repair}-v0"
+        env = gym.make(env_id, use_object_pool=True)
+        env.reset(seed=0)
+        reset_times = []
+        for _ in range(total_resets):
+            start_t = time.perf_counter()
+            env.reset()
+            reset_times.append(time.perf_counter() - start_t)
+        env.close()
+        reset_times = np.array(reset_times) * 1000
+        print(f"{env_id}: median {np.median(reset_times):.3f} ms, p95 {np.percentile(reset_times, 95):.3f} ms")
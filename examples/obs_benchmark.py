@@ -0,0 +1,58 @@
+"""A script to measure the latency and the transient memory allocations of building observations"""
+import tracemalloc
+import gymnasium as gym
+import lanro_gym
+import time as time
+import numpy as np
+
+total_calls = 10000
+total_alloc_calls = 1000
+
+env = gym.make("PandaNLPush3ColorShapeSizeHIAR-v0")
+env.reset(seed=0)
+unwrapped_env = env.unwrapped
+
+
+def measure(fn) -> float:
+    start_t = time.perf_counter()
+    for _ in range(total_calls):
+        fn()
+    return (time.perf_counter() - start_t) / total_calls * 1e6
+
+
+def measure_allocations(fn) -> float:
+    """Mean peak of the bytes allocated during one call on top of the memory in use before it"""
+    tracemalloc.start()
+    fn()
+    transient_bytes = 0
+    for _ in range(total_alloc_calls):
+        current_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn()
+        transient_bytes += tracemalloc.get_traced_memory()[1] - current_bytes
+    tracemalloc.stop()
+    return transient_bytes / total_alloc_calls
+
+
+uncached_encoding_us = measure(
+    lambda: unwrapped_env.encode_instruction(unwrapped_env.pad_instruction(unwrapped_env.task.get_goal())))
+cached_encoding_us = measure(unwrapped_env.get_encoded_instruction)
+get_obs_us = measure(unwrapped_env._get_obs)
+assert np.array_equal(unwrapped_env.get_encoded_instruction(),
+                      unwrapped_env.encode_instruction(unwrapped_env.pad_instruction(unwrapped_env.task.get_goal())))
+
+print(f"instruction encoding: {uncached_encoding_us:.2f} us uncached, {cached_encoding_us:.2f} us cached")
+print(f"_get_obs: {get_obs_us:.2f} us")
+env.close()
+
+for env_id in ["PandaPush-v0", "PandaNLPush3ColorShapeSizeHIAR-v0"]:
+    for copy_obs in [True, False]:
+        env = gym.make(env_id, copy_obs=copy_obs).unwrapped
+        env.reset(seed=0)
+        action = np.zeros(env.action_space.shape)
+        get_obs_us = measure(env._get_obs)
+        get_obs_bytes = measure_allocations(env._get_obs)
+        step_bytes = measure_allocations(lambda: env.step(action))
+        print(f"{env_id} copy_obs={copy_obs}: _get_obs {get_obs_us:.2f} us, {get_obs_bytes:.0f} bytes allocated, "
+              f"step {step_bytes:.0f} bytes allocated")
+        env.close()
@@ -0,0 +1,25 @@
+"""A script to compare the reset latency of the different reset modes"""
+import gymnasium as gym
+import lanro_gym
+import time as time
+import numpy as np
+
+total_resets = 500
+
+for env_id in ["PandaNLPush3ColorShapeSize-v0", "PandaStack3-v0"]:
+    for env_kwargs in [{}, {"use_object_pool": True}, {"snapshot_reset": True}]:
+        if "NL" not in env_id and "use_object_pool" in env_kwargs:
+            continue
+        env = gym.make(env_id, **env_kwargs)
+        env.reset(seed=0)
+        reset_times = []
+        for _ in range(total_resets):
+            start_t = time.perf_counter()
+            env.reset()
+            reset_times.append(time.perf_counter() - start_t)
+            env.step(env.action_space.sample())
+        env.close()
+        reset_times = np.array(reset_times) * 1000
+        print(f"{env_id} {env_kwargs}: "
+              f"{int(total_resets / reset_times.sum() * 1000)} resets/s, "
+              f"median {np.median(reset_times):.3f} ms, p95 {np.percentile(reset_times, 95):.3f} ms")
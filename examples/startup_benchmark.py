@@ -0,0 +1,31 @@
+"""A script to compare the construction time of environments with and without the visual shapes of the robot,
+for the first environment of a fresh process (cold) and further environments of the same process (warm)"""
+import subprocess
+import sys
+import numpy as np
+
+total_runs = 10
+warm_constructions = 10
+construction_code = """
+import time, gymnasium as gym, lanro_gym
+construction_times = []
+for _ in range({constructions}):
+    start_t = time.perf_counter()
+    env = gym.make("{env_id}", visual_shapes={visual_shapes})
+    construction_times.append(time.perf_counter() - start_t)
+    env.close()
+print(construction_times[0], sum(construction_times[1:]) / len(construction_times[1:]))
+"""
+
+for env_id in ["PandaPush-v0", "PandaNLPush2HIAR-v0"]:
+    for visual_shapes in [True, False]:
+        code = construction_code.format(constructions=warm_constructions + 1,
+                                        env_id=env_id,
+                                        visual_shapes=visual_shapes)
+        outputs = [
+            subprocess.check_output([sys.executable, "-c", code], stderr=subprocess.DEVNULL).decode()
+            for _ in range(total_runs)
+        ]
+        times = np.array([output.strip().split('\n')[-1].split() for output in outputs], dtype=float) * 1000
+        print(f"{env_id} visual_shapes={visual_shapes}: cold median {np.median(times[:, 0]):.1f} ms, "
+              f"warm median {np.median(times[:, 1]):.1f} ms")
@@ -0,0 +1,25 @@
+"""A script to compare the throughput of single steps and blocks of actions with `step_many`"""
+import gymnasium as gym
+import lanro_gym
+import time as time
+import numpy as np
+
+total_steps = 1000
+block_size = 10
+
+for env_id in ["PandaReach-v0", "PandaNLPush2-v0", "PandaNLPush2PixelEgo-v0"]:
+    env = gym.make(env_id).unwrapped
+    env.action_space.seed(0)
+    actions = np.stack([env.action_space.sample() for _ in range(block_size)])
+    for mode in ["step", "step_many", "step_many last obs"]:
+        env.reset(seed=0)
+        start_t = time.perf_counter()
+        for _ in range(total_steps // block_size):
+            if mode == "step":
+                for action in actions:
+                    env.step(action)
+            else:
+                env.step_many(actions, all_obs=mode == "step_many")
+        total_t = time.perf_counter() - start_t
+        print(f"{env_id} {mode} (blocks of {block_size}): {int(total_steps / total_t)} steps/s")
+    env.close()
@@ -0,0 +1,29 @@
+"""A script to compare the throughput of N independent environments in a `SyncVectorEnv` with N environments
+stepped together in the cells of a single tiled simulation, `lanro_gym.vector.TiledVectorEnv`"""
+import functools
+import time as time
+import gymnasium as gym
+import lanro_gym
+from lanro_gym import vector
+
+total_vector_steps = {"PandaPush-v0": 200, "PandaNLPush2HIAR-v0": 200}
+env_counts = [1, 4, 16]
+vector_env_types = {
+    "SyncVectorEnv": lambda env_id, num_envs: gym.vector.SyncVectorEnv([functools.partial(gym.make, env_id)] *
+                                                                       num_envs),
+    "TiledVectorEnv": vector.make_tiled,
+}
+
+for env_id, vector_steps in total_vector_steps.items():
+    for num_envs in env_counts:
+        for vector_env_name, vector_env_type in vector_env_types.items():
+            vec_env = vector_env_type(env_id, num_envs)
+            vec_env.action_space.seed(0)
+            actions = [vec_env.action_space.sample() for _ in range(vector_steps)]
+            vec_env.reset(seed=0)
+            start_t = time.perf_counter()
+            for step_actions in actions:
+                vec_env.step(step_actions)
+            total_t = time.perf_counter() - start_t
+            vec_env.close()
+            print(f"{env_id} {num_envs} envs {vector_env_name}: {int(vector_steps * num_envs / total_t)} steps/s")
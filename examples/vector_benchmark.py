@@ -0,0 +1,29 @@
+"""A script to compare the throughput of gymnasium's `AsyncVectorEnv` and `lanro_gym.vector.SharedMemoryVectorEnv`"""
+import functools
+import time as time
+import gymnasium as gym
+import numpy as np
+import lanro_gym
+from lanro_gym import vector
+
+total_vector_steps = {"PandaNLPush2HIAR-v0": 200, "PandaNLPush2PixelEgoHIAR-v0": 20}
+worker_counts = [8, 32, 64]
+vector_env_types = {
+    "AsyncVectorEnv": functools.partial(gym.vector.AsyncVectorEnv, shared_memory=False),
+    "AsyncVectorEnv shared_memory": functools.partial(gym.vector.AsyncVectorEnv, shared_memory=True),
+    "SharedMemoryVectorEnv": vector.SharedMemoryVectorEnv,
+}
+
+for env_id, vector_steps in total_vector_steps.items():
+    for num_envs in worker_counts:
+        for vector_env_name, vector_env_type in vector_env_types.items():
+            vec_env = vector_env_type([functools.partial(gym.make, env_id)] * num_envs)
+            vec_env.action_space.seed(0)
+            actions = [vec_env.action_space.sample() for _ in range(vector_steps)]
+            vec_env.reset(seed=0)
+            start_t = time.perf_counter()
+            for step_actions in actions:
+                vec_env.step(step_actions)
+            total_t = time.perf_counter() - start_t
+            vec_env.close()
+            print(f"{env_id} {num_envs} workers {vector_env_name}: {int(vector_steps * num_envs / total_t)} steps/s")
@@ -1,5 +1,5 @@
 import os
-from typing import Any, Dict, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import gymnasium as gym
 from gymnasium.utils import seeding
@@ -25,7 +25,9 @@ class BaseEnv(gym.Env):
                  sim: PyBulletSimulation,
                  robot: PyBulletRobot,
                  task: Union[Task, LanguageTask],
-                 obs_type: str = "state"):
+                 obs_type: str = "state",
+                 snapshot_reset: bool = False,
+                 copy_obs: bool = True):
         self.sim = sim
         self.metadata = {"render_modes": ["human", "rgb_array"], 'video.frames_per_second': int(np.round(1 / sim.dt))}
         self.reward_range = (-1.0, 0.0)
@@ -33,6 +35,19 @@ class BaseEnv(gym.Env):
         self.action_space = self.robot.action_space
         self.task = task
         self.obs_type = obs_type
+        # restore an in-memory snapshot of the initial scene instead of
+        # resetting the robot joint by joint
+        self.snapshot_reset = snapshot_reset
+        self._snapshot_id: Optional[int] = None
+        if snapshot_reset and isinstance(task, LanguageTask) and not task.use_object_pool:
+            raise ValueError("snapshot_reset requires the task to use an object pool")
+        if not robot.visual_shapes and obs_type == "pixel":
+            raise ValueError("Pixel observations require the visual shapes of the robot")
+        # observations are assembled in preallocated float32 buffers, which are either
+        # copied or returned as read-only views that are overwritten by the next step
+        self.copy_obs = copy_obs
+        # steps since the last reset, `step_many` truncates at the episode length of the spec
+        self._elapsed_steps = 0
 
     def close(self) -> None:
         self.sim.close()
@@ -40,6 +55,74 @@ class BaseEnv(gym.Env):
     def _get_obs(self):
         raise NotImplementedError
 
+    def _output_obs(self, buffer: np.ndarray) -> np.ndarray:
+        """A copy of an observation buffer, or a read-only view of it if `copy_obs` is False"""
+        if self.copy_obs:
+            return buffer.copy()
+        view = buffer.view()
+        view.flags.writeable = False
+        return view
+
+    def _step(self,
+              action: np.ndarray,
+              compute_obs: bool = True) -> Tuple[Optional[Dict[str, np.ndarray]], float, bool, bool, Dict]:
+        """Executes a clipped action, the observation is None if `compute_obs` is False"""
+        self.robot.set_action(action)
+        self.sim.step()
+        return self._finish_step(compute_obs)
+
+    def _finish_step(self,
+                     compute_obs: bool = True) -> Tuple[Optional[Dict[str, np.ndarray]], float, bool, bool, Dict]:
+        """Evaluates a step after the simulation has been stepped. A tiled simulation
+        steps the simulations of several environments at once in between."""
+        raise NotImplementedError
+
+    def _get_max_episode_steps(self) -> Optional[int]:
+        """Episode length of the environment spec. `gym.make` moves it from the spec of the
+        unwrapped environment to the time limit wrapper, so it is read from the registry."""
+        if self.spec is None:
+            return None
+        if self.spec.max_episode_steps is not None:
+            return self.spec.max_episode_steps
+        registered_spec = gym.envs.registry.get(self.spec.id)
+        return None if registered_spec is None else registered_spec.max_episode_steps
+
+    def step_many(self,
+                  actions: np.ndarray,
+                  all_obs: bool = True) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, np.ndarray, List[Dict]]:
+        """Executes a block of actions (K, action_dim) and stops early once the episode terminates
+        or is truncated at `max_episode_steps` of the registered environment spec. Returns the
+        stacked observations of the executed steps, or only the last observation if `all_obs` is False,
+        and the rewards, termination and truncation flags and infos of the executed steps.
+        NOTE: Wrappers, e.g., the time limit of `gym.make`, are bypassed."""
+        if len(actions) == 0:
+            raise ValueError("step_many requires a block of at least one action")
+        actions = np.clip(actions, self.action_space.low, self.action_space.high)
+        max_episode_steps = self._get_max_episode_steps()
+        observations: Dict[str, np.ndarray] = {}
+        rewards, terminations, truncations, infos = [], [], [], []
+        for step_idx, action in enumerate(actions):
+            obs, reward, terminated, truncated, info = self._step(action, compute_obs=all_obs)
+            if max_episode_steps is not None and self._elapsed_steps >= max_episode_steps:
+                truncated = True
+            if all_obs:
+                # written into stacked arrays, as the observations can be views of buffers reused by the next step
+                for key, value in obs.items():
+                    if key not in observations:
+                        observations[key] = np.empty((len(actions), ) + value.shape, dtype=value.dtype)
+                    observations[key][step_idx] = value
+            rewards.append(reward)
+            terminations.append(terminated)
+            truncations.append(truncated)
+            infos.append(info)
+            if terminated or truncated:
+                break
+        if all_obs:
+            obs = {key: stacked_obs[:len(rewards)] for key, stacked_obs in observations.items()}
+        else:
+            obs = self._get_obs()
+        return obs, np.array(rewards, dtype=np.float32), np.array(terminations), np.array(truncations), infos
+
     def getKeyboardEvents(self) -> Dict[int, int]:
         return self.sim.bclient.getKeyboardEvents()
 
@@ -48,8 +131,16 @@ class BaseEnv(gym.Env):
               options: Optional[dict] = None) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
         super().reset(seed=seed, options=options)
         self.task.np_random, seed = seeding.np_random(seed)
+        self._elapsed_steps = 0
         with self.sim.no_rendering():
-            self.robot.reset()
+            if self._snapshot_id is not None:
+                self.sim.restore_state(self._snapshot_id)
+                if self.robot.joint_reset_noise:
+                    self.robot.reset(self.task.np_random)
+            else:
+                self.robot.reset(self.task.np_random)
+                if self.snapshot_reset:
+                    self._snapshot_id = self.sim.save_state()
             self.task.reset()
         info = {"is_success": False}
         return self._get_obs(), info
@@ -18,8 +18,15 @@ DEBUG = int("DEBUG" in os.environ and os.environ["DEBUG"])
 class GoalEnv(BaseEnv):
     ep_end_goal_distance: List = []
 
-    def __init__(self, sim: PyBulletSimulation, robot: PyBulletRobot, task: Task, obs_type: str = "state"):
-        BaseEnv.__init__(self, sim, robot, task, obs_type)
+    def __init__(self,
+                 sim: PyBulletSimulation,
+                 robot: PyBulletRobot,
+                 task: Task,
+                 obs_type: str = "state",
+                 snapshot_reset: bool = False,
+                 copy_obs: bool = True):
+        BaseEnv.__init__(self, sim, robot, task, obs_type, snapshot_reset, copy_obs)
+        self._obs_buffer: Optional[np.ndarray] = None
 
         obs, _ = self.reset()
         self.observation_space = spaces.Dict(
@@ -38,29 +45,47 @@ class GoalEnv(BaseEnv):
                                          dtype=np.float32),
             ))
 
+    def _allocate_obs_buffers(self) -> None:
+        robot_obs_size = len(self.robot.get_obs())
+        task_obs_size = len(self.task.get_obs())
+        self._obs_buffer = np.zeros(robot_obs_size + task_obs_size, dtype=np.float32)
+        self._robot_obs = self._obs_buffer[:robot_obs_size]
+        self._task_obs = self._obs_buffer[robot_obs_size:]
+        self._achieved_goal = np.zeros(len(self.task.get_achieved_goal()), dtype=np.float32)
+        self._desired_goal = np.zeros(len(self.task.get_goal()), dtype=np.float32)
+
     def _get_obs(self) -> Dict[str, np.ndarray]:
-        robot_obs = self.robot.get_obs()
-        task_obs = self.task.get_obs()
-        observation = np.concatenate([robot_obs, task_obs])
-        achieved_goal = self.task.get_achieved_goal()
-        desired_goal = self.task.get_goal()
+        if self._obs_buffer is None:
+            self._allocate_obs_buffers()
+        self.robot.get_obs(out=self._robot_obs)
+        self.task.get_obs(out=self._task_obs)
+        self._achieved_goal[:] = self.task.get_achieved_goal()
+        self._desired_goal[:] = self.task.get_goal()
         return {
-            "observation": observation.copy(),
-            "achieved_goal": achieved_goal.copy(),
-            "desired_goal": desired_goal.copy(),
+            "observation": self._output_obs(self._obs_buffer),
+            "achieved_goal": self._output_obs(self._achieved_goal),
+            "desired_goal": self._output_obs(self._desired_goal),
         }
 
     def step(self, action) -> Tuple[Dict[str, np.ndarray], bool, bool, Dict]:
         action = np.clip(action, self.action_space.low, self.action_space.high)
-        self.robot.set_action(action)
-        self.sim.step()
-        obs = self._get_obs()
+        return self._step(action)
+
+    def _finish_step(self,
+                     compute_obs: bool = True) -> Tuple[Optional[Dict[str, np.ndarray]], float, bool, bool, Dict]:
+        self._elapsed_steps += 1
+        if compute_obs:
+            obs = self._get_obs()
+            achieved_goal, desired_goal = obs["achieved_goal"], obs["desired_goal"]
+        else:
+            obs = None
+            achieved_goal, desired_goal = self.task.get_achieved_goal(), self.task.get_goal()
         truncated = False
         info = {
-            "is_success": self.task.is_success(obs["achieved_goal"], obs["desired_goal"]),
+            "is_success": self.task.is_success(achieved_goal, desired_goal),
         }
         terminated = bool(info["is_success"])
-        reward = self.compute_reward(obs["achieved_goal"], obs["desired_goal"], info)
+        reward = self.compute_reward(achieved_goal, desired_goal, info)
         return obs, reward, terminated, truncated, info
 
     def reset(self,
@@ -1,5 +1,5 @@
 import os
-from typing import Dict, Set, Tuple, Any, Optional
+from typing import Dict, Sequence, Set, Tuple, Any, Optional
 
 import gymnasium as gym
 from gymnasium import spaces
@@ -22,15 +22,36 @@ class LanguageEnv(BaseEnv):
     RobotLanguageEnv is a language-conditioned implementation of `BaseEnv` with a language-specific Gym API.
     """
     discovered_word_idxs: Set = set()
-
-    def __init__(self, sim: PyBulletSimulation, robot: PyBulletRobot, task: LanguageTask, obs_type: str = "state"):
-        BaseEnv.__init__(self, sim, robot, task, obs_type)
-
-        instruction_list = self.task.get_all_instructions()
+    obs_components: Tuple[str, ...] = ("state", "pixel")
+
+    def __init__(self,
+                 sim: PyBulletSimulation,
+                 robot: PyBulletRobot,
+                 task: LanguageTask,
+                 obs_type: str = "state",
+                 snapshot_reset: bool = False,
+                 copy_obs: bool = True,
+                 info_obs: Sequence[str] = ()):
+        BaseEnv.__init__(self, sim, robot, task, obs_type, snapshot_reset, copy_obs)
+        self._obs_buffer: Optional[np.ndarray] = None
+        # observation components, i.e., `state` or `pixel`, added to the info dict in addition to
+        # the observation, each component is only computed if it is observed or requested here
+        unknown_components = set(info_obs) - set(self.obs_components)
+        if unknown_components:
+            raise ValueError(f"Unknown observation components {unknown_components}, use {self.obs_components}")
+        self.info_obs = tuple(info_obs)
+        if "pixel" in self.info_obs and not robot.visual_shapes:
+            raise ValueError("Pixel observations require the visual shapes of the robot")
+
+        self.instruction_space = self.task.get_instruction_space()
         if DEBUG:
-            print("AMOUNT OF INSTRUCTIONS", len(instruction_list))
-        self.word_list, self.max_instruction_len = parse_instructions(instruction_list)
+            print("AMOUNT OF INSTRUCTIONS", len(self.instruction_space))
+        self.word_list, self.max_instruction_len = parse_instructions(self.instruction_space)
         self.vocab = Vocabulary(self.word_list)
+        # encoding of the current instruction, recomputed only if the instruction changes
+        self._encoded_goal_string: Optional[str] = None
+        self._encoded_instruction = np.zeros(self.max_instruction_len, dtype=np.uint16)
+        self._discovered_instruction: Optional[np.ndarray] = None
         obs, _ = self.reset()
         self.compute_reward = self.task.compute_reward
 
@@ -68,27 +89,59 @@ class LanguageEnv(BaseEnv):
                 vocab_properties[word] = 'none'
         return vocab_properties
 
+    def _allocate_obs_buffer(self) -> None:
+        robot_obs_size = len(self.robot.get_obs())
+        task_obs_size = len(self.task.get_obs())
+        self._obs_buffer = np.zeros(robot_obs_size + task_obs_size, dtype=np.float32)
+        self._robot_obs = self._obs_buffer[:robot_obs_size]
+        self._task_obs = self._obs_buffer[robot_obs_size:]
+
+    def _get_state_obs(self) -> np.ndarray:
+        if self._obs_buffer is None:
+            self._allocate_obs_buffer()
+        self.robot.get_obs(out=self._robot_obs)
+        self.task.get_obs(out=self._task_obs)
+        return self._output_obs(self._obs_buffer)
+
+    def _get_pixel_obs(self) -> np.ndarray:
+        # copy the RGB channels of the rendered RGBA pixels once into a contiguous array
+        return self.robot.get_camera_img().copy()
+
+    def _get_obs_component(self, component: str) -> np.ndarray:
+        if component == "pixel":
+            return self._get_pixel_obs()
+        return self._get_state_obs()
+
     def _get_obs(self) -> Dict[str, np.ndarray]:
-        robot_obs = self.robot.get_obs()
-        task_obs = self.task.get_obs()
+        return {
+            "observation": self._get_obs_component(self.obs_type),
+            "instruction": self._output_obs(self.get_encoded_instruction()),
+        }
 
-        if self.obs_type == "pixel":
-            observation = self.robot.get_camera_img().copy()
-        else:
-            observation = np.concatenate([robot_obs, task_obs])
-            if self.sim.render_on:
-                _ = self.robot.get_camera_img()
+    def _add_info_obs(self, info: Dict[str, Any], obs: Optional[Dict[str, np.ndarray]]) -> None:
+        """Adds the requested `info_obs` components to the info dict and reuses the observation if available"""
+        for component in self.info_obs:
+            if obs is not None and component == self.obs_type:
+                info[component] = obs["observation"]
+            else:
+                info[component] = self._get_obs_component(component)
 
+    def get_encoded_instruction(self) -> np.ndarray:
+        """Returns the padded and encoded instruction of the task. The encoding is
+        cached and only recomputed when the instruction changes, i.e., on reset or
+        action repair."""
         current_goal_string = self.task.get_goal()
-        word_indices = self.encode_instruction(self.pad_instruction(current_goal_string))
-
-        return {"observation": observation.copy(), "instruction": word_indices}
+        if current_goal_string != self._encoded_goal_string:
+            self._encoded_instruction = self.encode_instruction(self.pad_instruction(current_goal_string))
+            self._encoded_goal_string = current_goal_string
+        return self._encoded_instruction
 
     def reset(self,
               seed: Optional[int] = None,
               options: Optional[dict] = None) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
         obs, info = super().reset(seed=seed, options=options)
         info["is_success"] = self.task.is_success()
+        self._add_info_obs(info, obs)
         return obs, info
 
     def pad_instruction(self, goal_string) -> str:
@@ -105,7 +158,7 @@ class LanguageEnv(BaseEnv):
 
     def encode_instruction(self, instruction: str) -> np.ndarray:
         word_indices = [self.vocab.word_to_idx(word) for word in instruction.split(' ')]
-        return np.array(word_indices)
+        return np.array(word_indices, dtype=np.uint16)
 
     def decode_instruction(self, instruction_embedding) -> str:
         words = [self.vocab.idx_to_word(idx) for idx in instruction_embedding]
@@ -113,11 +166,17 @@ class LanguageEnv(BaseEnv):
 
     def step(self, action) -> Tuple[Dict[str, np.ndarray], bool, bool, Dict]:
         action = np.clip(action, self.action_space.low, self.action_space.high)
-        self.robot.set_action(action)
-        self.sim.step()
+        return self._step(action)
+
+    def _finish_step(self,
+                     compute_obs: bool = True) -> Tuple[Optional[Dict[str, np.ndarray]], float, bool, bool, Dict]:
+        self._elapsed_steps += 1
         self.task.return_delayed_action_repair()
-        obs = self._get_obs()
-        self.discovered_word_idxs.update(obs['instruction'])
+        obs = self._get_obs() if compute_obs else None
+        encoded_instruction = self.get_encoded_instruction()
+        if self._discovered_instruction is not encoded_instruction:
+            self.discovered_word_idxs.update(encoded_instruction)
+            self._discovered_instruction = encoded_instruction
         info = {
             "is_success": self.task.is_success(),
         }
@@ -134,6 +193,7 @@ class LanguageEnv(BaseEnv):
             # NOTE: set reward to normal punishment, as we like, e.g., NLReach
             # and NLReachHI to behave the same way
             reward = -1.0
+        self._add_info_obs(info, obs)
 
         return obs, reward, terminated, truncated, info
 
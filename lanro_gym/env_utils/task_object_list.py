@@ -1,7 +1,16 @@
 from enum import Enum
-from typing import Dict, List
+import itertools
+import math
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
 from lanro_gym.utils import get_prop_combinations
+from lanro_gym.language_utils import create_commands
 from lanro_gym.env_utils import RGBCOLORS, SHAPES, WEIGHTS, SIZES, TaskObject
+from lanro_gym.env_utils.object_combinations import distinguishable_by_primary_or_secondary, valid_task_object_combination
+
+# tables derived from the object properties, which are shared by all object lists of the same
+# concepts in a process and inherited by forked worker processes of vectorized environments
+_CATALOG_TABLES: Dict[Tuple, Dict[str, Dict]] = {}
 
 
 class TaskObjectList:
@@ -11,8 +20,10 @@ class TaskObjectList:
                  color_mode: bool = False,
                  shape_mode: bool = False,
                  weight_mode: bool = False,
-                 size_mode: bool = False):
+                 size_mode: bool = False,
+                 use_synonyms: bool = False):
         self.sim = sim
+        self.use_synonyms = use_synonyms
         # default colors
         concept_list: List[Enum] = [RGBCOLORS.RED, RGBCOLORS.GREEN, RGBCOLORS.BLUE]
         if color_mode:
@@ -34,6 +45,17 @@ class TaskObjectList:
             concept_list.extend([SIZES.SMALL, SIZES.MEDIUM, SIZES.BIG])
 
         self.objects = self.setup(concept_list)
+        tables = _CATALOG_TABLES.setdefault((tuple(concept_list), use_synonyms), {
+            "pairwise_matrices": {},
+            "goal_selection_counts": {},
+            "sentences": {}
+        })
+        # pairwise relations of goal objects (rows) and non-goal objects (columns) by relation name
+        self._pairwise_matrices: Dict[str, np.ndarray] = tables["pairwise_matrices"]
+        # amount of valid selections of each goal object by selection size and uniqueness
+        self._goal_selection_counts: Dict[Tuple[int, bool], np.ndarray] = tables["goal_selection_counts"]
+        # sentences of each object by command type and action verbs
+        self._sentence_tables: Dict[Tuple, np.ndarray] = tables["sentences"]
 
     def setup(self, concept_list) -> List[TaskObject]:
         objects = []
@@ -78,6 +100,114 @@ class TaskObjectList:
             objects = self.objects
         return [obj.get_properties() for obj in objects]
 
+    def _pairwise_matrix(self, relation) -> np.ndarray:
+        """Read-only matrix of a relation of all object pairs, which is computed once per process"""
+        if relation.__name__ not in self._pairwise_matrices:
+            num_objects = len(self.objects)
+            matrix = np.zeros((num_objects, num_objects), dtype=bool)
+            for goal_idx, non_goal_idx in itertools.permutations(range(num_objects), 2):
+                matrix[goal_idx, non_goal_idx] = relation(self.objects[goal_idx], self.objects[non_goal_idx])
+            matrix.flags.writeable = False
+            self._pairwise_matrices[relation.__name__] = matrix
+        return self._pairwise_matrices[relation.__name__]
+
+    @property
+    def compatibility_matrix(self) -> np.ndarray:
+        """Boolean matrix with `valid_task_object_combination` of all object pairs"""
+        return self._pairwise_matrix(valid_task_object_combination)
+
+    @property
+    def distinguishability_matrix(self) -> np.ndarray:
+        """Boolean matrix with `distinguishable_by_primary_or_secondary` of all object pairs"""
+        return self._pairwise_matrix(distinguishable_by_primary_or_secondary)
+
+    def _next_candidates(self, candidates: np.ndarray, obj_indices: np.ndarray, unique: bool) -> np.ndarray:
+        """Remaining candidates for the objects after each of the selected objects"""
+        next_candidates = np.repeat(candidates[np.newaxis], len(obj_indices), axis=0)
+        next_candidates[np.arange(len(obj_indices)), obj_indices] = False
+        if unique:
+            # objects later in the selection have to be distinguishable from the selected object
+            next_candidates &= self.distinguishability_matrix[obj_indices]
+        return next_candidates
+
+    def _count_selections(self, candidates: np.ndarray, length: int, unique: bool) -> np.ndarray:
+        """Amount of ordered selections of `length` objects from each row of boolean candidates"""
+        num_candidates = candidates.sum(axis=1)
+        if not unique:
+            return np.array([math.perm(num, length) for num in num_candidates], dtype=np.int64)
+        if length == 0:
+            return np.ones(len(candidates), dtype=np.int64)
+        if length == 1:
+            return num_candidates.astype(np.int64)
+        if length == 2:
+            # pairs (a, b) of candidates with a distinguishable from b, float matrix products are exact here
+            candidates = candidates.astype(np.float64)
+            pairs = (candidates @ self.distinguishability_matrix.astype(np.float64)) * candidates
+            return pairs.sum(axis=1).astype(np.int64)
+        counts = np.zeros(len(candidates), dtype=np.int64)
+        for row_idx, row in enumerate(candidates):
+            obj_indices = np.flatnonzero(row)
+            counts[row_idx] = self._count_selections(self._next_candidates(row, obj_indices, unique), length - 1,
+                                                     unique).sum()
+        return counts
+
+    def sample_valid_selection(self, np_random: np.random.Generator, num_obj: int,
+                               unique: bool = False) -> Tuple[np.ndarray, int]:
+        """Sample a goal object and `num_obj - 1` non-goal objects that are a
+        valid combination with the goal object, uniformly over all valid
+        selections. Like drawing random selections until one is valid, the goal
+        object is at a random position of the selection.
+
+        Args:
+            np_random: random number generator
+            num_obj: amount of objects in the selection
+            unique: the objects of the selection, goal object first, have to be
+                distinguishable from all later objects
+        Returns:
+            object indices of the selection and the goal object index
+        """
+        valid_non_goals = self.compatibility_matrix
+        if unique:
+            valid_non_goals = valid_non_goals & self.distinguishability_matrix
+        num_non_goals = num_obj - 1
+        if (num_non_goals, unique) not in self._goal_selection_counts:
+            self._goal_selection_counts[num_non_goals, unique] = self._count_selections(
+                valid_non_goals, num_non_goals, unique)
+        goal_counts = self._goal_selection_counts[num_non_goals, unique]
+        # a single draw over all valid selections and positions of the goal object,
+        # which is decoded into the goal object and one non-goal object after another
+        selection_idx = int(np_random.integers(goal_counts.sum() * num_obj))
+        selection_idx, goal_position = divmod(selection_idx, num_obj)
+        cumulative_counts = np.cumsum(goal_counts)
+        goal_obj_idx = int(np.searchsorted(cumulative_counts, selection_idx, side='right'))
+        selection_idx -= cumulative_counts[goal_obj_idx] - goal_counts[goal_obj_idx]
+        non_goal_indices = []
+        candidates = valid_non_goals[goal_obj_idx]
+        for position in range(num_non_goals):
+            obj_indices = np.flatnonzero(candidates)
+            next_candidates = self._next_candidates(candidates, obj_indices, unique)
+            counts = self._count_selections(next_candidates, num_non_goals - position - 1, unique)
+            cumulative_counts = np.cumsum(counts)
+            candidate_idx = int(np.searchsorted(cumulative_counts, selection_idx, side='right'))
+            selection_idx -= cumulative_counts[candidate_idx] - counts[candidate_idx]
+            non_goal_indices.append(obj_indices[candidate_idx])
+            candidates = next_candidates[candidate_idx]
+        selection = non_goal_indices[:goal_position] + [goal_obj_idx] + non_goal_indices[goal_position:]
+        return np.array(selection), goal_obj_idx
+
+    def get_sentences(self, obj_idx: int, command_type: str, action_verbs: Sequence[str] = ()) -> np.ndarray:
+        """Returns all commands of one type for an object. The commands are
+        created on the first request and reused afterwards."""
+        table_key = (obj_idx, command_type, tuple(action_verbs))
+        if table_key not in self._sentence_tables:
+            self._sentence_tables[table_key] = np.array(
+                sorted(
+                    create_commands(command_type,
+                                    self.objects[obj_idx].get_properties(),
+                                    action_verbs=list(action_verbs),
+                                    use_synonyms=self.use_synonyms)))
+        return self._sentence_tables[table_key]
+
     def __getitem__(self, index) -> TaskObject:
         return self.objects[index]
 
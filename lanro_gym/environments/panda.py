@@ -6,39 +6,121 @@ from lanro_gym.tasks import Reach, Push, Stack, Slide
 
 class PandaReachEnv(GoalEnv):
 
-    def __init__(self, render=False, reward_type="sparse", action_type='end_effector'):
-        sim = PyBulletSimulation(render=render)
-        robot = Panda(sim, fixed_gripper=True, action_type=action_type)
+    def __init__(self,
+                 render=False,
+                 reward_type="sparse",
+                 action_type='end_effector',
+                 snapshot_reset=False,
+                 copy_obs=True,
+                 joint_reset_noise=0.0,
+                 ik_max_iterations=100,
+                 ik_residual_threshold=1e-5,
+                 ik_solver='pybullet',
+                 ik_cache_size=0,
+                 visual_shapes=True,
+                 sim=None):
+        sim = PyBulletSimulation(render=render) if sim is None else sim
+        robot = Panda(sim,
+                      fixed_gripper=True,
+                      action_type=action_type,
+                      joint_reset_noise=joint_reset_noise,
+                      ik_max_iterations=ik_max_iterations,
+                      ik_residual_threshold=ik_residual_threshold,
+                      ik_solver=ik_solver,
+                      ik_cache_size=ik_cache_size,
+                      visual_shapes=visual_shapes)
         task = Reach(
             sim,
             reward_type=reward_type,
             get_ee_position=robot.get_ee_position,
         )
-        GoalEnv.__init__(self, sim, robot, task)
+        GoalEnv.__init__(self, sim, robot, task, snapshot_reset=snapshot_reset, copy_obs=copy_obs)
 
 
 class PandaPushEnv(GoalEnv):
 
-    def __init__(self, render=False, reward_type="sparse", action_type='end_effector'):
-        sim = PyBulletSimulation(render=render)
-        robot = Panda(sim, fixed_gripper=True, action_type=action_type)
+    def __init__(self,
+                 render=False,
+                 reward_type="sparse",
+                 action_type='end_effector',
+                 snapshot_reset=False,
+                 copy_obs=True,
+                 joint_reset_noise=0.0,
+                 ik_max_iterations=100,
+                 ik_residual_threshold=1e-5,
+                 ik_solver='pybullet',
+                 ik_cache_size=0,
+                 visual_shapes=True,
+                 sim=None):
+        sim = PyBulletSimulation(render=render) if sim is None else sim
+        robot = Panda(sim,
+                      fixed_gripper=True,
+                      action_type=action_type,
+                      joint_reset_noise=joint_reset_noise,
+                      ik_max_iterations=ik_max_iterations,
+                      ik_residual_threshold=ik_residual_threshold,
+                      ik_solver=ik_solver,
+                      ik_cache_size=ik_cache_size,
+                      visual_shapes=visual_shapes)
         task = Push(sim, reward_type=reward_type)
-        GoalEnv.__init__(self, sim, robot, task)
+        GoalEnv.__init__(self, sim, robot, task, snapshot_reset=snapshot_reset, copy_obs=copy_obs)
 
 
 class PandaSlideEnv(GoalEnv):
 
-    def __init__(self, render=False, reward_type="sparse", action_type='end_effector'):
-        sim = PyBulletSimulation(render=render)
-        robot = Panda(sim, fixed_gripper=True, action_type=action_type)
+    def __init__(self,
+                 render=False,
+                 reward_type="sparse",
+                 action_type='end_effector',
+                 snapshot_reset=False,
+                 copy_obs=True,
+                 joint_reset_noise=0.0,
+                 ik_max_iterations=100,
+                 ik_residual_threshold=1e-5,
+                 ik_solver='pybullet',
+                 ik_cache_size=0,
+                 visual_shapes=True,
+                 sim=None):
+        sim = PyBulletSimulation(render=render) if sim is None else sim
+        robot = Panda(sim,
+                      fixed_gripper=True,
+                      action_type=action_type,
+                      joint_reset_noise=joint_reset_noise,
+                      ik_max_iterations=ik_max_iterations,
+                      ik_residual_threshold=ik_residual_threshold,
+                      ik_solver=ik_solver,
+                      ik_cache_size=ik_cache_size,
+                      visual_shapes=visual_shapes)
         task = Slide(sim, reward_type=reward_type)
-        GoalEnv.__init__(self, sim, robot, task)
+        GoalEnv.__init__(self, sim, robot, task, snapshot_reset=snapshot_reset, copy_obs=copy_obs)
 
 
 class PandaStackEnv(GoalEnv):
 
-    def __init__(self, render=False, reward_type="sparse", num_obj=2, goal_z_range=0.0, action_type='end_effector'):
-        sim = PyBulletSimulation(render=render)
-        robot = Panda(sim, fixed_gripper=False, action_type=action_type)
+    def __init__(self,
+                 render=False,
+                 reward_type="sparse",
+                 num_obj=2,
+                 goal_z_range=0.0,
+                 action_type='end_effector',
+                 snapshot_reset=False,
+                 copy_obs=True,
+                 joint_reset_noise=0.0,
+                 ik_max_iterations=100,
+                 ik_residual_threshold=1e-5,
+                 ik_solver='pybullet',
+                 ik_cache_size=0,
+                 visual_shapes=True,
+                 sim=None):
+        sim = PyBulletSimulation(render=render) if sim is None else sim
+        robot = Panda(sim,
+                      fixed_gripper=False,
+                      action_type=action_type,
+                      joint_reset_noise=joint_reset_noise,
+                      ik_max_iterations=ik_max_iterations,
+                      ik_residual_threshold=ik_residual_threshold,
+                      ik_solver=ik_solver,
+                      ik_cache_size=ik_cache_size,
+                      visual_shapes=visual_shapes)
         task = Stack(sim, reward_type=reward_type, num_obj=num_obj, goal_z_range=goal_z_range)
-        GoalEnv.__init__(self, sim, robot, task)
+        GoalEnv.__init__(self, sim, robot, task, snapshot_reset=snapshot_reset, copy_obs=copy_obs)
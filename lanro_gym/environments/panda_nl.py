@@ -17,9 +17,31 @@ class PandaNLReachEnv(LanguageEnv):
                  delay_action_repair=False,
                  use_negations_action_repair=False,
                  use_synonyms=False,
-                 camera_mode='ego'):
-        sim = PyBulletSimulation(render=render)
-        robot = Panda(sim, fixed_gripper=True, action_type=action_type, camera_mode=camera_mode)
+                 use_object_pool=False,
+                 snapshot_reset=False,
+                 copy_obs=True,
+                 info_obs=(),
+                 camera_mode='ego',
+                 tactile_rays=0,
+                 joint_reset_noise=0.0,
+                 ik_max_iterations=100,
+                 ik_residual_threshold=1e-5,
+                 ik_solver='pybullet',
+                 ik_cache_size=0,
+                 visual_shapes=True,
+                 sim=None):
+        sim = PyBulletSimulation(render=render) if sim is None else sim
+        robot = Panda(sim,
+                      fixed_gripper=True,
+                      action_type=action_type,
+                      camera_mode=camera_mode,
+                      tactile_rays=tactile_rays,
+                      joint_reset_noise=joint_reset_noise,
+                      ik_max_iterations=ik_max_iterations,
+                      ik_residual_threshold=ik_residual_threshold,
+                      ik_solver=ik_solver,
+                      ik_cache_size=ik_cache_size,
+                      visual_shapes=visual_shapes)
         task = NLReach(sim,
                        robot,
                        num_obj=num_obj,
@@ -28,8 +50,17 @@ class PandaNLReachEnv(LanguageEnv):
                        use_action_repair=use_action_repair,
                        delay_action_repair=delay_action_repair,
                        use_negations_action_repair=use_negations_action_repair,
-                       use_synonyms=use_synonyms)
-        LanguageEnv.__init__(self, sim, robot, task, obs_type=obs_type)
+                       use_synonyms=use_synonyms,
+                       # snapshots require the same bodies in every episode
+                       use_object_pool=use_object_pool or snapshot_reset)
+        LanguageEnv.__init__(self,
+                             sim,
+                             robot,
+                             task,
+                             obs_type=obs_type,
+                             snapshot_reset=snapshot_reset,
+                             copy_obs=copy_obs,
+                             info_obs=info_obs)
 
 
 class PandaNLGraspEnv(LanguageEnv):
@@ -45,9 +76,31 @@ class PandaNLGraspEnv(LanguageEnv):
                  delay_action_repair=False,
                  use_negations_action_repair=False,
                  use_synonyms=False,
-                 camera_mode='ego'):
-        sim = PyBulletSimulation(render=render)
-        robot = Panda(sim, fixed_gripper=False, action_type=action_type, camera_mode=camera_mode)
+                 use_object_pool=False,
+                 snapshot_reset=False,
+                 copy_obs=True,
+                 info_obs=(),
+                 camera_mode='ego',
+                 tactile_rays=0,
+                 joint_reset_noise=0.0,
+                 ik_max_iterations=100,
+                 ik_residual_threshold=1e-5,
+                 ik_solver='pybullet',
+                 ik_cache_size=0,
+                 visual_shapes=True,
+                 sim=None):
+        sim = PyBulletSimulation(render=render) if sim is None else sim
+        robot = Panda(sim,
+                      fixed_gripper=False,
+                      action_type=action_type,
+                      camera_mode=camera_mode,
+                      tactile_rays=tactile_rays,
+                      joint_reset_noise=joint_reset_noise,
+                      ik_max_iterations=ik_max_iterations,
+                      ik_residual_threshold=ik_residual_threshold,
+                      ik_solver=ik_solver,
+                      ik_cache_size=ik_cache_size,
+                      visual_shapes=visual_shapes)
         task = NLGrasp(sim,
                        robot,
                        num_obj=num_obj,
@@ -56,8 +109,17 @@ class PandaNLGraspEnv(LanguageEnv):
                        use_action_repair=use_action_repair,
                        delay_action_repair=delay_action_repair,
                        use_negations_action_repair=use_negations_action_repair,
-                       use_synonyms=use_synonyms)
-        LanguageEnv.__init__(self, sim, robot, task, obs_type=obs_type)
+                       use_synonyms=use_synonyms,
+                       # snapshots require the same bodies in every episode
+                       use_object_pool=use_object_pool or snapshot_reset)
+        LanguageEnv.__init__(self,
+                             sim,
+                             robot,
+                             task,
+                             obs_type=obs_type,
+                             snapshot_reset=snapshot_reset,
+                             copy_obs=copy_obs,
+                             info_obs=info_obs)
 
 
 class PandaNLLiftEnv(LanguageEnv):
@@ -73,9 +135,31 @@ class PandaNLLiftEnv(LanguageEnv):
                  delay_action_repair=False,
                  use_negations_action_repair=False,
                  use_synonyms=False,
-                 camera_mode='ego'):
-        sim = PyBulletSimulation(render=render)
-        robot = Panda(sim, fixed_gripper=False, action_type=action_type, camera_mode=camera_mode)
+                 use_object_pool=False,
+                 snapshot_reset=False,
+                 copy_obs=True,
+                 info_obs=(),
+                 camera_mode='ego',
+                 tactile_rays=0,
+                 joint_reset_noise=0.0,
+                 ik_max_iterations=100,
+                 ik_residual_threshold=1e-5,
+                 ik_solver='pybullet',
+                 ik_cache_size=0,
+                 visual_shapes=True,
+                 sim=None):
+        sim = PyBulletSimulation(render=render) if sim is None else sim
+        robot = Panda(sim,
+                      fixed_gripper=False,
+                      action_type=action_type,
+                      camera_mode=camera_mode,
+                      tactile_rays=tactile_rays,
+                      joint_reset_noise=joint_reset_noise,
+                      ik_max_iterations=ik_max_iterations,
+                      ik_residual_threshold=ik_residual_threshold,
+                      ik_solver=ik_solver,
+                      ik_cache_size=ik_cache_size,
+                      visual_shapes=visual_shapes)
         task = NLLift(sim,
                       robot,
                       num_obj=num_obj,
@@ -84,8 +168,17 @@ class PandaNLLiftEnv(LanguageEnv):
                       use_action_repair=use_action_repair,
                       delay_action_repair=delay_action_repair,
                       use_negations_action_repair=use_negations_action_repair,
-                      use_synonyms=use_synonyms)
-        LanguageEnv.__init__(self, sim, robot, task, obs_type=obs_type)
+                      use_synonyms=use_synonyms,
+                      # snapshots require the same bodies in every episode
+                      use_object_pool=use_object_pool or snapshot_reset)
+        LanguageEnv.__init__(self,
+                             sim,
+                             robot,
+                             task,
+                             obs_type=obs_type,
+                             snapshot_reset=snapshot_reset,
+                             copy_obs=copy_obs,
+                             info_obs=info_obs)
 
 
 class PandaNLPushEnv(LanguageEnv):
@@ -101,9 +194,31 @@ class PandaNLPushEnv(LanguageEnv):
                  delay_action_repair=False,
                  use_negations_action_repair=False,
                  use_synonyms=False,
-                 camera_mode='ego'):
-        sim = PyBulletSimulation(render=render)
-        robot = Panda(sim, fixed_gripper=True, action_type=action_type, camera_mode=camera_mode)
+                 use_object_pool=False,
+                 snapshot_reset=False,
+                 copy_obs=True,
+                 info_obs=(),
+                 camera_mode='ego',
+                 tactile_rays=0,
+                 joint_reset_noise=0.0,
+                 ik_max_iterations=100,
+                 ik_residual_threshold=1e-5,
+                 ik_solver='pybullet',
+                 ik_cache_size=0,
+                 visual_shapes=True,
+                 sim=None):
+        sim = PyBulletSimulation(render=render) if sim is None else sim
+        robot = Panda(sim,
+                      fixed_gripper=True,
+                      action_type=action_type,
+                      camera_mode=camera_mode,
+                      tactile_rays=tactile_rays,
+                      joint_reset_noise=joint_reset_noise,
+                      ik_max_iterations=ik_max_iterations,
+                      ik_residual_threshold=ik_residual_threshold,
+                      ik_solver=ik_solver,
+                      ik_cache_size=ik_cache_size,
+                      visual_shapes=visual_shapes)
         task = NLPush(sim,
                       robot,
                       num_obj=num_obj,
@@ -112,5 +227,14 @@ class PandaNLPushEnv(LanguageEnv):
                       use_action_repair=use_action_repair,
                       delay_action_repair=delay_action_repair,
                       use_negations_action_repair=use_negations_action_repair,
-                      use_synonyms=use_synonyms)
-        LanguageEnv.__init__(self, sim, robot, task, obs_type=obs_type)
+                      use_synonyms=use_synonyms,
+                      # snapshots require the same bodies in every episode
+                      use_object_pool=use_object_pool or snapshot_reset)
+        LanguageEnv.__init__(self,
+                             sim,
+                             robot,
+                             task,
+                             obs_type=obs_type,
+                             snapshot_reset=snapshot_reset,
+                             copy_obs=copy_obs,
+                             info_obs=info_obs)
@@ -1,4 +1,5 @@
-from typing import List, Set, Tuple
+import itertools
+from typing import Iterable, Iterator, List, Set, Tuple, Union
 import numpy as np
 
 
@@ -40,7 +41,74 @@ def create_commands(command_type: str,
     return list(set(sentences))
 
 
-def parse_instructions(instructions: List[str]) -> Tuple[Set[str], int]:
+class InstructionSpace:
+    """The set of all instructions of a task without materializing it.
+    It consists of the plain instructions and, if action repair commands are
+    given, every instruction followed by every action repair command. Members
+    are indexed with the plain instructions first and the combinations in
+    row-major order afterwards."""
+
+    def __init__(self, instructions: Iterable[str], action_repairs: Iterable[str] = ()):
+        self.instructions = sorted(set(map(str, instructions)))
+        self.action_repairs = sorted(set(map(str, action_repairs)))
+        self._instruction_idxs = {_instr: _idx for _idx, _instr in enumerate(self.instructions)}
+        self._action_repair_idxs = {_ar: _idx for _idx, _ar in enumerate(self.action_repairs)}
+
+    def __len__(self) -> int:
+        return len(self.instructions) * (1 + len(self.action_repairs))
+
+    def __getitem__(self, idx: int) -> str:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("instruction index out of range")
+        if idx < len(self.instructions):
+            return self.instructions[idx]
+        instr_idx, ar_idx = divmod(idx - len(self.instructions), len(self.action_repairs))
+        return self.instructions[instr_idx] + ' ' + self.action_repairs[ar_idx]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.instructions
+        for _instr, _ar in itertools.product(self.instructions, self.action_repairs):
+            yield _instr + ' ' + _ar
+
+    def __contains__(self, instruction) -> bool:
+        try:
+            self.index(instruction)
+        except ValueError:
+            return False
+        return True
+
+    def index(self, instruction: str) -> int:
+        """Returns the index of an instruction"""
+        if instruction in self._instruction_idxs:
+            return self._instruction_idxs[instruction]
+        # try every split into an instruction and an action repair command
+        _words = instruction.split(' ')
+        for _split in range(1, len(_words)):
+            instr_idx = self._instruction_idxs.get(' '.join(_words[:_split]))
+            ar_idx = self._action_repair_idxs.get(' '.join(_words[_split:]))
+            if instr_idx is not None and ar_idx is not None:
+                return len(self.instructions) + instr_idx * len(self.action_repairs) + ar_idx
+        raise ValueError(f"'{instruction}' is not in the instruction space")
+
+    def get_words(self) -> Set[str]:
+        words = set()
+        for _sentence in itertools.chain(self.instructions, self.action_repairs):
+            words.update(_sentence.lower().split(' '))
+        return words
+
+    @property
+    def max_instruction_len(self) -> int:
+        max_instruction_len = max([len(_instr.split(' ')) for _instr in self.instructions], default=0)
+        if self.action_repairs:
+            max_instruction_len += max([len(_ar.split(' ')) for _ar in self.action_repairs])
+        return max_instruction_len
+
+
+def parse_instructions(instructions: Union[List[str], InstructionSpace]) -> Tuple[Set[str], int]:
+    if isinstance(instructions, InstructionSpace):
+        return instructions.get_words(), instructions.max_instruction_len
     word_list = []
     max_instruction_len = 0
     for _instrucion in instructions:
@@ -0,0 +1,81 @@
+from typing import Iterator
+
+from gymnasium.envs import registration
+from gymnasium.envs.registration import EnvSpec
+
+NL_TASKS = ['Reach', 'Push', 'Grasp', 'Lift']
+NL_MODES = [
+    'Default', 'Color', 'Shape', 'Weight', 'Size', 'ColorShape', 'WeightShape', 'SizeShape', 'ColorShapeSize',
+    'ColorShapeSizeWeight'
+]
+
+
+def language_env_specs(robot: str = 'Panda') -> Iterator[EnvSpec]:
+    """Yield the environment specifications of all language-conditioned
+    environments, e.g. `PandaNLPush3ColorShapePixelEgoHIARD-v0`."""
+    for num_obj in [2, 3]:
+        for _mode in NL_MODES:
+            for _obstype in ['state', 'pixelego', 'pixelstatic']:
+                _current_obstype = ''
+                _cam_mode = 'ego'
+                if _obstype == 'pixelego':
+                    _current_obstype = 'PixelEgo'
+                    _obstype = 'pixel'
+                elif _obstype == 'pixelstatic':
+                    _cam_mode = 'static'
+                    _current_obstype = 'PixelStatic'
+                    _obstype = 'pixel'
+                for _h_instr in [True, False]:
+                    for _a_repair in [True, False]:
+                        for _negation_repair in [True, False]:
+                            for _delay_a_repair in [True, False]:
+                                for _use_synonyms in [True, False]:
+                                    _current_mode = '' if _mode == 'Default' else _mode
+                                    _current_h_instr = 'HI' if _h_instr else ''
+                                    _use_syn = 'Synonyms' if _use_synonyms else ''
+
+                                    _current_a_repair = ''
+                                    if _a_repair and _negation_repair:
+                                        _current_a_repair = 'ARN'
+                                    elif _a_repair and not _negation_repair:
+                                        _current_a_repair = 'AR'
+                                    elif not _a_repair and _negation_repair:
+                                        continue
+
+                                    if _a_repair and _delay_a_repair:
+                                        _current_a_repair += 'D'
+                                    elif not _a_repair and not _delay_a_repair:
+                                        continue
+                                    # NOTE: Use 100 for action repair, as the
+                                    # agent needs to solve the task for possibly 2 goals in one episode
+                                    _max_episode_steps = 100 if _a_repair else 50
+
+                                    _kwargs = {
+                                        'num_obj': num_obj,
+                                        'mode': _mode.lower(),
+                                        'obs_type': _obstype,
+                                        'use_hindsight_instructions': _h_instr,
+                                        'use_action_repair': _a_repair,
+                                        'delay_action_repair': _delay_a_repair,
+                                        'use_negations_action_repair': _negation_repair,
+                                        'camera_mode': _cam_mode,
+                                        'use_synonyms': _use_synonyms
+                                    }
+
+                                    param_combination = f"{num_obj}{_current_mode}{_current_obstype}{_use_syn}{_current_h_instr}{_current_a_repair}"
+
+                                    for task in NL_TASKS:
+                                        yield EnvSpec(id=f'{robot}NL{task}{param_combination}-v0',
+                                                      entry_point=f'lanro_gym.environments:{robot}NL{task}Env',
+                                                      max_episode_steps=_max_episode_steps,
+                                                      kwargs=_kwargs)
+
+
+def register_language_envs(robot: str = 'Panda') -> None:
+    """Register all language-conditioned environments of a robot.
+
+    `gymnasium.register` compares every new id against the whole registry, which
+    takes seconds for thousands of ids. The generated ids are all unique and
+    versioned, so their specs are added to the registry directly."""
+    for env_spec in language_env_specs(robot):
+        registration.registry[env_spec.id] = env_spec
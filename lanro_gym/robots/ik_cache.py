@@ -0,0 +1,107 @@
+from collections import OrderedDict
+from typing import Dict, Optional
+import numpy as np
+
+
+class IKCache:
+    """Bounded LRU cache of inverse kinematics solutions.
+
+    Solutions are stored under quantized keys of the target pose and the
+    joint angles the solver started from. On a miss, the solution of the
+    cached target closest to the requested one can seed the solver. The
+    cache is bounded, so the nearest neighbour is found with a vectorized
+    search over all cached targets instead of a KD-tree."""
+
+    def __init__(self,
+                 max_size: int,
+                 num_joints: int,
+                 pos_resolution: float = 1e-3,
+                 orn_resolution: float = 1e-3,
+                 joint_resolution: float = 1e-3,
+                 warm_start_radius: float = 0.02):
+        """
+        :param max_size: The maximal amount of cached solutions
+        :param num_joints: The amount of joints of a solution and of the current joint angles in a key
+        :param pos_resolution: The quantization of the target position in the cache key
+        :param orn_resolution: The quantization of the target quaternion in the cache key
+        :param joint_resolution: The quantization of the current joint angles in the cache key
+        :param warm_start_radius: The maximal distance between the targets of a neighbour and the requested target
+        """
+        assert max_size > 0
+        self.max_size = max_size
+        self.warm_start_radius = warm_start_radius
+        self._key_scale = 1 / np.array([pos_resolution] * 3 + [orn_resolution] * 4 + [joint_resolution] * num_joints)
+        # key -> slot in the target and solution arrays, ordered from least to most recently used
+        self._slots: OrderedDict = OrderedDict()
+        self._targets = np.zeros((max_size, 7))
+        self._solutions = np.zeros((max_size, num_joints))
+        self.hits = 0
+        self.misses = 0
+        self.warm_starts = 0
+
+    @staticmethod
+    def target_vector(pos, orn=None) -> np.ndarray:
+        """Position and quaternion of a target as one vector, without orientation the quaternion is zero"""
+        target = np.zeros(7)
+        target[:3] = pos
+        if orn is not None:
+            target[3:] = orn
+        return target
+
+    def key(self, target: np.ndarray, joint_angles: np.ndarray) -> bytes:
+        """Quantized target and joint angles as hashable key"""
+        return np.round(np.concatenate([target, joint_angles]) * self._key_scale).astype(np.int64).tobytes()
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        slot = self._slots.get(key)
+        if slot is None:
+            self.misses += 1
+            return None
+        self._slots.move_to_end(key)
+        self.hits += 1
+        return self._solutions[slot].copy()
+
+    def nearest(self, target: np.ndarray) -> Optional[np.ndarray]:
+        """Solution of the closest cached target within the warm start radius"""
+        if not self._slots:
+            return None
+        # slots are filled in order and only reused after eviction
+        distances = np.linalg.norm(self._targets[:len(self._slots)] - target, axis=1)
+        slot = np.argmin(distances)
+        if distances[slot] > self.warm_start_radius:
+            return None
+        self.warm_starts += 1
+        return self._solutions[slot].copy()
+
+    def put(self, key: bytes, target: np.ndarray, solution: np.ndarray) -> None:
+        if key in self._slots:
+            slot = self._slots[key]
+            self._slots.move_to_end(key)
+        elif len(self._slots) < self.max_size:
+            slot = len(self._slots)
+            self._slots[key] = slot
+        else:
+            # evict the least recently used solution and reuse its slot
+            _, slot = self._slots.popitem(last=False)
+            self._slots[key] = slot
+        self._targets[slot] = target
+        self._solutions[slot] = solution
+
+    def clear(self) -> None:
+        self._slots.clear()
+        self.hits = 0
+        self.misses = 0
+        self.warm_starts = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def get_stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "warm_starts": self.warm_starts,
+            "size": len(self),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
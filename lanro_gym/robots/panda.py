@@ -2,7 +2,8 @@ from typing import List
 from lanro_gym.simulation import PyBulletSimulation
 import numpy as np
 from lanro_gym.robots.pybrobot import PyBulletRobot
-from lanro_gym.utils import gripper_camera
+from lanro_gym.robots.panda_ik import panda_inverse_kinematics
+from lanro_gym.utils import gripper_camera, quaternion_multiply, quaternion_to_rotation_matrix
 
 
 class Panda(PyBulletRobot):
@@ -14,6 +15,8 @@ class Panda(PyBulletRobot):
     gripper_obs_right_z_offset = 0.026
     left_finger_id = 9
     right_finger_id = 10
+    # values of the last joint tried by the analytic inverse kinematics in addition to its current value
+    analytic_ik_q7_samples = np.linspace(-2.9, 2.9, 8)
 
     def __init__(self,
                  sim: PyBulletSimulation,
@@ -22,7 +25,21 @@ class Panda(PyBulletRobot):
                  full_state: bool = True,
                  action_type: str = 'relative_joints',
                  finger_friction: float = 1.0,
-                 camera_mode: str = 'ego'):
+                 camera_mode: str = 'ego',
+                 tactile_rays: int = 0,
+                 joint_reset_noise: float = 0.0,
+                 ik_max_iterations: int = 100,
+                 ik_residual_threshold: float = 1e-5,
+                 ik_warm_start: bool = False,
+                 ik_solver: str = 'pybullet',
+                 ik_cache_size: int = 0,
+                 visual_shapes: bool = True):
+        """
+        :param ik_solver: Inverse kinematics of `goto`, one of ['pybullet', 'analytic']
+        """
+        if ik_solver not in ['pybullet', 'analytic']:
+            raise ValueError(f"Unknown inverse kinematics solver {ik_solver}")
+        self.ik_solver = ik_solver
         super().__init__(sim,
                          body_name="panda",
                          file_name="franka_panda/panda.urdf",
@@ -32,25 +49,59 @@ class Panda(PyBulletRobot):
                          fixed_gripper=fixed_gripper,
                          full_state=full_state,
                          finger_friction=finger_friction,
-                         camera_mode=camera_mode)
+                         camera_mode=camera_mode,
+                         tactile_rays=tactile_rays,
+                         joint_reset_noise=joint_reset_noise,
+                         ik_max_iterations=ik_max_iterations,
+                         ik_residual_threshold=ik_residual_threshold,
+                         ik_warm_start=ik_warm_start,
+                         ik_cache_size=ik_cache_size,
+                         visual_shapes=visual_shapes)
         self.default_arm_orn_RPY = sim.get_quaternion_from_euler([2 * np.pi, np.pi, np.pi])
+        # the base pose of PyBullet is the inertial frame, the analytic inverse kinematics needs the link frame
+        inertial_pos, inertial_orn = self.sim.get_dynamics_info(self.body_name, -1)[3:5]
+        self._world_to_link_base = self.sim.multiply_transforms(inertial_pos, inertial_orn, *self._world_to_base)
         self.sim.set_orientation_lines(self._uid, 8)
 
         # create a constraint to keep the fingers aligned
-        _c = self.sim.bclient.createConstraint(self._uid,
-                                               self.ee_joints[0],
-                                               self._uid,
-                                               self.ee_joints[1],
-                                               jointType=self.sim.bclient.JOINT_GEAR,
-                                               jointAxis=[1, 0, 0],
-                                               parentFramePosition=[0, 0, 0],
-                                               childFramePosition=[0, 0, 0])
-        self.sim.bclient.changeConstraint(_c, gearRatio=-1, erp=0.1, maxForce=50)
+        self.sim.create_constraint(self.body_name,
+                                   self.ee_joints[0],
+                                   self.body_name,
+                                   self.ee_joints[1],
+                                   joint_type=self.sim.bclient.JOINT_GEAR,
+                                   joint_axis=[1, 0, 0],
+                                   parent_frame_position=[0, 0, 0],
+                                   child_frame_position=[0, 0, 0],
+                                   gearRatio=-1,
+                                   erp=0.1,
+                                   maxForce=50)
         # increase forces of some joints and the end effector
         self.arm_max_force[5] *= 5
         self.arm_max_force[6] *= 5
         self.ee_max_force = [85, 85]
 
+    def analytic_inverse_kinematics(self, pos, orn, reference_angles=None) -> np.ndarray:
+        """Closed-form inverse kinematics for one (3, ), (4, ) or many (N, 3), (N, 4) poses in the world frame.
+        Returns the arm joint angles closest to the reference angles, which default to the current joint angles,
+        and NaN for unreachable poses."""
+        if reference_angles is None:
+            reference_angles = self.get_joint_angles()[:self.num_DOF]
+        world_to_base_pos, world_to_base_orn = self._world_to_link_base
+        base_pos = np.asarray(pos) @ quaternion_to_rotation_matrix(world_to_base_orn).T + world_to_base_pos
+        base_orn = quaternion_multiply(world_to_base_orn, orn)
+        q7 = np.append(np.atleast_2d(reference_angles)[0, 6], self.analytic_ik_q7_samples)
+        return panda_inverse_kinematics(base_pos, base_orn, q7, reference_angles, self.arm_lower_limits,
+                                        self.arm_upper_limits)
+
+    def inverse_kinematics(self, pos, orn=None, seed_angles=None) -> np.ndarray:
+        if self.ik_solver == 'analytic' and orn is not None:
+            reference_angles = None if seed_angles is None else seed_angles[:self.num_DOF]
+            joint_angles = self.analytic_inverse_kinematics(pos, orn, reference_angles)
+            if not np.isnan(joint_angles[0]):
+                return joint_angles
+        # position-only targets and poses out of reach
+        return super().inverse_kinematics(pos, orn, seed_angles)
+
     def gripper_control(self, amount: float) -> List:
         if amount == None:
             return self.NEUTRAL_FINGER_VALUES
@@ -0,0 +1,174 @@
+"""Closed-form inverse kinematics of the Franka Emika Panda.
+
+The redundancy of the 7-DoF arm is resolved by fixing the last joint q7,
+after which the remaining joints are obtained geometrically: q4 from the
+distance between shoulder and wrist, the swivel of the elbow around the
+shoulder-wrist axis from the axis of joint 6, and q1-q3 and q5-q6 from the
+remaining rotations. All functions are vectorized over many targets."""
+from typing import Tuple, Union, Sequence
+import numpy as np
+from lanro_gym.utils import quaternion_to_rotation_matrix
+
+# modified DH parameters (a_{i-1}, d_i, alpha_{i-1}) of the arm joints in `franka_panda/panda.urdf`
+PANDA_DH_A = np.array([0.0, 0.0, 0.0, 0.0825, -0.0825, 0.0, 0.088])
+PANDA_DH_D = np.array([0.333, 0.0, 0.316, 0.0, 0.384, 0.0, 0.0])
+PANDA_DH_ALPHA = np.array([0.0, -np.pi / 2, np.pi / 2, np.pi / 2, -np.pi / 2, np.pi / 2, np.pi / 2])
+# distance from the flange to the grasp target and the rotation of the hand around the flange
+PANDA_FLANGE_D = 0.107
+PANDA_HAND_D = 0.105
+PANDA_HAND_ANGLE = -np.pi / 4
+PANDA_LOWER_LIMITS = np.array([-2.9671, -1.8326, -2.9671, -3.1416, -2.9671, -0.0873, -2.9671])
+PANDA_UPPER_LIMITS = np.array([2.9671, 1.8326, 2.9671, 0.0, 2.9671, 3.8223, 2.9671])
+
+# lengths of the upper arm (shoulder to elbow) and forearm (elbow to wrist)
+_UPPER_ARM = np.hypot(PANDA_DH_A[3], PANDA_DH_D[2])
+_FOREARM = np.hypot(PANDA_DH_A[4], PANDA_DH_D[4])
+# q4 = elbow angle - offset, as the links are not attached in the joint axes
+_Q4_OFFSET = np.arctan2(PANDA_DH_D[4], PANDA_DH_A[4]) - np.arctan2(-PANDA_DH_D[2], -PANDA_DH_A[3])
+
+
+def _rot_x(angle: float) -> np.ndarray:
+    c, s = np.cos(angle), np.sin(angle)
+    return np.array([[1, 0, 0], [0, c, -s], [0, s, c]])
+
+
+def _rot_z(angle) -> np.ndarray:
+    c, s = np.cos(angle), np.sin(angle)
+    zeros, ones = np.zeros_like(c), np.ones_like(c)
+    return np.stack([np.stack([c, -s, zeros], -1), np.stack([s, c, zeros], -1), np.stack([zeros, zeros, ones], -1)], -2)
+
+
+_R7_FROM_HAND = _rot_z(-PANDA_HAND_ANGLE)
+_R6_FROM_7 = _rot_x(-PANDA_DH_ALPHA[6])
+_R3_FROM_4 = _rot_x(-PANDA_DH_ALPHA[3])
+
+
+def panda_forward_kinematics(joint_angles) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the positions (..., 3) and rotation matrices (..., 3, 3) of the grasp target
+    for arm joint angles (..., 7) in the base frame of the robot"""
+    joint_angles = np.asarray(joint_angles, dtype=float)
+    pos = np.zeros(joint_angles.shape[:-1] + (3, ))
+    rot = np.broadcast_to(np.eye(3), joint_angles.shape[:-1] + (3, 3))
+    for joint_idx in range(7):
+        # T_{i-1,i} = RotX(alpha) TransX(a) RotZ(q) TransZ(d)
+        pos = pos + PANDA_DH_A[joint_idx] * rot[..., :, 0]
+        rot = rot @ _rot_x(PANDA_DH_ALPHA[joint_idx]) @ _rot_z(joint_angles[..., joint_idx])
+        pos = pos + PANDA_DH_D[joint_idx] * rot[..., :, 2]
+    pos = pos + (PANDA_FLANGE_D + PANDA_HAND_D) * rot[..., :, 2]
+    return pos, rot @ _rot_z(PANDA_HAND_ANGLE)
+
+
+def _unit(vec: np.ndarray) -> np.ndarray:
+    return vec / np.linalg.norm(vec, axis=-1, keepdims=True)
+
+
+def _cross(vec1: np.ndarray, vec2: np.ndarray) -> np.ndarray:
+    # cheaper than np.cross for small stacks of vectors
+    return vec1[..., [1, 2, 0]] * vec2[..., [2, 0, 1]] - vec1[..., [2, 0, 1]] * vec2[..., [1, 2, 0]]
+
+
+def _solve_fixed_q7(pos: np.ndarray, rot: np.ndarray, q7: np.ndarray) -> np.ndarray:
+    """All solutions for targets (N, 3), (N, 3, 3) and values of q7 (S, ).
+    Returns joint angles (N, S * 8, 7), NaN for unreachable targets"""
+    num_targets = len(pos)
+    rot_7 = rot @ _R7_FROM_HAND
+    wrist_7 = pos - (PANDA_FLANGE_D + PANDA_HAND_D) * rot_7[:, :, 2]
+    # frame 6 for every q7, (N, S, 3, 3)
+    rot_6 = rot_7[:, None] @ _rot_z(-q7)[None] @ _R6_FROM_7
+    wrist = wrist_7[:, None] - PANDA_DH_A[6] * rot_6[..., 0]
+    shoulder_to_wrist = wrist - np.array([0, 0, PANDA_DH_D[0]])
+    dist = np.linalg.norm(shoulder_to_wrist, axis=-1)
+    axis = shoulder_to_wrist / dist[..., None]
+
+    with np.errstate(invalid='ignore'):
+        elbow_angle = np.arccos((_UPPER_ARM**2 + _FOREARM**2 - dist**2) / (2 * _UPPER_ARM * _FOREARM))
+        shoulder_angle = np.arccos((_UPPER_ARM**2 + dist**2 - _FOREARM**2) / (2 * _UPPER_ARM * dist))
+    # two elbow configurations with the same distance between shoulder and wrist
+    q4 = np.stack([elbow_angle - _Q4_OFFSET, 2 * np.pi - elbow_angle - _Q4_OFFSET], -1).reshape(num_targets, -1)
+    rot_6, axis, dist, shoulder_angle = (np.repeat(x, 2, axis=1) for x in (rot_6, axis, dist, shoulder_angle))
+    q7 = np.repeat(q7, 2)
+
+    # 2D map from the x-y plane of frame 4 to the triangle of shoulder, elbow and wrist,
+    # spanned by the shoulder-wrist axis and a perpendicular direction
+    elbow_to_shoulder = -_UPPER_ARM * np.stack([np.cos(shoulder_angle), np.sin(shoulder_angle)], -1)
+    elbow_to_wrist = elbow_to_shoulder + np.stack([dist, np.zeros_like(dist)], -1)
+    c4, s4 = np.cos(q4), np.sin(q4)
+    elbow_to_shoulder_4 = np.stack([-c4 * PANDA_DH_A[3] - s4 * PANDA_DH_D[2], s4 * PANDA_DH_A[3] - c4 * PANDA_DH_D[2]],
+                                   -1)
+    elbow_to_wrist_4 = np.broadcast_to([PANDA_DH_A[4], PANDA_DH_D[4]], elbow_to_shoulder_4.shape)
+    plane_from_4 = np.stack([elbow_to_wrist, elbow_to_shoulder], -1) @ np.linalg.inv(
+        np.stack([elbow_to_wrist_4, elbow_to_shoulder_4], -1))
+
+    # swivel of the triangle around the shoulder-wrist axis, y4 has to be perpendicular to z6
+    helper = np.where(np.abs(axis[..., 2:]) < 0.9, [0, 0, 1], [1, 0, 0])
+    plane_x = _unit(_cross(axis, helper))
+    plane_y = _cross(axis, plane_x)
+    z_6 = rot_6[..., 2]
+    coeff_cos = plane_from_4[..., 1, 1] * np.sum(plane_x * z_6, -1)
+    coeff_sin = plane_from_4[..., 1, 1] * np.sum(plane_y * z_6, -1)
+    coeff_const = plane_from_4[..., 0, 1] * np.sum(axis * z_6, -1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        swivel_spread = np.arccos(-coeff_const / np.hypot(coeff_cos, coeff_sin))
+    swivel = np.arctan2(coeff_sin, coeff_cos)[..., None] + np.stack([swivel_spread, -swivel_spread], -1)
+
+    # frame 4 for both swivel solutions, (N, 2 * S, 2, 3, 3)
+    perpendicular = np.cos(swivel)[..., None] * plane_x[:, :, None] + np.sin(swivel)[..., None] * plane_y[:, :, None]
+    axis = axis[:, :, None]
+    x_4 = plane_from_4[:, :, None, 0, 0, None] * axis + plane_from_4[:, :, None, 1, 0, None] * perpendicular
+    y_4 = plane_from_4[:, :, None, 0, 1, None] * axis + plane_from_4[:, :, None, 1, 1, None] * perpendicular
+    rot_4 = np.stack([x_4, y_4, _cross(x_4, y_4)], -1)
+
+    # wrist R_4^T R_6 = RotY(q5) RotZ(q6)
+    wrist_rot = np.swapaxes(rot_4, -1, -2) @ rot_6[:, :, None]
+    q5 = np.arctan2(wrist_rot[..., 0, 2], wrist_rot[..., 2, 2])
+    q6 = np.arctan2(wrist_rot[..., 1, 0], np.cos(q5) * wrist_rot[..., 0, 0] - np.sin(q5) * wrist_rot[..., 2, 0])
+    # the range of q6 is not centered around 0
+    q6 = np.where(q6 < PANDA_LOWER_LIMITS[5], q6 + 2 * np.pi, q6)
+    # shoulder R_3 = RotZ(q1) RotY(q2) RotZ(q3) with two solutions for the sign of q2
+    rot_3 = rot_4 @ _rot_z(-q4)[:, :, None] @ _R3_FROM_4
+    sin_q2 = np.hypot(rot_3[..., 0, 2], rot_3[..., 1, 2])
+    q1 = np.arctan2(rot_3[..., 1, 2], rot_3[..., 0, 2])
+    q2 = np.arctan2(sin_q2, rot_3[..., 2, 2])
+    q3 = np.arctan2(rot_3[..., 2, 1], -rot_3[..., 2, 0])
+    shoulder = np.stack([np.stack([q1, q2, q3], -1), np.stack([q1 - np.sign(q1) * np.pi, -q2, q3 - np.sign(q3) * np.pi],
+                                                              -1)], -2)
+
+    num_solutions = shoulder.shape[-2]
+    wrist_joints = np.stack([
+        np.broadcast_to(q4[:, :, None], q5.shape), q5, q6,
+        np.broadcast_to(q7[None, :, None], q5.shape)
+    ], -1)
+    joint_angles = np.concatenate(
+        [shoulder, np.broadcast_to(wrist_joints[..., None, :], wrist_joints.shape[:-1] + (num_solutions, 4))], -1)
+    return joint_angles.reshape(num_targets, -1, 7)
+
+
+def panda_inverse_kinematics(pos,
+                             orn,
+                             q7: Union[float, Sequence[float]],
+                             reference_angles=None,
+                             lower_limits=PANDA_LOWER_LIMITS,
+                             upper_limits=PANDA_UPPER_LIMITS) -> np.ndarray:
+    """Solves the arm joint angles for grasp target poses in the base frame of the robot.
+
+    :param pos: Target positions, (3, ) or (N, 3)
+    :param orn: Target orientations as quaternions (x, y, z, w), (4, ) or (N, 4)
+    :param q7: Fixed value or candidate values of the last joint
+    :param reference_angles: The valid solution closest to these joint angles, (7, ) or (N, 7),
+        is returned. Defaults to the center of the joint limits
+    :return: Joint angles (7, ) or (N, 7), NaN if a pose is not reachable within the joint limits
+    """
+    pos = np.asarray(pos, dtype=float)
+    single_target = pos.ndim == 1
+    pos = np.atleast_2d(pos)
+    rot = np.broadcast_to(quaternion_to_rotation_matrix(orn), (len(pos), 3, 3))
+    candidates = _solve_fixed_q7(pos, rot, np.atleast_1d(np.asarray(q7, dtype=float)))
+    lower_limits, upper_limits = np.asarray(lower_limits), np.asarray(upper_limits)
+    if reference_angles is None:
+        reference_angles = (lower_limits + upper_limits) / 2
+    valid = np.all((candidates >= lower_limits) & (candidates <= upper_limits), -1)
+    distance = np.where(valid, np.sum((candidates - np.atleast_2d(reference_angles)[:, None])**2, -1), np.inf)
+    best = np.argmin(distance, -1)
+    joint_angles = candidates[np.arange(len(pos)), best]
+    joint_angles[~valid[np.arange(len(pos)), best]] = np.nan
+    return joint_angles[0] if single_target else joint_angles
@@ -1,10 +1,12 @@
 from collections import namedtuple
 import os
 from gymnasium import spaces
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import numpy as np
 from lanro_gym.simulation import PyBulletSimulation
 from lanro_gym.env_utils import RGBCOLORS
+from lanro_gym.robots.ik_cache import IKCache
+from lanro_gym.utils import quaternion_conjugate, quaternion_multiply, quaternion_to_rotation_vector
 
 DEBUG = int("DEBUG" in os.environ and os.environ["DEBUG"])
 JointInfo = namedtuple('JointInfo', [
@@ -23,26 +25,58 @@ class PyBulletRobot:
     ee_link: int
     gripper_obs_left_z_offset = 0.0
     gripper_obs_right_z_offset = 0.0
+    # additional z-offsets of the rays between the fingers, relative to the gripper obs offsets
+    gripper_ray_z_offsets: Tuple[float, ...] = (0.0, )
+    # height of the fan of tactile rays from the left to the right finger
+    tactile_fan_height = 0.04
     left_finger_id = -1
     right_finger_id = -1
+    # damping and null-space gain towards the neutral joint values of the `end_effector_dls` controller
+    dls_damping = 0.05
+    dls_null_space_gain = 0.1
 
     def __init__(self, sim: PyBulletSimulation, body_name, file_name, base_position, base_orientation, action_type,
-                 full_state, fixed_gripper, finger_friction, camera_mode, **kwargs):
+                 full_state,
+                 fixed_gripper,
+                 finger_friction,
+                 camera_mode,
+                 tactile_rays: int = 0,
+                 joint_reset_noise: float = 0.0,
+                 ik_max_iterations: int = 100,
+                 ik_residual_threshold: float = 1e-5,
+                 ik_warm_start: bool = False,
+                 ik_cache_size: int = 0,
+                 visual_shapes: bool = True,
+                 **kwargs):
         """
         :param sim: Simulation class
         :param fixed_gripper: The boolean variable to lock the gripper
         :param base_position: The [x, y, z] base coordinates for the end-effector
         :param fingers_friction: The amount of finger friction of the gripper
         :param full state: If the full state should be returned
+        :param tactile_rays: The amount of rays between the fingers added to the observation
+        :param joint_reset_noise: The maximal uniform noise added to the neutral arm joint values on reset
+        :param ik_max_iterations: The maximal amount of inverse kinematics iterations
+        :param ik_residual_threshold: The residual of the end-effector position to stop iterating
+        :param ik_warm_start: If inverse kinematics starts from the last read joint angles
+        :param ik_cache_size: The amount of inverse kinematics solutions of `goto` to cache, 0 disables the cache
+        :param visual_shapes: Load the visual meshes, otherwise the robot is rendered with its collision meshes
         :param action_type: How actions are calculated
             One of ['absolute_quat', 'relative_quat', 'relative_joints',
-                    'absolute_joints', 'absolute_rpy', 'relative_rpy', 'end_effector']
+                    'absolute_joints', 'absolute_rpy', 'relative_rpy', 'end_effector', 'end_effector_dls']
         """
         self.sim = sim
         self.body_name = body_name
         self.action_type = action_type
         self.full_state = full_state
         self.fixed_gripper = fixed_gripper
+        self.tactile_rays = tactile_rays
+        self.joint_reset_noise = joint_reset_noise
+        self.ik_max_iterations = ik_max_iterations
+        self.ik_residual_threshold = ik_residual_threshold
+        self.ik_warm_start = ik_warm_start
+        self.visual_shapes = visual_shapes
+        self.ik_cache = IKCache(ik_cache_size, self.num_DOF) if ik_cache_size else None
         self.max_joint_change = sim.dt
         # gripper change is four times faster than joint changes. This in
         # combination with the force increase was necessary to achieve a
@@ -58,14 +92,27 @@ class PyBulletRobot:
             'absolute_rpy': self.absolute_rpy_step,
             'relative_rpy': self.relative_rpy_step,
             'end_effector': self.end_effector_step,
+            'end_effector_dls': self.end_effector_dls_step,
         }
         with self.sim.no_rendering():
             self._load_robot(file_name, base_position, base_orientation, **kwargs)
             self._parse_joint_info()
             self.setup(finger_friction)
 
+        # joints read with a single query: the arm joints followed by the fingers
+        self.state_joints = self.arm_joints + [self.left_finger_id, self.right_finger_id]
+        # the robot base is fixed, warm-started inverse kinematics expects targets in the base frame
+        self._world_to_base = self.sim.invert_transform(self.sim.get_base_position(self.body_name),
+                                                        self.sim.get_base_orientation(self.body_name))
+        gripper_state_size = 6 + int(not self.fixed_gripper) + self.tactile_rays
+        self._obs_buffer = np.zeros(gripper_state_size + 6 + self.num_DOF if full_state else gripper_state_size)
+
     def _load_robot(self, file_name, base_position, base_orientation, **kwargs):
         if 'urdf' in file_name:
+            if not self.visual_shapes:
+                # parsing the visual meshes takes most of the time to load the robot, pybullet
+                # then creates the visual shapes from the collision meshes instead
+                kwargs['flags'] = kwargs.get('flags', 0) | self.sim.bclient.URDF_IGNORE_VISUAL_SHAPES
             self._uid = self.sim.loadURDF(body_name=self.body_name,
                                           fileName=file_name,
                                           basePosition=base_position,
@@ -74,6 +121,8 @@ class PyBulletRobot:
                                           **kwargs)
 
         elif 'sdf' in file_name:
+            if not self.visual_shapes:
+                raise ValueError("Robots loaded from SDF files always load their visual shapes")
             self._uid = self.sim.loadSDF(body_name=self.body_name, sdfFileName=file_name)
             self.sim.set_base_pose(self.body_name, base_position, base_orientation)
 
@@ -115,6 +164,16 @@ class PyBulletRobot:
         self.arm_max_force = [self.joints[arm_id].maxForce for arm_id in self.arm_joints]
         self.ee_max_force = [self.joints[ee_id].maxForce for ee_id in self.ee_joints]
 
+        # joints and values of the neutral pose for resetting all joints at once
+        self.reset_joints = self.arm_joints + self.ee_joints
+        self.neutral_angles = np.array(self.NEUTRAL_JOINT_VALUES + self.NEUTRAL_FINGER_VALUES)
+
+        # null space arguments of the inverse kinematics
+        self.ik_lower_limits = self.arm_lower_limits + self.ee_lower_limits
+        self.ik_upper_limits = self.arm_upper_limits + self.ee_upper_limits
+        self.ik_joint_ranges = self.arm_joint_ranges + self.ee_joint_ranges
+        self.ik_rest_poses = self.NEUTRAL_JOINT_VALUES + self.NEUTRAL_FINGER_VALUES
+
     def get_ee_position(self) -> np.ndarray:
         """Returns the position of the end-effector as (x, y, z)"""
         return self.get_link_position(self.ee_link)
@@ -123,15 +182,24 @@ class PyBulletRobot:
         """Returns the velocity of the end-effector as (vx, vy, vz)"""
         return self.get_link_velocity(self.ee_link)
 
-    def reset(self) -> None:
-        self.sim.set_joint_angles(self.body_name,
-                                  joints=self.arm_joints + self.ee_joints,
-                                  angles=self.NEUTRAL_JOINT_VALUES + self.NEUTRAL_FINGER_VALUES)
+    def reset(self, np_random: Optional[np.random.Generator] = None) -> None:
+        """Reset all joints to the neutral pose, optionally with noise on the arm joints.
+        Args:
+            np_random: random number generator for the noise
+        """
+        angles = self.neutral_angles
+        if self.joint_reset_noise:
+            if np_random is None:
+                np_random = np.random.default_rng()
+            angles = angles.copy()
+            angles[:self.num_DOF] += np_random.uniform(-self.joint_reset_noise, self.joint_reset_noise, self.num_DOF)
+            angles[:self.num_DOF] = np.clip(angles[:self.num_DOF], self.arm_lower_limits, self.arm_upper_limits)
+        self.sim.set_joint_angles(self.body_name, joints=self.reset_joints, angles=angles)
 
     def setup(self, finger_friction):
         """Setup robot's action space and finger friction"""
         # XYZ relative end-effector change in position
-        if self.action_type == 'end_effector':
+        if self.action_type in ['end_effector', 'end_effector_dls']:
             action_high = np.array([1] * 3)
             action_low = -action_high.copy()
         # relative joint change
@@ -238,22 +306,81 @@ class PyBulletRobot:
         ee_target_position = ee_position + ee_ctrl
         self.goto(ee_target_position, self.default_arm_orn_RPY, gripper)
 
-    def goto(self, pos=None, orn=None, gripper=None) -> None:
-        ''' Uses PyBullet IK to solve for desired joint angles '''
-        joint_poses = self.sim.bclient.calculateInverseKinematics(
-            bodyUniqueId=self._uid,
-            endEffectorLinkIndex=self.ee_link,
-            targetPosition=pos,
-            targetOrientation=orn,
+    def end_effector_dls_step(self, action, gripper):
+        """apply a relative end-effector change with a damped least-squares step
+        of the jacobian instead of solving the inverse kinematics"""
+        assert len(action) == 3
+        ee_state = self.sim.get_link_state(self.body_name, self.ee_link)
+        ee_ctrl = action * self.max_joint_change
+        # keep the default orientation like `end_effector_step`
+        orn_error = quaternion_to_rotation_vector(
+            quaternion_multiply(self.default_arm_orn_RPY, quaternion_conjugate(ee_state[1])))
+        self.goto_joint_poses(self.dls_joint_poses(np.concatenate([ee_ctrl, orn_error]), ee_state), gripper)
+
+    def dls_joint_poses(self, ee_delta: np.ndarray, ee_state: Tuple) -> np.ndarray:
+        """Map an end-effector change (Δx, Δy, Δz, Δrx, Δry, Δrz) to arm joint
+        poses with the damped least-squares solution of the jacobian. The null
+        space of the jacobian pulls the joints towards the neutral joint values."""
+        joint_angles = self.get_joint_angles()
+        # jacobian at the center of mass of the end effector, which is the observed position
+        linear_jacobian, angular_jacobian = self.sim.calculate_jacobian(self.body_name, self.ee_link, ee_state[2],
+                                                                        joint_angles.tolist())
+        jacobian = np.concatenate([linear_jacobian, angular_jacobian])[:, :self.num_DOF]
+        arm_angles = joint_angles[:self.num_DOF]
+        jacobian_pinv = jacobian.T @ np.linalg.inv(jacobian @ jacobian.T + self.dls_damping**2 * np.eye(6))
+        null_space_delta = self.dls_null_space_gain * (self.neutral_angles[:self.num_DOF] - arm_angles)
+        arm_delta = jacobian_pinv @ ee_delta + (np.eye(self.num_DOF) - jacobian_pinv @ jacobian) @ null_space_delta
+        return np.clip(arm_angles + arm_delta, self.arm_lower_limits, self.arm_upper_limits)
+
+    def inverse_kinematics(self, pos, orn=None, seed_angles=None) -> np.ndarray:
+        ''' Uses PyBullet IK to solve for the arm joint angles of an end-effector pose,
+        starting from the seed angles of all joints if given '''
+        ik_kwargs = {}
+        if seed_angles is None and self.ik_warm_start:
+            seed_angles = self.get_joint_angles()
+        if seed_angles is not None:
+            # start from the seed angles instead of reading the body state,
+            # PyBullet then expects the target pose in the base frame
+            ik_kwargs['currentPositions'] = list(seed_angles)
+            pos, base_orn = self.sim.multiply_transforms(*self._world_to_base, pos,
+                                                         [0, 0, 0, 1] if orn is None else orn)
+            orn = None if orn is None else base_orn
+        joint_poses = self.sim.calculate_inverse_kinematics(
+            self.body_name,
+            self.ee_link,
+            pos,
+            orn,
             #  IK requires all 4 lists (lowerLimits, upperLimits, jointRanges, restPoses).
             #  Otherwise regular IK will be used.
-            lowerLimits=self.arm_lower_limits + self.ee_lower_limits,
-            upperLimits=self.arm_upper_limits + self.ee_upper_limits,
-            jointRanges=self.arm_joint_ranges + self.ee_joint_ranges,
-            restPoses=self.NEUTRAL_JOINT_VALUES + self.NEUTRAL_FINGER_VALUES,
-            maxNumIterations=100,
-            residualThreshold=1e-5)
-        joint_poses = list(joint_poses[0:self.num_DOF])
+            lowerLimits=self.ik_lower_limits,
+            upperLimits=self.ik_upper_limits,
+            jointRanges=self.ik_joint_ranges,
+            restPoses=self.ik_rest_poses,
+            maxNumIterations=self.ik_max_iterations,
+            residualThreshold=self.ik_residual_threshold,
+            **ik_kwargs)
+        return np.array(joint_poses[0:self.num_DOF])
+
+    def cached_inverse_kinematics(self, pos, orn=None) -> np.ndarray:
+        ''' Looks up the solution of the pose from the current joint angles in the IK cache.
+        On a miss, the solution of the closest cached pose seeds the inverse kinematics '''
+        joint_angles = self.get_joint_angles()
+        target = IKCache.target_vector(pos, orn)
+        key = self.ik_cache.key(target, joint_angles[:self.num_DOF])
+        solution = self.ik_cache.get(key)
+        if solution is None:
+            seed = self.ik_cache.nearest(target)
+            seed_angles = None if seed is None else np.concatenate([seed, joint_angles[self.num_DOF:]])
+            solution = self.inverse_kinematics(pos, orn, seed_angles)
+            self.ik_cache.put(key, target, solution)
+        return solution
+
+    def goto(self, pos=None, orn=None, gripper=None) -> None:
+        ''' Uses PyBullet IK to solve for desired joint angles '''
+        if self.ik_cache is not None:
+            joint_poses = self.cached_inverse_kinematics(pos, orn)
+        else:
+            joint_poses = self.inverse_kinematics(pos, orn)
         self.goto_joint_poses(joint_poses, gripper)
 
     def goto_joint_poses(self, joint_target_angles: List, gripper: float) -> None:
@@ -278,56 +405,93 @@ class PyBulletRobot:
         """Returns the velocity of a link as (vx, vy, vz)"""
         return np.array(self.sim.get_link_velocity(self.body_name, link))
 
+    def get_joint_angles(self) -> np.ndarray:
+        """Returns the angles of the `state_joints`"""
+        return self.sim.get_joint_angles(self.body_name, self.state_joints)
+
     def get_current_pos(self) -> np.ndarray:
-        return np.array([self.sim.get_joint_angle(self.body_name, j) for j in self.arm_joints])
+        return self.get_joint_angles()[:self.num_DOF]
 
     def control_joints(self, target_angles: List) -> None:
-        self.sim.bclient.setJointMotorControlArray(
-            bodyUniqueId=self._uid,
-            jointIndices=self.arm_joints + self.ee_joints,
-            controlMode=self.sim.bclient.POSITION_CONTROL,
-            targetPositions=target_angles,
-            forces=self.arm_max_force + self.ee_max_force,
-        )
+        self.sim.control_joints(self.body_name, self.arm_joints + self.ee_joints, target_angles,
+                                self.arm_max_force + self.ee_max_force)
 
     def get_fingers_width(self) -> float:
         """Returns the distance between the fingers."""
-        finger1 = self.sim.get_joint_angle(self.body_name, self.left_finger_id)
-        finger2 = self.sim.get_joint_angle(self.body_name, self.right_finger_id)
+        finger1, finger2 = self.get_joint_angles()[-2:]
         return finger1 + finger2
 
-    def gripper_ray_obs(self):
+    def gripper_ray_batch(self) -> Tuple:
         """
-        This method performs a single raycast to determine which object is between
-        the robot's grippers with a specific z-offset accounting for detection
-        between the fingertips.
+        This method casts all rays between the robot's fingers in a single batch:
+        one ray for each of the `gripper_ray_z_offsets`, followed by the fan of
+        `tactile_rays` rays. The results are cached until the simulation state
+        changes, such that success checks and observations share them.
         """
+        cache_key = ("gripper_rays", self._uid, self.gripper_ray_z_offsets, self.tactile_rays)
+        return self.sim.cached_query(cache_key, self._cast_gripper_rays)
+
+    def _cast_gripper_rays(self) -> Tuple:
         leftg = self.get_link_position(self.left_finger_id)
         rightg = self.get_link_position(self.right_finger_id)
         leftg[-1] -= self.gripper_obs_left_z_offset
         rightg[-1] -= self.gripper_obs_right_z_offset
-        leftg = tuple(leftg)
-        rightg = tuple(rightg)
-        hit_obj_id, link_idx, hit_fraction, hit_pos, hit_normal = self.sim.bclient.rayTest(leftg, rightg)[0]
+        z_offsets = np.array(self.gripper_ray_z_offsets)[:, None] * [0, 0, 1]
+        ray_from = leftg + z_offsets
+        ray_to = rightg + z_offsets
+        if self.tactile_rays:
+            # fan from the left fingertip to the right finger
+            fan_offsets = np.linspace(-self.tactile_fan_height / 2, self.tactile_fan_height / 2,
+                                      self.tactile_rays)[:, None] * [0, 0, 1]
+            ray_from = np.concatenate([ray_from, np.tile(leftg, (self.tactile_rays, 1))])
+            ray_to = np.concatenate([ray_to, rightg + fan_offsets])
         if DEBUG:
             line_color = RGBCOLORS.PINK.value[0]
-            self.sim.bclient.addUserDebugLine(leftg, rightg, line_color, 0.5, 1, replaceItemUniqueId=0)
+            self.sim.bclient.addUserDebugLine(ray_from[0], ray_to[0], line_color, 0.5, 1, replaceItemUniqueId=0)
+        return self.sim.ray_test_batch(ray_from.tolist(), ray_to.tolist())
+
+    def gripper_ray_obs(self):
+        """
+        Returns the result of the first ray between the robot's grippers with a
+        specific z-offset accounting for detection between the fingertips.
+        """
+        hit_obj_id, link_idx, hit_fraction, hit_pos, hit_normal = self.gripper_ray_batch()[0]
         return hit_obj_id, link_idx, hit_fraction, hit_pos, hit_normal
 
-    def get_obs(self):
-        if self.fixed_gripper:
-            gripper_state = np.concatenate((self.get_ee_position(), self.get_ee_velocity()))
-        else:
-            gripper_state = np.concatenate((self.get_ee_position(), self.get_ee_velocity(), [self.get_fingers_width()]))
+    def get_gripper_ray_hits(self) -> np.ndarray:
+        """Returns the object ids hit by the rays of all `gripper_ray_z_offsets`"""
+        return np.array([result[0] for result in self.gripper_ray_batch()[:len(self.gripper_ray_z_offsets)]])
+
+    def get_tactile_obs(self) -> np.ndarray:
+        """Returns the hit fractions of the tactile rays, 1.0 if a ray does not
+        hit anything or only hits the robot itself"""
+        return np.array([
+            1.0 if hit_obj_id in (-1, self._uid) else hit_fraction
+            for hit_obj_id, _, hit_fraction, _, _ in self.gripper_ray_batch()[len(self.gripper_ray_z_offsets):]
+        ])
+
+    def get_obs(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Returns a new observation array or fills `out` in place if given"""
+        # one link state query for the end effector and one joint states query
+        ee_state = self.sim.get_link_state(self.body_name, self.ee_link)
+        joint_angles = self.get_joint_angles()
+        obs = self._obs_buffer if out is None else out
+        # gripper state: position, velocity, fingers width and tactile rays
+        obs[0:3] = ee_state[0]
+        obs[3:6] = ee_state[6]
+        obs_idx = 6
+        if not self.fixed_gripper:
+            obs[obs_idx] = joint_angles[-2] + joint_angles[-1]
+            obs_idx += 1
+        if self.tactile_rays:
+            obs[obs_idx:obs_idx + self.tactile_rays] = self.get_tactile_obs()
+            obs_idx += self.tactile_rays
 
         if self.full_state:
-            state = self.sim.get_link_state(self.body_name, self.ee_link)
-            orn, orn_vel = state[1], state[-1]
-            current_poses = self.get_current_pos()
-            return np.concatenate(
-                (gripper_state, self.sim.get_euler_from_quaternion(orn), orn_vel, current_poses)).copy()
-        else:
-            return gripper_state.copy()
+            obs[obs_idx:obs_idx + 3] = self.sim.get_euler_from_quaternion(ee_state[1])
+            obs[obs_idx + 3:obs_idx + 6] = ee_state[7]
+            obs[obs_idx + 6:] = joint_angles[:self.num_DOF]
+        return obs.copy() if out is None else out
 
     def get_default_controls(self):
         if self.action_type == 'absolute_joints':
@@ -1,5 +1,5 @@
 import os
-from typing import Iterator, List, Optional, Tuple, Dict, Any
+from typing import Callable, Iterator, List, Optional, Sequence, Set, Tuple, Dict, Any
 import pybullet as p
 import pybullet_data as pd
 from pybullet_utils import bullet_client
@@ -18,11 +18,23 @@ DEBUG_CAM = int("DEBUG_CAM" in os.environ and os.environ["DEBUG_CAM"])
 PYB_GPU = int("PYB_GPU" in os.environ and os.environ["PYB_GPU"])
 GRAVITY: float = -9.81
 HZ: float = 500
+# layout of a row returned by `PyBulletSimulation.get_bodies_state`
+BODY_STATE_SIZE: int = 16
+BODY_POSITION = slice(0, 3)
+BODY_ROTATION = slice(3, 6)
+BODY_VELOCITY = slice(6, 9)
+BODY_ANGULAR_VELOCITY = slice(9, 12)
+BODY_ORIENTATION = slice(12, 16)
+# position, rotation, velocity and angular velocity as used in task observations
+BODY_OBS_STATE = slice(0, 12)
 
 
 class PyBulletSimulation:
+    # collision filter of dynamic bodies
+    collision_filter_group: int = 1
+    collision_filter_mask: int = -1
 
-    def __init__(self, n_substeps: int = 20, render: bool = False):
+    def __init__(self, n_substeps: int = 20, render: bool = False, use_cache: bool = True):
         background_color = np.array([109.0, 219.0, 145.0]) / 255
         self.render_on = render
         if render:
@@ -67,7 +79,22 @@ class PyBulletSimulation:
             egl = pkgutil.get_loader('eglRenderer')
             p.loadPlugin(egl.get_filename(), "_eglRendererPlugin")
 
+        self._init_bookkeeping(use_cache)
+
+    def _init_bookkeeping(self, use_cache: bool) -> None:
         self._bodies_idx: Dict[str, Any] = {}
+        self._bodies_state = np.zeros((0, BODY_STATE_SIZE))
+        # original masses of bodies that are currently parked
+        self._parked_bodies: Dict[str, float] = {}
+
+        # body names of each in-memory snapshot created with `save_state`
+        self._saved_state_bodies: Dict[int, Set[str]] = {}
+
+        # memoized state queries, valid until the simulation state changes
+        self.use_cache = use_cache
+        self._cache: Dict[Tuple, Any] = {}
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
 
     @property
     def dt(self) -> float:
@@ -87,9 +114,71 @@ class PyBulletSimulation:
         """ step the simulation forward for `num_steps` steps. """
         if DEBUG_CAM:
             self.read_camera_parameters()
+        self.invalidate_cache()
         for _ in range(self.n_substeps):
             self.bclient.stepSimulation()
 
+    def save_state(self) -> int:
+        """Save the current simulation state in memory.
+        Returns:
+            int: The state id used to restore the state.
+        """
+        state_id = self.bclient.saveState()
+        self._saved_state_bodies[state_id] = set(self._bodies_idx.keys())
+        return state_id
+
+    def restore_state(self, state_id: int) -> None:
+        """Restore a simulation state saved with `save_state`. Bodies created
+        after saving the state are removed, as pybullet can only restore states
+        of a simulation with the same bodies.
+        Args:
+            state_id (int): The state id returned by `save_state`.
+        """
+        saved_bodies = self._saved_state_bodies[state_id]
+        missing_bodies = saved_bodies - self._bodies_idx.keys()
+        if missing_bodies:
+            raise ValueError(f"Cannot restore state, bodies were removed: {', '.join(sorted(missing_bodies))}")
+        for body_name in self._bodies_idx.keys() - saved_bodies:
+            self.remove_body(body_name)
+        self.invalidate_cache()
+        self.bclient.restoreState(stateId=state_id)
+
+    def invalidate_cache(self) -> None:
+        """Drop all memoized state queries. Has to be called after changing the
+        simulation state through `bclient` directly."""
+        self._cache.clear()
+
+    def cached_query(self, key: Tuple, query: Callable, *args, **kwargs) -> Any:
+        """Return the memoized result of `query` or run and memoize it."""
+        if not self.use_cache:
+            return query(*args, **kwargs)
+        try:
+            result = self._cache[key]
+            self.cache_hits += 1
+        except KeyError:
+            result = self._cache[key] = query(*args, **kwargs)
+            self.cache_misses += 1
+        return result
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Returns the number of cache hits, misses and the hit rate."""
+        total_queries = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": round(self.cache_hits / total_queries, 3) if total_queries else 0.0,
+        }
+
+    def reset_cache_stats(self) -> None:
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _get_base_pose(self, body_id: int) -> Tuple:
+        return self.cached_query(("pose", body_id), self.bclient.getBasePositionAndOrientation, body_id)
+
+    def _get_base_velocity(self, body_id: int) -> Tuple:
+        return self.cached_query(("velocity", body_id), self.bclient.getBaseVelocity, body_id)
+
     def close(self) -> None:
         """Close the simulation."""
         self.bclient.disconnect()
@@ -137,6 +226,7 @@ class PyBulletSimulation:
         Args:
             body_name (str): The name of the body. Must be unique in the sim.
         """
+        self.invalidate_cache()
         self._bodies_idx[body_name] = self.bclient.loadURDF(**kwargs)
         return self._bodies_idx[body_name]
 
@@ -145,6 +235,7 @@ class PyBulletSimulation:
         Args:
             body_name (str): The name of the body. Must be unique in the sim.
         """
+        self.invalidate_cache()
         self._bodies_idx[body_name] = self.bclient.loadSDF(**kwargs)[0]
         return self._bodies_idx[body_name]
 
@@ -178,6 +269,7 @@ class PyBulletSimulation:
                                     linkIndex=link,
                                     lateralFriction=lateral_friction,
                                     **kwargs)
+        self.invalidate_cache()
 
     def set_spinning_friction(self, body: str, link: int, spinning_friction: float, **kwargs):
         """Set the spinning friction of a link.
@@ -190,6 +282,36 @@ class PyBulletSimulation:
                                     linkIndex=link,
                                     spinningFriction=spinning_friction,
                                     **kwargs)
+        self.invalidate_cache()
+
+    def get_dynamics_info(self, body: str, link: int) -> Tuple:
+        """Get the dynamics info of a link, e.g. mass and local inertial frame."""
+        return self.bclient.getDynamicsInfo(self._bodies_idx[body], link)
+
+    def create_constraint(self,
+                          parent_body: str,
+                          parent_link: int,
+                          child_body: str,
+                          child_link: int,
+                          joint_type: int,
+                          joint_axis: List,
+                          parent_frame_position: List,
+                          child_frame_position: List,
+                          **kwargs) -> int:
+        """Create a constraint between two links and return its unique id. Further
+        keyword arguments are passed to `changeConstraint`, e.g. `gearRatio` or `maxForce`."""
+        constraint_id = self.bclient.createConstraint(self._bodies_idx[parent_body],
+                                                      parent_link,
+                                                      self._bodies_idx[child_body],
+                                                      child_link,
+                                                      jointType=joint_type,
+                                                      jointAxis=joint_axis,
+                                                      parentFramePosition=parent_frame_position,
+                                                      childFramePosition=child_frame_position)
+        if kwargs:
+            self.bclient.changeConstraint(constraint_id, **kwargs)
+        self.invalidate_cache()
+        return constraint_id
 
     def get_quaternion_from_euler(self, euler_orn: List) -> List[float]:
         """ Convert euler angles to quaternions."""
@@ -199,6 +321,15 @@ class PyBulletSimulation:
         """ Convert quaternions to euler angles."""
         return self.bclient.getEulerFromQuaternion(quat)
 
+    def multiply_transforms(self, position_a: List, orientation_a: List, position_b: List,
+                            orientation_b: List) -> Tuple:
+        """ Compose two transforms given as position and quaternion."""
+        return self.bclient.multiplyTransforms(position_a, orientation_a, position_b, orientation_b)
+
+    def invert_transform(self, position: List, orientation: List) -> Tuple:
+        """ Invert a transform given as position and quaternion."""
+        return self.bclient.invertTransform(position, orientation)
+
     def get_base_position(self, body: str) -> List[float]:
         """Get the position of the body.
         Args:
@@ -206,7 +337,7 @@ class PyBulletSimulation:
         Returns:
             (x, y, z): The cartesian position.
         """
-        return self.bclient.getBasePositionAndOrientation(self._bodies_idx[body])[0]
+        return self._get_base_pose(self._bodies_idx[body])[0]
 
     def get_base_orientation(self, body: str) -> List[float]:
         """Get the orientation of the body.
@@ -215,7 +346,7 @@ class PyBulletSimulation:
         Returns:
             (x, y, z, w): The orientation as quaternion.
         """
-        return self.bclient.getBasePositionAndOrientation(self._bodies_idx[body])[1]
+        return self._get_base_pose(self._bodies_idx[body])[1]
 
     def get_base_rotation(self, body: str) -> List[float]:
         """Get the rotation of the body.
@@ -233,7 +364,7 @@ class PyBulletSimulation:
         Returns:
             (vx, vy, vz): The cartesian velocity.
         """
-        return self.bclient.getBaseVelocity(self._bodies_idx[body])[0]
+        return self._get_base_velocity(self._bodies_idx[body])[0]
 
     def get_base_angular_velocity(self, body: str) -> List[float]:
         """Get the angular velocity of the body.
@@ -242,7 +373,30 @@ class PyBulletSimulation:
         Returns:
             (wx, wy, wz): The angular velocity.
         """
-        return self.bclient.getBaseVelocity(self._bodies_idx[body])[1]
+        return self._get_base_velocity(self._bodies_idx[body])[1]
+
+    def get_bodies_state(self, bodies: List[str]) -> np.ndarray:
+        """Get the base state of multiple bodies in one pass.
+        Args:
+            bodies (List[str]): Body unique names.
+        Returns:
+            np.ndarray: Array of shape (N, 16) with one row per body containing
+            (x, y, z), (rx, ry, rz), (vx, vy, vz), (wx, wy, wz), (x, y, z, w).
+            The array is preallocated and overwritten by the next call.
+        """
+        if len(self._bodies_state) != len(bodies):
+            self._bodies_state = np.zeros((len(bodies), BODY_STATE_SIZE))
+        state = self._bodies_state
+        for row, body in enumerate(bodies):
+            body_id = self._bodies_idx[body]
+            position, orientation = self._get_base_pose(body_id)
+            velocity, angular_velocity = self._get_base_velocity(body_id)
+            state[row, BODY_POSITION] = position
+            state[row, BODY_ROTATION] = self.bclient.getEulerFromQuaternion(orientation)
+            state[row, BODY_VELOCITY] = velocity
+            state[row, BODY_ANGULAR_VELOCITY] = angular_velocity
+            state[row, BODY_ORIENTATION] = orientation
+        return state
 
     def get_joint_angle(self, body: str, joint: int) -> float:
         """Get the angle of the joint of the body.
@@ -252,10 +406,29 @@ class PyBulletSimulation:
         Returns:
             float: The angle.
         """
-        return self.bclient.getJointState(self._bodies_idx[body], joint)[0]
+        body_id = self._bodies_idx[body]
+        return self.cached_query(("joint", body_id, joint), self.bclient.getJointState, body_id, joint)[0]
+
+    def get_joint_angles(self, body: str, joints: Sequence[int]) -> np.ndarray:
+        """Get the angles of several joints of the body with a single query.
+        Args:
+            body (str): Body unique name.
+            joints (Sequence[int]): Joint indices in the body.
+        Returns:
+            np.ndarray: The angles.
+        """
+        body_id = self._bodies_idx[body]
+        joints = tuple(joints)
+        joint_states = self.cached_query(("joints", body_id, joints), self.bclient.getJointStates, body_id, joints)
+        return np.array([joint_state[0] for joint_state in joint_states])
 
     def get_link_state(self, body: str, link: int) -> Tuple:
-        return self.bclient.getLinkState(self._bodies_idx[body], link, computeLinkVelocity=1)
+        body_id = self._bodies_idx[body]
+        return self.cached_query(("link", body_id, link),
+                                 self.bclient.getLinkState,
+                                 body_id,
+                                 link,
+                                 computeLinkVelocity=1)
 
     def get_link_position(self, body: str, link: int) -> List:
         """Get the position of the link of the body.
@@ -265,7 +438,7 @@ class PyBulletSimulation:
         Returns:
             (x, y, z): The cartesian position.
         """
-        return self.bclient.getLinkState(self._bodies_idx[body], link)[0]
+        return self.get_link_state(body, link)[0]
 
     def get_link_velocity(self, body: str, link: int) -> List:
         """Get the velocity of the link of the body.
@@ -275,7 +448,38 @@ class PyBulletSimulation:
         Returns:
             (vx, vy, vz): The cartesian velocity.
         """
-        return self.bclient.getLinkState(self._bodies_idx[body], link, computeLinkVelocity=True)[6]
+        return self.get_link_state(body, link)[6]
+
+    def calculate_jacobian(self, body: str, link: int, local_position: List, joint_angles: List) -> Tuple:
+        """Get the linear and angular jacobian of a point in the link frame at the joint angles
+        of all movable joints. Velocities and accelerations are zero.
+        Args:
+            body (str): Body unique name.
+            link (int): Link index in the body.
+            local_position (List[float]): Point in the link frame.
+            joint_angles (List[float]): Angles of all movable joints.
+        Returns:
+            (linear_jacobian, angular_jacobian)
+        """
+        zeros = [0.0] * len(joint_angles)
+        return self.bclient.calculateJacobian(self._bodies_idx[body], link, local_position, joint_angles, zeros,
+                                              zeros)
+
+    def calculate_inverse_kinematics(self, body: str, link: int, position: List, orientation: Optional[List],
+                                     **kwargs) -> Tuple:
+        """Solve the angles of all movable joints for a link pose. Further keyword arguments
+        are passed to `calculateInverseKinematics`, e.g. joint limits or `currentPositions`.
+        Args:
+            body (str): Body unique name.
+            link (int): Link index in the body.
+            position (List[float]): Target position of the link.
+            orientation (List[float], optional): Target quaternion of the link.
+        """
+        return self.bclient.calculateInverseKinematics(bodyUniqueId=self._bodies_idx[body],
+                                                       endEffectorLinkIndex=link,
+                                                       targetPosition=position,
+                                                       targetOrientation=orientation,
+                                                       **kwargs)
 
     def get_num_joints(self, body: str) -> int:
         return self.bclient.getNumJoints(self._bodies_idx[body])
@@ -304,6 +508,7 @@ class PyBulletSimulation:
             targetPositions=target_angles,
             forces=forces,
         )
+        self.invalidate_cache()
 
     def control_single_joint(self, body: str, joint: int, pos: float, force: float) -> None:
         self.bclient.setJointMotorControl2(self._bodies_idx[body],
@@ -311,6 +516,7 @@ class PyBulletSimulation:
                                            controlMode=self.bclient.POSITION_CONTROL,
                                            targetPosition=pos,
                                            force=force)
+        self.invalidate_cache()
 
     def set_joint_angles(self, body: str, joints: List, angles: List) -> None:
         """Set the angles of the joints of the body.
@@ -319,8 +525,12 @@ class PyBulletSimulation:
             joints (List[int]): List of joint indices.
             angles (List[float]): List of target angles.
         """
-        for joint, angle in zip(joints, angles):
-            self.set_joint_angle(body, joint, angle)
+        self.invalidate_cache()
+        # reset all joints with a single call, setting their velocities to zero like `resetJointState`
+        self.bclient.resetJointStatesMultiDof(self._bodies_idx[body],
+                                              jointIndices=joints,
+                                              targetValues=[[angle] for angle in angles],
+                                              targetVelocities=[[0.0]] * len(joints))
 
     def set_joint_angle(self, body: str, joint: int, angle: float):
         """Set the angle of the joint of the body.
@@ -329,6 +539,7 @@ class PyBulletSimulation:
             joint (int): Joint index in the body.
             angle (float): Target angle.
         """
+        self.invalidate_cache()
         self.bclient.resetJointState(bodyUniqueId=self._bodies_idx[body], jointIndex=joint, targetValue=angle)
 
     def set_base_pose(self, body: str, position: List, orientation: List) -> None:
@@ -338,6 +549,7 @@ class PyBulletSimulation:
             position (x, y, z): The target cartesian position.
             orientation (x, y, z, w): The target orientation as quaternion.
         """
+        self.invalidate_cache()
         self.bclient.resetBasePositionAndOrientation(bodyUniqueId=self._bodies_idx[body],
                                                      posObj=position,
                                                      ornObj=orientation)
@@ -366,6 +578,7 @@ class PyBulletSimulation:
             visual_kwargs (dict, optional): Visual kwargs. Defaults to {}.
             collision_kwargs (dict, optional): Collision kwargs. Defaults to {}.
         """
+        self.invalidate_cache()
         baseVisualShapeIndex = self.bclient.createVisualShape(geom_type, **visual_kwargs)
         if not ghost:
             baseCollisionShapeIndex = self.bclient.createCollisionShape(geom_type, **collision_kwargs)
@@ -512,13 +725,88 @@ class PyBulletSimulation:
 
     def get_contact_points(self, body1: str, body2: str, **kwargs) -> Tuple:
         """ Returns a tuple of contact point lists of body1 and body2 """
-        return self.bclient.getContactPoints(self._bodies_idx[body1], self._bodies_idx[body2], **kwargs)
+        body1_id, body2_id = self._bodies_idx[body1], self._bodies_idx[body2]
+        key = ("contact", body1_id, body2_id, *sorted(kwargs.items()))
+        return self.cached_query(key, self.bclient.getContactPoints, body1_id, body2_id, **kwargs)
+
+    def get_link_contacts(self, body: str, links: Sequence[int]) -> np.ndarray:
+        """Returns which links of a body are in contact with other bodies. All
+        contact points of the body are queried at once.
+        Args:
+            body (str): Body unique name.
+            links (Sequence[int]): Link indices of the body.
+        Returns:
+            np.ndarray: Boolean array of shape (max body id + 1, len(links)). The entry
+            (i, j) is True if link `links[j]` is in contact with the body of id i.
+        """
+        body_id = self._bodies_idx[body]
+        links = tuple(links)
+        return self.cached_query(("link_contacts", body_id, links), self._query_link_contacts, body_id, links)
+
+    def _query_link_contacts(self, body_id: int, links: Tuple[int, ...]) -> np.ndarray:
+        contact_index = np.zeros((max(self._bodies_idx.values()) + 1, len(links)), dtype=bool)
+        link_columns = {link: column for column, link in enumerate(links)}
+        # the queried body is always body A of the returned contact points
+        for contact_point in self.bclient.getContactPoints(bodyA=body_id):
+            column = link_columns.get(contact_point[3])
+            if column is not None and contact_point[2] < len(contact_index):
+                contact_index[contact_point[2], column] = True
+        return contact_index
+
+    def ray_test_batch(self, ray_from_positions: List, ray_to_positions: List) -> Tuple:
+        """Cast a batch of rays.
+        Args:
+            ray_from_positions (List): Start positions of the rays.
+            ray_to_positions (List): End positions of the rays.
+        Returns:
+            Tuple: (objectUniqueId, linkIndex, hitFraction, hitPosition, hitNormal) of each ray.
+        """
+        # a few rays do not benefit from multithreading
+        return self.bclient.rayTestBatch(ray_from_positions, ray_to_positions, numThreads=1)
 
     def remove_body(self, body_name):
         """Removes a body from the simulation dictionary"""
         if body_name in self._bodies_idx:
+            self.invalidate_cache()
             self.bclient.removeBody(self._bodies_idx[body_name])
             del self._bodies_idx[body_name]
+            self._parked_bodies.pop(body_name, None)
+
+    def park_body(self, body: str, position: List) -> None:
+        """Move a body out of the scene without removing it from the simulation.
+        The body is made static and excluded from collision detection until it
+        is reactivated with `unpark_body`.
+        Args:
+            body (str): Body unique name.
+            position (x, y, z): The parking position.
+        """
+        self.invalidate_cache()
+        body_id = self._bodies_idx[body]
+        if body not in self._parked_bodies:
+            self._parked_bodies[body] = self.bclient.getDynamicsInfo(body_id, -1)[0]
+        self.bclient.changeDynamics(body_id, -1, mass=0)
+        self.bclient.setCollisionFilterGroupMask(body_id, -1, collisionFilterGroup=0, collisionFilterMask=0)
+        self.bclient.resetBasePositionAndOrientation(body_id, position, [0, 0, 0, 1])
+        self.bclient.resetBaseVelocity(body_id, [0, 0, 0], [0, 0, 0])
+
+    def unpark_body(self, body: str) -> None:
+        """Restore mass and collision detection of a parked body.
+        Args:
+            body (str): Body unique name.
+        """
+        if body not in self._parked_bodies:
+            return
+        self.invalidate_cache()
+        body_id = self._bodies_idx[body]
+        self.bclient.changeDynamics(body_id, -1, mass=self._parked_bodies.pop(body))
+        self.bclient.setCollisionFilterGroupMask(body_id,
+                                                 -1,
+                                                 collisionFilterGroup=self.collision_filter_group,
+                                                 collisionFilterMask=self.collision_filter_mask)
+        self.bclient.resetBaseVelocity(body_id, [0, 0, 0], [0, 0, 0])
+
+    def is_parked(self, body: str) -> bool:
+        return body in self._parked_bodies
 
     def set_orientation_lines(self, robot_uid, parent_link_index, offset=0.065):
         """ Visualize orientation lines for the robots end effector."""
@@ -535,3 +823,140 @@ class PyBulletSimulation:
                                       line_color,
                                       parentObjectUniqueId=robot_uid,
                                       parentLinkIndex=parent_link_index)
+
+
+class SimulationCell(PyBulletSimulation):
+    """A workcell of a `TiledSimulation`. It shares the physics client of the tiled
+    simulation, but keeps its own bodies and positions are relative to its origin,
+    such that robots and tasks behave as in a simulation of their own. Bodies of
+    the cell only collide with bodies of the same cell."""
+
+    def __init__(self, world: "TiledSimulation", origin: Sequence[float], collision_filter_group: int):
+        self.world = world
+        self.bclient = world.bclient
+        self.render_on = world.render_on
+        self.time_step = world.time_step
+        self.n_substeps = world.n_substeps
+        self.origin = np.array(origin, dtype=float)
+        self.collision_filter_group = collision_filter_group
+        self.collision_filter_mask = collision_filter_group
+        self._init_bookkeeping(world.use_cache)
+
+    def __deepcopy__(self, memo: Dict) -> "SimulationCell":
+        # a cell passed to `gym.make` is part of the environment spec, which wrappers copy,
+        # but a copy must not own and disconnect the physics client
+        return self
+
+    def to_world(self, position: Sequence[float]) -> List[float]:
+        return (self.origin + position).tolist()
+
+    def to_cell(self, position: Sequence[float]) -> List[float]:
+        return (np.asarray(position) - self.origin).tolist()
+
+    def step(self) -> None:
+        """Step the whole tiled simulation, which steps all cells at once."""
+        self.world.step()
+
+    def save_state(self) -> int:
+        raise NotImplementedError("States of a single cell of a tiled simulation cannot be saved")
+
+    def restore_state(self, state_id: int) -> None:
+        raise NotImplementedError("States of a single cell of a tiled simulation cannot be restored")
+
+    def close(self) -> None:
+        """The physics client is closed by the tiled simulation."""
+
+    def _filter_collisions(self, body_id: int) -> None:
+        for link in range(-1, self.bclient.getNumJoints(body_id)):
+            self.bclient.setCollisionFilterGroupMask(body_id,
+                                                     link,
+                                                     collisionFilterGroup=self.collision_filter_group,
+                                                     collisionFilterMask=self.collision_filter_mask)
+
+    def _get_base_pose(self, body_id: int) -> Tuple:
+        return self.cached_query(("pose", body_id), self._query_base_pose, body_id)
+
+    def _query_base_pose(self, body_id: int) -> Tuple:
+        position, orientation = self.bclient.getBasePositionAndOrientation(body_id)
+        return tuple(self.to_cell(position)), orientation
+
+    def loadURDF(self, body_name: str, **kwargs) -> str:
+        kwargs["basePosition"] = self.to_world(kwargs.get("basePosition", [0, 0, 0]))
+        body_id = super().loadURDF(body_name, **kwargs)
+        self._filter_collisions(body_id)
+        return body_id
+
+    def loadSDF(self, body_name: str, **kwargs) -> str:
+        body_id = super().loadSDF(body_name, **kwargs)
+        self.bclient.resetBasePositionAndOrientation(body_id, self.to_world([0, 0, 0]), [0, 0, 0, 1])
+        self._filter_collisions(body_id)
+        return body_id
+
+    def _create_geometry(self, body_name: str, geom_type: Any, mass: float = 0, position: List = [0, 0, 0], **kwargs):
+        super()._create_geometry(body_name, geom_type, mass=mass, position=self.to_world(position), **kwargs)
+        self._filter_collisions(self._bodies_idx[body_name])
+
+    def set_base_pose(self, body: str, position: List, orientation: List) -> None:
+        super().set_base_pose(body, self.to_world(position), orientation)
+
+    def get_link_state(self, body: str, link: int) -> Tuple:
+        body_id = self._bodies_idx[body]
+        return self.cached_query(("link", body_id, link), self._query_link_state, body_id, link)
+
+    def _query_link_state(self, body_id: int, link: int) -> Tuple:
+        link_state = list(self.bclient.getLinkState(body_id, link, computeLinkVelocity=1))
+        # the center of mass and the link frame are in world coordinates
+        link_state[0] = tuple(self.to_cell(link_state[0]))
+        link_state[4] = tuple(self.to_cell(link_state[4]))
+        return tuple(link_state)
+
+    def calculate_inverse_kinematics(self, body: str, link: int, position: List, orientation: Optional[List],
+                                     **kwargs) -> Tuple:
+        # targets are already in the base frame if the current positions are given
+        if "currentPositions" not in kwargs:
+            position = self.to_world(position)
+        return super().calculate_inverse_kinematics(body, link, position, orientation, **kwargs)
+
+    def ray_test_batch(self, ray_from_positions: List, ray_to_positions: List) -> Tuple:
+        ray_from_positions = (np.asarray(ray_from_positions) + self.origin).tolist()
+        ray_to_positions = (np.asarray(ray_to_positions) + self.origin).tolist()
+        results = super().ray_test_batch(ray_from_positions, ray_to_positions)
+        return tuple((hit_obj_id, link_idx, hit_fraction, self.to_cell(hit_pos) if hit_obj_id != -1 else hit_pos,
+                      hit_normal) for hit_obj_id, link_idx, hit_fraction, hit_pos, hit_normal in results)
+
+    def park_body(self, body: str, position: List) -> None:
+        super().park_body(body, self.to_world(position))
+
+
+class TiledSimulation(PyBulletSimulation):
+    """A simulation of `num_cells` workcells, which are tiled on a grid in a single
+    physics client and stepped together. Each cell is used like the simulation of
+    an environment of its own, see `lanro_gym.vector.TiledVectorEnv`.
+    Args:
+        num_cells (int): The number of cells.
+        cell_spacing (float): The distance between the origins of neighboring cells in meters.
+    """
+    # pybullet collision filters are 32 bit integers
+    max_collision_groups: int = 30
+
+    def __init__(self,
+                 num_cells: int,
+                 cell_spacing: float = 3.0,
+                 n_substeps: int = 20,
+                 render: bool = False,
+                 use_cache: bool = True):
+        super().__init__(n_substeps=n_substeps, render=render, use_cache=use_cache)
+        columns = int(np.ceil(np.sqrt(num_cells)))
+        # cells only share a collision group beyond `max_collision_groups` cells, which are far apart
+        self.cells = [
+            SimulationCell(self,
+                           origin=[cell_spacing * (cell_idx % columns), cell_spacing * (cell_idx // columns), 0],
+                           collision_filter_group=1 << (cell_idx % self.max_collision_groups))
+            for cell_idx in range(num_cells)
+        ]
+
+    def step(self) -> None:
+        """Step all cells with a single loop of `n_substeps`."""
+        for cell in self.cells:
+            cell.invalidate_cache()
+        super().step()
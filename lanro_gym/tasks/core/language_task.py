@@ -1,13 +1,12 @@
-import itertools
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 from lanro_gym.robots.pybrobot import PyBulletRobot
-from lanro_gym.simulation import PyBulletSimulation
+from lanro_gym.simulation import PyBulletSimulation, BODY_OBS_STATE
 from lanro_gym.tasks.scene import basic_scene
-from lanro_gym.env_utils import RGBCOLORS, TaskObjectList, SHAPES, WEIGHTS, SIZES, valid_task_object_combination, distinguishable_by_primary_or_secondary
-from lanro_gym.language_utils import create_commands, word_in_string
-import itertools
+from lanro_gym.env_utils import RGBCOLORS, TaskObjectList, SHAPES, WEIGHTS, SIZES
+from lanro_gym.language_utils import InstructionSpace, word_in_string
+from lanro_gym.utils import sample_separated_positions
 
 
 class LanguageTask:
@@ -40,6 +39,9 @@ class LanguageTask:
     instruction_sim_id = 43
     action_repair_sim_id = 44
 
+    # pooled objects are parked far below the table, outside of any camera view
+    pool_parking_position: List = [0.0, 0.0, -150.0]
+
     def __init__(self,
                  sim: PyBulletSimulation,
                  robot: PyBulletRobot,
@@ -49,7 +51,8 @@ class LanguageTask:
                  delay_action_repair: bool,
                  use_negations_action_repair: bool,
                  num_obj: int,
-                 use_synonyms: bool = False):
+                 use_synonyms: bool = False,
+                 use_object_pool: bool = False):
         self.sim = sim
         self.robot = robot
         self.use_hindsight_instructions = use_hindsight_instructions
@@ -58,6 +61,15 @@ class LanguageTask:
         self.num_obj = num_obj
         self.mode = mode
         self.use_synonyms = use_synonyms
+        # create every object of the task object list once and move objects in
+        # and out of the scene instead of reloading them on every reset
+        self.use_object_pool = use_object_pool
+        self.obj_indices_selection = np.array([], dtype=int)
+        # body keys and identifiers of the observed objects, rebuilt when a new selection is sampled
+        self._obs_selection: Optional[np.ndarray] = None
+        self._obs_body_keys: List[str] = []
+        self._obs_identifiers = np.zeros((0, 0))
+        self._obs_identifiers_out: Optional[np.ndarray] = None
 
         self.delay_action_repair = delay_action_repair
         self.ep_delayed_ar_command = None
@@ -67,6 +79,7 @@ class LanguageTask:
             shape_mode='shape' in mode,
             size_mode='size' in mode,
             weight_mode='weight' in mode,
+            use_synonyms=use_synonyms,
         )
         self.task_object_list = TaskObjectList(sim, **_args)
         self.object_properties = self.task_object_list.get_obj_properties()
@@ -87,36 +100,43 @@ class LanguageTask:
 
     def _create_scene(self) -> None:
         basic_scene(self.sim)
+        if self.use_object_pool:
+            self._create_object_pool()
 
-    def get_all_instructions(self) -> List[str]:
-        instruction_set = np.concatenate([
-            create_commands("instruction",
-                            _property_tuple,
-                            action_verbs=self.action_verbs,
-                            use_synonyms=self.use_synonyms) for _property_tuple in self.object_properties
-        ])
+    def _create_object_pool(self) -> None:
+        """Load all task objects once and park them outside of the scene"""
+        for obj_idx, task_object in enumerate(self.task_object_list.objects):
+            object_body_key = f"object{obj_idx}"
+            task_object.load(object_body_key)
+            self.sim.park_body(object_body_key, self.pool_parking_position)
+
+    def get_commands(self, command_type: str, obj_idx: int) -> np.ndarray:
+        """Returns all commands of one type for a task object"""
+        action_verbs = self.action_verbs if command_type == "instruction" else ()
+        return self.task_object_list.get_sentences(obj_idx, command_type, action_verbs)
+
+    def sample_command(self, command_type: str, obj_idx: int) -> str:
+        commands = self.get_commands(command_type, obj_idx)
+        return commands[self.np_random.integers(len(commands))]
+
+    def get_instruction_space(self) -> InstructionSpace:
+        obj_indices = range(len(self.task_object_list))
+        instruction_set = np.concatenate([self.get_commands("instruction", _obj_idx) for _obj_idx in obj_indices])
+        action_repair_set = []
         if self.use_action_repair:
-            action_repair_set = np.concatenate([
-                create_commands("repair", _property_tuple, use_synonyms=self.use_synonyms)
-                for _property_tuple in self.object_properties
-            ])
-            negations = np.concatenate([
-                create_commands("negation", _property_tuple, use_synonyms=self.use_synonyms)
-                for _property_tuple in self.object_properties
-            ]) if self.use_negations_action_repair else []
+            action_repair_set = np.concatenate([self.get_commands("repair", _obj_idx) for _obj_idx in obj_indices])
+            negations = np.concatenate([self.get_commands("negation", _obj_idx) for _obj_idx in obj_indices
+                                        ]) if self.use_negations_action_repair else []
             action_repair_set = np.concatenate([action_repair_set, negations])
-            # combine each instruction with each action repair command
-            # NOTE: concatenating two huge arrays will make the SWAP MEM explode
-            # -> For-Loop is slow but works
-            instruction_action_repair_set = [
-                _instr + ' ' + _ar for _instr, _ar in itertools.product(instruction_set, action_repair_set)
-            ]
-            instruction_set = np.concatenate((instruction_set, instruction_action_repair_set))
-        return list(set(instruction_set))
+        # each instruction is combined with each action repair command lazily
+        return InstructionSpace(instruction_set, action_repair_set)
+
+    def get_all_instructions(self) -> List[str]:
+        return list(self.get_instruction_space())
 
     def get_instructions_by_properties(self):
         inst_properties = {}
-        inst_set = self.get_all_instructions()
+        inst_set = self.get_instruction_space()
         for inst in inst_set:
             if inst not in inst_properties.keys():
                 inst_properties[inst] = {"color": '', "shape": '', "weight": '', "size": ''}
@@ -139,93 +159,71 @@ class LanguageTask:
                         inst_properties[inst]["size"] = inst_word
         return inst_properties
 
-    def get_obs(self) -> np.ndarray:
-        observation = []
-        for idx in self.obj_indices_selection:
-            obj_key = f"object{idx}"
-            object_position = np.array(self.sim.get_base_position(obj_key))
-            object_rotation = np.array(self.sim.get_base_rotation(obj_key))
-            object_velocity = np.array(self.sim.get_base_velocity(obj_key))
-            object_angular_velocity = np.array(self.sim.get_base_angular_velocity(obj_key))
-            object_identifier = self.task_object_list.objects[idx].get_onehot()
-            observation.extend(
-                [object_position, object_rotation, object_velocity, object_angular_velocity, object_identifier])
-        return np.concatenate(observation)
-
-    def get_contact_with_fingers(self, target_body) -> List:
+    def get_obs(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Position, rotation, velocity, angular velocity and identifier of each object. Returns a new
+        array or fills `out` in place if given, where the identifiers are only written for a new selection."""
+        if self._obs_selection is not self.obj_indices_selection:
+            self._obs_selection = self.obj_indices_selection
+            self._obs_body_keys = [f"object{idx}" for idx in self.obj_indices_selection]
+            self._obs_identifiers = np.array(
+                [self.task_object_list.objects[idx].get_onehot() for idx in self.obj_indices_selection])
+            self._obs_identifiers_out = None
+        bodies_state = self.sim.get_bodies_state(self._obs_body_keys)
+        if out is None:
+            return np.concatenate([bodies_state[:, BODY_OBS_STATE], self._obs_identifiers], axis=1).flatten()
+        objects_obs = out.reshape(len(bodies_state), -1)
+        objects_obs[:, BODY_OBS_STATE] = bodies_state[:, BODY_OBS_STATE]
+        if self._obs_identifiers_out is not out:
+            objects_obs[:, BODY_OBS_STATE.stop:] = self._obs_identifiers
+            self._obs_identifiers_out = out
+        return out
+
+    def get_contact_with_fingers(self, target_body) -> np.ndarray:
         # check contact with fingers defined by ee_joints
-        finger_contacts = [
-            bool(self.sim.get_contact_points(target_body, self.robot.body_name, linkIndexB=finger_idx))
-            # assume the first two indices are the fingers of the end effector
-            for finger_idx in self.robot.ee_joints[:2]
-        ]
-        return finger_contacts
+        # assume the first two indices are the fingers of the end effector
+        finger_contacts = self.sim.get_link_contacts(self.robot.body_name, self.robot.ee_joints[:2])
+        return finger_contacts[self.sim.get_object_id(target_body)]
 
     def _sample_goal(self) -> None:
         """Randomly select one of the generated instructions for the current goal object"""
-        property_tuple = self.task_object_list.objects[self.goal_obj_idx].get_properties()
-        sentences = create_commands("instruction",
-                                    property_tuple,
-                                    action_verbs=self.action_verbs,
-                                    use_synonyms=self.use_synonyms)
-        self.current_instruction = self.np_random.choice(sentences, 1)
+        self.current_instruction = np.array([self.sample_command("instruction", self.goal_obj_idx)])
         self.sim.bclient.addUserDebugText(self.get_goal(), [0.05, -.3, .4],
                                           textSize=2.0,
                                           replaceItemUniqueId=self.instruction_sim_id)
 
     def _sample_objects(self) -> Tuple:
         """Randomize start position of objects."""
-        while True:
-            obj_positions = [[0.0, 0.0, self.object_size / 2] +
-                             self.np_random.uniform(self.obj_range_low, self.obj_range_high)
-                             for _ in range(self.num_obj)]
-            unique_distance_combinations = [np.linalg.norm(a - b) for a, b in itertools.combinations(obj_positions, 2)]
-            # if minimal distance between two objects is greater than three times
-            # the object size (as objects should not be on top of each other
-            # and we like to have a minimal distance between them)
-            if np.min(unique_distance_combinations) > self.object_size * 3:
-                return tuple(obj_positions)
-
-    def is_unique_obj_selection(self, obj_list):
-        for obj_tuple in itertools.combinations(obj_list, 2):
-            obj1, obj2 = obj_tuple
-            if not distinguishable_by_primary_or_secondary(obj1, obj2):
-                return False
-        return True
+        # minimal distance between two objects is greater than three times
+        # the object size (as objects should not be on top of each other
+        # and we like to have a minimal distance between them)
+        obj_positions = sample_separated_positions(self.np_random, self.obj_range_low, self.obj_range_high,
+                                                   self.num_obj, self.object_size * 3)
+        return tuple(np.array([0.0, 0.0, self.object_size / 2]) + obj_positions)
 
     def sample_task_objects(self):
-        # remove old objects, as we do not want to destroy the whole simulation
-        remove_obj_keys = [key for key in self.sim._bodies_idx.keys() if 'object' in key]
-        for _key in remove_obj_keys:
-            self.sim.remove_body(_key)
+        if self.use_object_pool:
+            # park objects of the previous episode
+            for obj_idx in self.obj_indices_selection:
+                self.sim.park_body(f"object{obj_idx}", self.pool_parking_position)
+        else:
+            # remove old objects, as we do not want to destroy the whole simulation
+            remove_obj_keys = [key for key in self.sim._bodies_idx.keys() if 'object' in key]
+            for _key in remove_obj_keys:
+                self.sim.remove_body(_key)
 
         # Ensure we only have duplicates along one feature dimension
-        while True:
-            self.obj_indices_selection = self.np_random.choice(len(self.task_object_list),
-                                                               size=self.num_obj,
-                                                               replace=False)
-            self.goal_obj_idx = self.np_random.choice(self.obj_indices_selection, 1)[0]
-            self.non_goal_body_indices = [idx for idx in self.obj_indices_selection if idx != self.goal_obj_idx]
-            valid_combination = np.all([
-                valid_task_object_combination(self.task_object_list[self.goal_obj_idx],
-                                              self.task_object_list[non_goal_idx])
-                for non_goal_idx in self.non_goal_body_indices
-            ])
-            if self.use_action_repair:
-                unique_obj_selection = self.is_unique_obj_selection(
-                    [self.task_object_list[self.goal_obj_idx]] +
-                    [self.task_object_list[non_goal_idx] for non_goal_idx in self.non_goal_body_indices])
-                if valid_combination and unique_obj_selection:
-                    break
-            else:
-                if valid_combination:
-                    break
+        self.obj_indices_selection, self.goal_obj_idx = self.task_object_list.sample_valid_selection(
+            self.np_random, self.num_obj, unique=self.use_action_repair)
+        self.non_goal_body_indices = [idx for idx in self.obj_indices_selection if idx != self.goal_obj_idx]
 
         self.goal_object_body_key = f"object{self.goal_obj_idx}"
 
         for obj_idx in self.obj_indices_selection:
             object_body_key = f"object{obj_idx}"
-            self.task_object_list.objects[obj_idx].load(object_body_key)
+            if self.use_object_pool:
+                self.sim.unpark_body(object_body_key)
+            else:
+                self.task_object_list.objects[obj_idx].load(object_body_key)
 
     def return_delayed_action_repair(self):
         if self.ep_action_repair and self.delay_action_repair and self.ep_delayed_ar_command is not None:
@@ -244,8 +242,10 @@ class LanguageTask:
             else:
                 self._delay_ctr -= 1
 
-    def merge_instruction_action_repair(self, repair_commands):
-        action_repair_command = self.np_random.choice(repair_commands, 1)[0]
+    def merge_instruction_action_repair(self, command_type: str, obj_idx: int):
+        """Sample an action repair command of type `repair` or `negation` for
+        the given object and add it to the current instruction"""
+        action_repair_command = self.sample_command(command_type, obj_idx)
         if self.delay_action_repair and self.ep_delayed_ar_command is None:
             self.ep_delayed_ar_command = action_repair_command
             self._delay_ctr = self.np_random.integers(0, 20)
@@ -270,10 +270,8 @@ class LanguageTask:
             self.goal_obj_idx = self.np_random.choice(self.non_goal_body_indices, 1)[0]
             self.non_goal_body_indices = [idx for idx in self.obj_indices_selection if idx != self.goal_obj_idx]
             self.goal_object_body_key = f"object{self.goal_obj_idx}"
-            target_property_tuple = self.task_object_list.objects[self.goal_obj_idx].get_properties()
             # generate action repair command considering new goal
-            repair_commands = create_commands("repair", target_property_tuple, use_synonyms=self.use_synonyms)
-            self.merge_instruction_action_repair(repair_commands)
+            self.merge_instruction_action_repair("repair", self.goal_obj_idx)
             return -1.0
         else:
             # if action repair already triggered and now successful with new goal (only count onces per episode)
@@ -284,14 +282,9 @@ class LanguageTask:
             return 0.0
 
     def generate_hindsight_instruction(self, _obj_idx):
-        property_tuple = self.task_object_list.objects[_obj_idx].get_properties()
-        hindsight_sentences = create_commands("instruction",
-                                              property_tuple,
-                                              action_verbs=self.action_verbs,
-                                              use_synonyms=self.use_synonyms)
         self.discovered_hindsight_instruction_ctr += 1
         self.ep_hindsight_instruction_returned = True
-        self.hindsight_instruction = self.np_random.choice(hindsight_sentences, 1)[0]
+        self.hindsight_instruction = self.sample_command("instruction", _obj_idx)
 
     def reset_hi_and_ar(self):
         self.sim.bclient.removeUserDebugItem(self.action_repair_sim_id)
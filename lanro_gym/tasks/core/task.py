@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, Optional
 import numpy as np
 from lanro_gym.utils import goal_distance
 
@@ -15,8 +15,8 @@ class Task:
         """Return the current goal."""
         return self.goal.copy()
 
-    def get_obs(self):
-        """Return the observation associated to the task."""
+    def get_obs(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Return the observation associated to the task, written into `out` if given."""
         raise NotImplementedError
 
     def get_achieved_goal(self):
@@ -17,6 +17,7 @@ class NLGrasp(NLLift):
                  delay_action_repair: bool = False,
                  use_negations_action_repair: bool = False,
                  use_synonyms: bool = False,
+                 use_object_pool: bool = False,
                  mode: str = 'Color'):
         super().__init__(sim,
                          robot,
@@ -29,6 +30,7 @@ class NLGrasp(NLLift):
                          delay_action_repair=delay_action_repair,
                          use_negations_action_repair=use_negations_action_repair,
                          use_synonyms=use_synonyms,
+                         use_object_pool=use_object_pool,
                          mode=mode)
 
         self.action_verbs = ["grasp", "grip", "grab"]
@@ -2,7 +2,6 @@ import numpy as np
 from lanro_gym.robots import PyBulletRobot
 from lanro_gym.simulation import PyBulletSimulation
 from lanro_gym.tasks.core import LanguageTask
-from lanro_gym.language_utils import create_commands
 
 
 class NLLift(LanguageTask):
@@ -19,9 +18,10 @@ class NLLift(LanguageTask):
                  delay_action_repair: bool = False,
                  use_negations_action_repair: bool = False,
                  use_synonyms: bool = False,
+                 use_object_pool: bool = False,
                  mode: str = 'Color'):
         super().__init__(sim, robot, mode, use_hindsight_instructions, use_action_repair, delay_action_repair,
-                         use_negations_action_repair, num_obj, use_synonyms)
+                         use_negations_action_repair, num_obj, use_synonyms, use_object_pool)
         self.max_goal_height = max_goal_height
         self.min_goal_height = min_goal_height
         self.obj_range_low = np.array([-obj_xy_range / 2, -obj_xy_range / 2, 0])
@@ -44,11 +44,11 @@ class NLLift(LanguageTask):
 
     def grasped_and_lifted(self, obj_body_key):
         obj_pos = np.array(self.sim.get_base_position(obj_body_key))
-        hit_obj_id = self.robot.gripper_ray_obs()[0]
+        hit_obj_ids = self.robot.get_gripper_ray_hits()
         obj_id = self.sim.get_object_id(obj_body_key)
         all_fingers_have_contact = np.all(self.get_contact_with_fingers(obj_body_key))
         achieved_min_height = obj_pos[-1] > self.ep_height_threshold
-        inside_gripper = hit_obj_id == obj_id
+        inside_gripper = np.any(hit_obj_ids == obj_id)
         return all_fingers_have_contact and achieved_min_height and inside_gripper
 
     def is_success(self):
@@ -70,17 +70,11 @@ class NLLift(LanguageTask):
                     if self.use_negations_action_repair and self.np_random.random() < 0.5:
                         # action correction with negation
                         # "lift the red object" -> lifts green object -> correction "no not the green object"
-                        target_property_tuple = self.task_object_list.objects[other_object_idx].get_properties()
-                        repair_commands = create_commands("negation",
-                                                          target_property_tuple,
-                                                          use_synonyms=self.use_synonyms)
+                        repair_command_type, repair_obj_idx = "negation", other_object_idx
                     else:
                         # additional feedback for the goal object, lifting a wrong object
                         # "lift the red block" -> *lifts green block* -> "the red block!"
-                        target_property_tuple = self.task_object_list.objects[self.goal_obj_idx].get_properties()
-                        repair_commands = create_commands("repair",
-                                                          target_property_tuple,
-                                                          use_synonyms=self.use_synonyms)
-                    self.merge_instruction_action_repair(repair_commands)
+                        repair_command_type, repair_obj_idx = "repair", self.goal_obj_idx
+                    self.merge_instruction_action_repair(repair_command_type, repair_obj_idx)
                     return -1.0
         return -1.0
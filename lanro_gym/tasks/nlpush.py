@@ -3,7 +3,6 @@ from lanro_gym.robots import PyBulletRobot
 from lanro_gym.simulation import PyBulletSimulation
 from lanro_gym.tasks.core import LanguageTask
 from lanro_gym.utils import goal_distance
-from lanro_gym.language_utils import create_commands
 
 
 class NLPush(LanguageTask):
@@ -18,9 +17,10 @@ class NLPush(LanguageTask):
                  delay_action_repair: bool = False,
                  use_negations_action_repair: bool = False,
                  use_synonyms: bool = False,
+                 use_object_pool: bool = False,
                  mode: str = 'Color'):
         super().__init__(sim, robot, mode, use_hindsight_instructions, use_action_repair, delay_action_repair,
-                         use_negations_action_repair, num_obj, use_synonyms)
+                         use_negations_action_repair, num_obj, use_synonyms, use_object_pool)
         self.min_push_distance = 0.025
         self.max_push_distance = 0.075
         self.max_height_change = self.object_size
@@ -101,14 +101,12 @@ class NLPush(LanguageTask):
                 if self.use_negations_action_repair and self.np_random.random() < 0.5:
                     # action correction with negation
                     # "push the red object" -> pushes green object -> correction "no not the green object"
-                    target_property_tuple = self.task_object_list.objects[other_object_idx].get_properties()
-                    repair_commands = create_commands("negation", target_property_tuple, use_synonyms=self.use_synonyms)
+                    repair_command_type, repair_obj_idx = "negation", other_object_idx
                 else:
                     # additional feedback for the goal object, pushing a wrong object
                     # "push the red block" -> *pushes green block* -> "the red block!"
-                    target_property_tuple = self.task_object_list.objects[self.goal_obj_idx].get_properties()
-                    repair_commands = create_commands("repair", target_property_tuple, use_synonyms=self.use_synonyms)
+                    repair_command_type, repair_obj_idx = "repair", self.goal_obj_idx
                 self.show_goal_boundary()
-                self.merge_instruction_action_repair(repair_commands)
+                self.merge_instruction_action_repair(repair_command_type, repair_obj_idx)
                 return -1.0
         return -1.0
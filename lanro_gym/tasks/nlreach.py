@@ -3,7 +3,6 @@ import numpy as np
 from lanro_gym.tasks.core import LanguageTask
 from lanro_gym.simulation import PyBulletSimulation
 from lanro_gym.utils import goal_distance
-from lanro_gym.language_utils import create_commands
 
 
 class NLReach(LanguageTask):
@@ -18,9 +17,10 @@ class NLReach(LanguageTask):
                  delay_action_repair: bool = False,
                  use_negations_action_repair: bool = False,
                  use_synonyms: bool = False,
+                 use_object_pool: bool = False,
                  mode: str = 'Color'):
         super().__init__(sim, robot, mode, use_hindsight_instructions, use_action_repair, delay_action_repair,
-                         use_negations_action_repair, num_obj, use_synonyms)
+                         use_negations_action_repair, num_obj, use_synonyms, use_object_pool)
         self.obj_range_low = np.array([-obj_xy_range / 2, -obj_xy_range / 2, 0])
         self.obj_range_high = np.array([obj_xy_range / 2, obj_xy_range / 2, 0])
         self.action_verbs = ["touch", "reach", "contact"]
@@ -62,17 +62,11 @@ class NLReach(LanguageTask):
                     if self.use_negations_action_repair and self.np_random.random() < 0.5:
                         # action correction with negation
                         # "reach the red object" -> reaches green object -> correction "no not the green object"
-                        target_property_tuple = self.task_object_list.objects[other_object_idx].get_properties()
-                        repair_commands = create_commands("negation",
-                                                          target_property_tuple,
-                                                          use_synonyms=self.use_synonyms)
+                        repair_command_type, repair_obj_idx = "negation", other_object_idx
                     else:
                         # additional feedback for the goal object, touching a wrong object
                         # "touch the red block" -> *touches green block* -> "the red block!"
-                        target_property_tuple = self.task_object_list.objects[self.goal_obj_idx].get_properties()
-                        repair_commands = create_commands("repair",
-                                                          target_property_tuple,
-                                                          use_synonyms=self.use_synonyms)
-                    self.merge_instruction_action_repair(repair_commands)
+                        repair_command_type, repair_obj_idx = "repair", self.goal_obj_idx
+                    self.merge_instruction_action_repair(repair_command_type, repair_obj_idx)
                     return -1.0
         return -1.0
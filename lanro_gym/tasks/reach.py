@@ -1,5 +1,5 @@
 import numpy as np
-from typing import Callable
+from typing import Callable, Optional
 from lanro_gym.tasks.core import Task
 from lanro_gym.simulation import PyBulletSimulation
 from lanro_gym.tasks.scene import basic_scene
@@ -35,8 +35,8 @@ class Reach(Task):
             rgba_color=RGBCOLORS.RED.value[0] + [0.3],
         )
 
-    def get_obs(self) -> np.ndarray:
-        return np.array([])
+    def get_obs(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        return np.array([]) if out is None else out
 
     def get_achieved_goal(self) -> np.ndarray:
         return self.get_ee_position()
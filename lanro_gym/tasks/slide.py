@@ -1,6 +1,7 @@
+from typing import Optional
 import numpy as np
 from lanro_gym.tasks.core import Task
-from lanro_gym.simulation import PyBulletSimulation
+from lanro_gym.simulation import PyBulletSimulation, BODY_OBS_STATE
 from lanro_gym.tasks.scene import basic_scene
 from lanro_gym.env_utils import RGBCOLORS
 
@@ -52,20 +53,13 @@ class Slide(Task):
             rgba_color=RGBCOLORS.RED.value[0] + [0.3],
         )
 
-    def get_obs(self) -> np.ndarray:
-        obj_key = "object"
-        # position, rotation of the object
-        object_position = np.array(self.sim.get_base_position(obj_key))
-        object_rotation = np.array(self.sim.get_base_rotation(obj_key))
-        object_velocity = np.array(self.sim.get_base_velocity(obj_key))
-        object_angular_velocity = np.array(self.sim.get_base_angular_velocity(obj_key))
-        observation = np.concatenate([
-            object_position,
-            object_rotation,
-            object_velocity,
-            object_angular_velocity,
-        ])
-        return observation
+    def get_obs(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        # position, rotation, velocity and angular velocity of the object
+        object_state = self.sim.get_bodies_state(["object"])[0, BODY_OBS_STATE]
+        if out is None:
+            return object_state.copy()
+        out[:] = object_state
+        return out
 
     def get_achieved_goal(self) -> np.ndarray:
         object_position = np.array(self.sim.get_base_position("object"))
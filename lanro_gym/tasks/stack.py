@@ -1,7 +1,7 @@
 import numpy as np
-from typing import Tuple
+from typing import Optional, Tuple
 from lanro_gym.tasks.core import Task
-from lanro_gym.simulation import PyBulletSimulation
+from lanro_gym.simulation import PyBulletSimulation, BODY_OBS_STATE, BODY_POSITION
 from lanro_gym.tasks.scene import basic_scene
 from lanro_gym.env_utils import RGBCOLORS
 
@@ -30,6 +30,7 @@ class Stack(Task):
         self.obj_colors = [RGBCOLORS.RED, RGBCOLORS.GREEN, RGBCOLORS.BLUE, RGBCOLORS.YELLOW][:num_obj]
         self.num_obj = num_obj
         self.goal_offsets = [1, 3, 5, 7]
+        self._obs_body_keys = [f"object{idx}" for idx in range(num_obj)]
         with self.sim.no_rendering():
             self._create_scene()
             self.sim.place_visualizer()
@@ -58,21 +59,17 @@ class Stack(Task):
                 rgba_color=obj_color.value[0] + [0.3],
             )
 
-    def get_obs(self) -> np.ndarray:
-        observation = []
-        for idx in range(self.num_obj):
-            obj_key = f"object{idx}"
-            # position, rotation of the object
-            object_position = np.array(self.sim.get_base_position(obj_key))
-            object_rotation = np.array(self.sim.get_base_rotation(obj_key))
-            object_velocity = np.array(self.sim.get_base_velocity(obj_key))
-            object_angular_velocity = np.array(self.sim.get_base_angular_velocity(obj_key))
-            observation.extend([object_position, object_rotation, object_velocity, object_angular_velocity])
-        return np.concatenate(observation)
+    def get_obs(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        # position, rotation, velocity and angular velocity of each object
+        bodies_state = self.sim.get_bodies_state(self._obs_body_keys)
+        if out is None:
+            return bodies_state[:, BODY_OBS_STATE].flatten()
+        out.reshape(self.num_obj, -1)[:] = bodies_state[:, BODY_OBS_STATE]
+        return out
 
     def get_achieved_goal(self) -> np.ndarray:
-        achieved_goals = [self.sim.get_base_position(f"object{idx}") for idx in range(self.num_obj)]
-        return np.concatenate(achieved_goals).copy()
+        bodies_state = self.sim.get_bodies_state([f"object{idx}" for idx in range(self.num_obj)])
+        return bodies_state[:, BODY_POSITION].flatten()
 
     def _sample_objects(self) -> Tuple:
         obj_positions = [[0.0, 0.0, self.object_size / 2] +
@@ -50,6 +50,108 @@ def goal_distance(vec1: np.ndarray, vec2: np.ndarray) -> float:
     return np.linalg.norm(vec1 - vec2, axis=-1)
 
 
+def sample_separated_positions(np_random: np.random.Generator,
+                               low: np.ndarray,
+                               high: np.ndarray,
+                               num_positions: int,
+                               min_distance: float,
+                               batch_size: int = 32,
+                               max_batches: int = 8) -> np.ndarray:
+    """Sample `num_positions` positions within `low` and `high` with a pairwise
+    distance greater than `min_distance`. Candidate layouts are drawn in batches
+    and checked at once. Dense layouts, for which rejection sampling rarely
+    succeeds, fall back to Poisson-disk dart throwing and finally to a jittered
+    grid, so sampling always terminates.
+
+    Args:
+        np_random: random number generator
+        low: lower bound of the positions
+        high: upper bound of the positions
+        num_positions: amount of positions to sample
+        min_distance: exclusive lower bound of the pairwise distances
+        batch_size: amount of candidate layouts sampled at once
+        max_batches: amount of batches before falling back to dart throwing
+    Returns:
+        array of shape (num_positions, len(low))
+    Raises:
+        ValueError: if the positions do not fit into the bounds
+    """
+    low, high = np.asarray(low, dtype=float), np.asarray(high, dtype=float)
+    if num_positions < 2:
+        return np_random.uniform(low, high, size=(num_positions, len(low)))
+    diagonal = np.arange(num_positions)
+    for _ in range(max_batches):
+        layouts = np_random.uniform(low, high, size=(batch_size, num_positions, len(low)))
+        distances = np.linalg.norm(layouts[:, :, None] - layouts[:, None], axis=-1)
+        distances[:, diagonal, diagonal] = np.inf
+        valid_layouts = np.flatnonzero(distances.min(axis=(1, 2)) > min_distance)
+        if len(valid_layouts):
+            return layouts[valid_layouts[0]]
+
+    # Poisson-disk dart throwing: greedily accept candidates far enough from all accepted ones
+    positions = np.empty((num_positions, len(low)))
+    num_accepted = 0
+    for candidate in np_random.uniform(low, high, size=(batch_size * num_positions, len(low))):
+        if np.all(np.linalg.norm(positions[:num_accepted] - candidate, axis=-1) > min_distance):
+            positions[num_accepted] = candidate
+            num_accepted += 1
+            if num_accepted == num_positions:
+                return positions
+
+    # jittered grid: cells are wider than `min_distance` along every axis, so that
+    # positions of different cells are always sufficiently separated
+    extent = high - low
+    cells_per_axis = np.maximum(np.ceil(extent / min_distance).astype(int), 1)
+    jitter = (extent - (cells_per_axis - 1) * min_distance) / cells_per_axis
+    cell_size = min_distance + jitter
+    if np.prod(cells_per_axis) < num_positions:
+        raise ValueError(f"Cannot place {num_positions} positions with a distance "
+                         f"greater than {min_distance} between {low} and {high}")
+    cells = np_random.choice(np.prod(cells_per_axis), size=num_positions, replace=False)
+    cell_indices = np.stack(np.unravel_index(cells, cells_per_axis), axis=-1)
+    return low + cell_indices * cell_size + np_random.uniform(0, 1, size=cell_indices.shape) * jitter
+
+
+def quaternion_multiply(quat1, quat2) -> np.ndarray:
+    """Hamilton product of quaternions in (x, y, z, w) format, (4, ) or (..., 4)"""
+    x1, y1, z1, w1 = np.moveaxis(np.asarray(quat1), -1, 0)
+    x2, y2, z2, w2 = np.moveaxis(np.asarray(quat2), -1, 0)
+    return np.stack([
+        w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+        w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+        w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+        w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+    ], -1)
+
+
+def quaternion_conjugate(quat) -> np.ndarray:
+    """Conjugate of a quaternion in (x, y, z, w) format, the inverse of unit quaternions"""
+    return np.array([-quat[0], -quat[1], -quat[2], quat[3]])
+
+
+def quaternion_to_rotation_vector(quat) -> np.ndarray:
+    """Convert a unit quaternion in (x, y, z, w) format to a rotation vector (axis * angle)
+    with an angle in [0, pi]"""
+    quat = np.asarray(quat)
+    if quat[3] < 0:
+        quat = -quat
+    sin_half_angle = np.linalg.norm(quat[:3])
+    if sin_half_angle < 1e-12:
+        return 2 * quat[:3]
+    return 2 * np.arctan2(sin_half_angle, quat[3]) * quat[:3] / sin_half_angle
+
+
+def quaternion_to_rotation_matrix(quat) -> np.ndarray:
+    """Convert quaternions in (x, y, z, w) format, (..., 4), to rotation matrices (..., 3, 3)"""
+    quat = np.asarray(quat, dtype=float)
+    x, y, z, w = np.moveaxis(quat / np.linalg.norm(quat, axis=-1, keepdims=True), -1, 0)
+    return np.stack([
+        np.stack([1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)], -1),
+        np.stack([2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)], -1),
+        np.stack([2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)], -1),
+    ], -2)
+
+
 def post_process_camera_pixel(px, _height: int, _width: int) -> np.ndarray:
     rgb_array = np.array(px, dtype=np.uint8).reshape(_height, _width, 4)
     return rgb_array[:, :, :3]
@@ -0,0 +1,456 @@
+"""Vectorized lanro-gym environments: a vectorized environment whose worker processes write the observations,
+rewards and info fields straight into preallocated shared memory, and a vectorized environment whose
+environments are the workcells of a single tiled simulation"""
+import functools
+import gc
+import multiprocessing as mp
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import gymnasium as gym
+from gymnasium import spaces
+import numpy as np
+
+from lanro_gym.env import BaseEnv, LanguageEnv
+from lanro_gym.simulation import SimulationCell, TiledSimulation
+
+# shape and dtype of the info fields written into shared memory
+InfoFields = Dict[str, Tuple[Tuple[int, ...], np.dtype]]
+
+
+class SharedArrays:
+    """Named numpy arrays backed by shared memory, which are created in the main process and
+    passed to the workers on start"""
+
+    def __init__(self, ctx, specs: Dict[str, Tuple[Tuple[int, ...], Any]]):
+        self.specs = {name: (tuple(shape), np.dtype(dtype)) for name, (shape, dtype) in specs.items()}
+        self.raw_arrays = {
+            name: ctx.RawArray('b', max(int(np.prod(shape)) * dtype.itemsize, 1))
+            for name, (shape, dtype) in self.specs.items()
+        }
+        self.arrays: Dict[str, np.ndarray] = {}
+        self._create_views()
+
+    def _create_views(self) -> None:
+        self.arrays = {
+            name: np.frombuffer(self.raw_arrays[name], dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+            for name, (shape, dtype) in self.specs.items()
+        }
+
+    def __getstate__(self):
+        return {"specs": self.specs, "raw_arrays": self.raw_arrays}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._create_views()
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+
+def get_info_fields(env: gym.Env, reset_info: Dict[str, Any]) -> InfoFields:
+    """Info fields of a fixed shape, i.e., the success flag, the hindsight instruction of language-conditioned
+    environments and the observation components requested with `info_obs`"""
+    info_fields: InfoFields = {"is_success": ((), np.dtype(bool))}
+    unwrapped = env.unwrapped
+    if isinstance(unwrapped, LanguageEnv):
+        info_fields["hindsight_instruction"] = ((unwrapped.max_instruction_len, ), np.dtype(np.uint16))
+        for component in unwrapped.info_obs:
+            info_fields[component] = (reset_info[component].shape, reset_info[component].dtype)
+    return info_fields
+
+
+def _write_info(info: Dict[str, Any],
+                info_fields: InfoFields,
+                buffers: SharedArrays,
+                index: int,
+                prefix: str = "info") -> Optional[Dict[str, Any]]:
+    """Writes the info fields into shared memory and returns the remaining entries, or None if there are none"""
+    for name in info_fields:
+        present = name in info
+        buffers[f"_{prefix}_{name}"][index] = present
+        if present:
+            buffers[f"{prefix}_{name}"][index] = info.pop(name)
+    return info or None
+
+
+def _worker(index: int, env_fn: Callable[[], gym.Env], pipe, parent_pipe, buffers: SharedArrays,
+            info_fields: InfoFields) -> None:
+    parent_pipe.close()
+    env = env_fn()
+    obs_keys = list(env.observation_space.spaces)
+    try:
+        while True:
+            command, data = pipe.recv()
+            if command == "reset":
+                obs, info = env.reset(**data)
+                for key in obs_keys:
+                    buffers[f"obs_{key}"][index] = obs[key]
+                pipe.send((True, _write_info(info, info_fields, buffers, index)))
+            elif command == "step":
+                obs, reward, terminated, truncated, info = env.step(buffers["actions"][index])
+                buffers["rewards"][index] = reward
+                buffers["terminations"][index] = terminated
+                buffers["truncations"][index] = truncated
+                buffers["_final_observation"][index] = terminated or truncated
+                final_info = None
+                if terminated or truncated:
+                    # auto-reset, the info of the last step of the finished episode becomes the final info
+                    for key in obs_keys:
+                        buffers[f"final_observation_{key}"][index] = obs[key]
+                    final_info = _write_info(info, info_fields, buffers, index, prefix="final_info")
+                    obs, info = env.reset()
+                for key in obs_keys:
+                    buffers[f"obs_{key}"][index] = obs[key]
+                pipe.send((True, (_write_info(info, info_fields, buffers, index), final_info)))
+            elif command == "call":
+                name, args, kwargs = data
+                attr = getattr(env, name)
+                pipe.send((True, attr(*args, **kwargs) if callable(attr) else attr))
+            elif command == "close":
+                pipe.send((True, None))
+                break
+            else:
+                raise RuntimeError(f"Unknown command {command}")
+    except (KeyboardInterrupt, Exception):
+        pipe.send((False, traceback.format_exc()))
+    finally:
+        env.close()
+
+
+class SharedMemoryVectorEnv(gym.vector.VectorEnv):
+    """Steps environments with dict observations in worker processes, which read their actions from
+    and write observations, rewards, termination flags and info fields to shared memory. Only the remaining
+    info entries, e.g., the language of a hindsight instruction, are pickled and sent through the pipes.
+
+    Episodes are reset in the workers. The observation and info of the reset are returned, whereas the last
+    observation and info of the finished episode are in `infos["final_observation"]` and `infos["final_info"]`.
+
+    Info fields are batched like the infos of gymnasium vector environments, i.e., `infos[name]` holds the
+    values and `infos["_" + name]` masks the environments that reported the field. The final info is batched
+    the same way instead of being an array of dicts.
+
+    A worker stops after an error, which is raised as `RuntimeError`, and every later call raises
+    `ClosedEnvironmentError`.
+    """
+
+    def __init__(self, env_fns: Sequence[Callable[[], gym.Env]], copy: bool = True, context: Optional[str] = None):
+        """
+        :param env_fns: Functions creating the environments
+        :param copy: Return copies of the observations instead of the shared memory, which is overwritten by
+            the next step
+        :param context: Start method of the worker processes, e.g., `fork`, `forkserver` or `spawn`. Forked
+            workers reuse the object catalog tables built by the first environment in the main process
+        """
+        ctx = mp.get_context(context)
+        dummy_env = env_fns[0]()
+        _, reset_info = dummy_env.reset(seed=0)
+        self.info_fields = get_info_fields(dummy_env, reset_info)
+        observation_space, action_space = dummy_env.observation_space, dummy_env.action_space
+        dummy_env.close()
+        if not isinstance(observation_space, spaces.Dict):
+            raise ValueError("SharedMemoryVectorEnv requires dict observations")
+        super().__init__(len(env_fns), observation_space, action_space)
+        self.copy = copy
+
+        num_envs = self.num_envs
+        specs: Dict[str, Tuple[Tuple[int, ...], Any]] = {
+            "actions": ((num_envs, ) + action_space.shape, action_space.dtype),
+            "rewards": ((num_envs, ), np.float64),
+            "terminations": ((num_envs, ), bool),
+            "truncations": ((num_envs, ), bool),
+            "_final_observation": ((num_envs, ), bool),
+        }
+        for key, space in observation_space.spaces.items():
+            specs[f"obs_{key}"] = ((num_envs, ) + space.shape, space.dtype)
+            specs[f"final_observation_{key}"] = ((num_envs, ) + space.shape, space.dtype)
+        for name, (shape, dtype) in self.info_fields.items():
+            for prefix in ["info", "final_info"]:
+                specs[f"{prefix}_{name}"] = ((num_envs, ) + shape, dtype)
+                specs[f"_{prefix}_{name}"] = ((num_envs, ), bool)
+        self.buffers = SharedArrays(ctx, specs)
+
+        self.parent_pipes, self.processes = [], []
+        # forked workers share the memory of the main process until they write to it, e.g., the tables of the
+        # object catalog built by the first environment. Frozen objects are skipped by the garbage collector,
+        # which would otherwise touch and thereby copy their memory pages in every worker.
+        gc.freeze()
+        for index, env_fn in enumerate(env_fns):
+            parent_pipe, child_pipe = ctx.Pipe()
+            process = ctx.Process(target=_worker,
+                                  name=f"SharedMemoryVectorEnvWorker-{index}",
+                                  args=(index, env_fn, child_pipe, parent_pipe, self.buffers, self.info_fields),
+                                  daemon=True)
+            self.parent_pipes.append(parent_pipe)
+            self.processes.append(process)
+            process.start()
+            child_pipe.close()
+        gc.unfreeze()
+        self._pending_command: Optional[str] = None
+        # workers stop after an error and do not answer any further command
+        self._failed_workers: Set[int] = set()
+
+    def _send(self, command: str, data: Union[Any, List[Any]] = None, per_env: bool = False) -> None:
+        if self.closed:
+            raise gym.error.ClosedEnvironmentError("Trying to operate on a closed SharedMemoryVectorEnv")
+        if self._failed_workers:
+            raise gym.error.ClosedEnvironmentError(
+                f"Trying to operate on a SharedMemoryVectorEnv with failed workers {sorted(self._failed_workers)}")
+        if self._pending_command is not None:
+            raise gym.error.AlreadyPendingCallError(f"Waiting for a pending call to `{self._pending_command}`",
+                                                    self._pending_command)
+        for index, pipe in enumerate(self.parent_pipes):
+            pipe.send((command, data[index] if per_env else data))
+        self._pending_command = command
+
+    def _receive(self, command: str) -> List[Any]:
+        if self._pending_command != command:
+            raise gym.error.NoAsyncCallError(f"Calling `{command}_wait` without a prior call to `{command}_async`",
+                                             command)
+        self._pending_command = None
+        results = [pipe.recv() for pipe in self.parent_pipes]
+        failed_workers = [index for index, (success, _) in enumerate(results) if not success]
+        if failed_workers:
+            self._failed_workers.update(failed_workers)
+            raise RuntimeError(f"Worker {failed_workers[0]} failed:\n{results[failed_workers[0]][1]}")
+        return [result for _, result in results]
+
+    def _get_observations(self) -> Dict[str, np.ndarray]:
+        obs = {key: self.buffers[f"obs_{key}"] for key in self.single_observation_space.spaces}
+        return {key: value.copy() for key, value in obs.items()} if self.copy else obs
+
+    def _get_infos(self,
+                   extra_infos: List[Optional[Dict[str, Any]]],
+                   prefix: str = "info",
+                   env_mask: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """Batches the info fields in shared memory of the environments in `env_mask` and the remaining entries"""
+        infos: Dict[str, Any] = {}
+        for name in self.info_fields:
+            mask = self.buffers[f"_{prefix}_{name}"]
+            if env_mask is not None:
+                mask = mask & env_mask
+            if mask.any():
+                infos[name] = self.buffers[f"{prefix}_{name}"].copy()
+                infos[f"_{name}"] = mask.copy()
+        for index, extra_info in enumerate(extra_infos):
+            if extra_info is not None:
+                infos = self._add_info(infos, extra_info, index)
+        return infos
+
+    def reset_async(self, seed: Optional[Union[int, List[int]]] = None, options: Optional[dict] = None) -> None:
+        if seed is None:
+            seed = [None] * self.num_envs
+        elif isinstance(seed, int):
+            seed = [seed + index for index in range(self.num_envs)]
+        assert len(seed) == self.num_envs
+        self._send("reset", [{"seed": env_seed, "options": options} for env_seed in seed], per_env=True)
+
+    def reset_wait(self, **kwargs) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        extra_infos = self._receive("reset")
+        return self._get_observations(), self._get_infos(extra_infos)
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self.buffers["actions"][:] = actions
+        self._send("step")
+
+    def step_wait(self, **kwargs) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        results = self._receive("step")
+        infos = self._get_infos([extra_info for extra_info, _ in results])
+        finished = self.buffers["_final_observation"].copy()
+        if finished.any():
+            infos["final_observation"] = {
+                key: self.buffers[f"final_observation_{key}"].copy()
+                for key in self.single_observation_space.spaces
+            }
+            infos["final_info"] = self._get_infos([final_info for _, final_info in results],
+                                                  prefix="final_info",
+                                                  env_mask=finished)
+            infos["_final_observation"] = infos["_final_info"] = finished
+        return (
+            self._get_observations(),
+            self.buffers["rewards"].copy(),
+            self.buffers["terminations"].copy(),
+            self.buffers["truncations"].copy(),
+            infos,
+        )
+
+    def call_async(self, name: str, *args, **kwargs) -> None:
+        self._send("call", (name, args, kwargs))
+
+    def call_wait(self, **kwargs) -> List[Any]:
+        return self._receive("call")
+
+    def close_extras(self, terminate: bool = False, **kwargs) -> None:
+        if self._pending_command is not None and not terminate:
+            self._receive(self._pending_command)
+        running = [(pipe, process) for index, (pipe, process) in enumerate(zip(self.parent_pipes, self.processes))
+                   if index not in self._failed_workers and process.is_alive()]
+        if terminate:
+            for _, process in running:
+                process.terminate()
+        else:
+            for pipe, _ in running:
+                pipe.send(("close", None))
+            for pipe, _ in running:
+                pipe.recv()
+        for pipe in self.parent_pipes:
+            pipe.close()
+        for process in self.processes:
+            process.join()
+
+
+def make(env_id: str,
+         num_envs: int = 1,
+         copy: bool = True,
+         context: Optional[str] = None,
+         **kwargs) -> SharedMemoryVectorEnv:
+    """Creates a `SharedMemoryVectorEnv` of `num_envs` environments made with `gym.make(env_id, **kwargs)`"""
+    env_fn = functools.partial(gym.make, env_id, **kwargs)
+    return SharedMemoryVectorEnv([env_fn] * num_envs, copy=copy, context=context)
+
+
+class TiledVectorEnv(gym.vector.VectorEnv):
+    """Steps environments whose simulations are the cells of one `TiledSimulation` in a single process. The
+    actions of all environments are applied, then all cells are stepped with a single loop of substeps and the
+    environments evaluate their step one after another.
+
+    Observations, auto-resets and infos are batched like in `SharedMemoryVectorEnv`. Episodes are truncated at
+    the `max_episode_steps` of the environment spec, as the unwrapped environments are stepped. Snapshot resets
+    and pixel observations are not supported, since states are saved and images are rendered for all cells.
+    """
+
+    def __init__(self,
+                 env_fns: Sequence[Callable[[SimulationCell], gym.Env]],
+                 copy: bool = True,
+                 cell_spacing: float = 3.0,
+                 render: bool = False):
+        """
+        :param env_fns: Functions creating the environments, given their cell as keyword argument `sim`
+        :param copy: Return copies of the observations instead of the buffers, which are overwritten by the next
+            step
+        :param cell_spacing: Distance between the origins of neighboring cells in meters
+        :param render: Show all cells in the pybullet GUI
+        """
+        self.world = TiledSimulation(len(env_fns), cell_spacing=cell_spacing, render=render)
+        self.envs: List[BaseEnv] = []
+        self._max_episode_steps: List[Optional[int]] = []
+        for env_fn, cell in zip(env_fns, self.world.cells):
+            env = env_fn(sim=cell)
+            unwrapped = env.unwrapped
+            self.envs.append(unwrapped)
+            # the time limit of `gym.make` is the one of the wrapper spec
+            self._max_episode_steps.append(
+                env.spec.max_episode_steps if env.spec is not None else unwrapped._get_max_episode_steps())
+            if unwrapped.snapshot_reset:
+                self.world.close()
+                raise ValueError("TiledVectorEnv does not support snapshot resets")
+            if "pixel" in (unwrapped.obs_type, *getattr(unwrapped, "info_obs", ())):
+                self.world.close()
+                raise ValueError("TiledVectorEnv does not support pixel observations")
+        observation_space, action_space = self.envs[0].observation_space, self.envs[0].action_space
+        if not isinstance(observation_space, spaces.Dict):
+            self.world.close()
+            raise ValueError("TiledVectorEnv requires dict observations")
+        super().__init__(len(env_fns), observation_space, action_space)
+        self.copy = copy
+
+        self.observations = {
+            key: np.zeros((self.num_envs, ) + space.shape, dtype=space.dtype)
+            for key, space in observation_space.spaces.items()
+        }
+        self.final_observations = {key: np.zeros_like(value) for key, value in self.observations.items()}
+        self.rewards = np.zeros(self.num_envs)
+        self.terminations = np.zeros(self.num_envs, dtype=bool)
+        self.truncations = np.zeros(self.num_envs, dtype=bool)
+        self._actions: Optional[np.ndarray] = None
+        self._seeds: List[Optional[int]] = [None] * self.num_envs
+        self._options: Optional[dict] = None
+        self._call: Optional[Tuple[str, Tuple, Dict[str, Any]]] = None
+
+    def _write_obs(self, buffers: Dict[str, np.ndarray], index: int, obs: Dict[str, np.ndarray]) -> None:
+        for key, value in obs.items():
+            buffers[key][index] = value
+
+    def _get_observations(self) -> Dict[str, np.ndarray]:
+        return {key: value.copy() for key, value in self.observations.items()} if self.copy else self.observations
+
+    def reset_async(self, seed: Optional[Union[int, List[int]]] = None, options: Optional[dict] = None) -> None:
+        if seed is None:
+            seed = [None] * self.num_envs
+        elif isinstance(seed, int):
+            seed = [seed + index for index in range(self.num_envs)]
+        assert len(seed) == self.num_envs
+        self._seeds, self._options = seed, options
+
+    def reset_wait(self, **kwargs) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        infos: Dict[str, Any] = {}
+        for index, (env, env_seed) in enumerate(zip(self.envs, self._seeds)):
+            obs, info = env.reset(seed=env_seed, options=self._options)
+            self._write_obs(self.observations, index, obs)
+            infos = self._add_info(infos, info, index)
+        return self._get_observations(), infos
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = np.clip(actions, self.single_action_space.low, self.single_action_space.high)
+
+    def step_wait(self, **kwargs) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        if self._actions is None:
+            raise gym.error.NoAsyncCallError("Calling `step_wait` without a prior call to `step_async`", "step")
+        for env, action in zip(self.envs, self._actions):
+            env.robot.set_action(action)
+        self._actions = None
+        self.world.step()
+        infos: Dict[str, Any] = {}
+        final_infos: Dict[str, Any] = {}
+        for index, env in enumerate(self.envs):
+            obs, reward, terminated, truncated, info = env._finish_step()
+            max_episode_steps = self._max_episode_steps[index]
+            if max_episode_steps is not None and env._elapsed_steps >= max_episode_steps:
+                truncated = True
+            self.rewards[index] = reward
+            self.terminations[index] = terminated
+            self.truncations[index] = truncated
+            if terminated or truncated:
+                # auto-reset, the info of the last step of the finished episode becomes the final info
+                self._write_obs(self.final_observations, index, obs)
+                final_infos = self._add_info(final_infos, info, index)
+                obs, info = env.reset()
+            self._write_obs(self.observations, index, obs)
+            infos = self._add_info(infos, info, index)
+        finished = self.terminations | self.truncations
+        if finished.any():
+            infos["final_observation"] = {key: value.copy() for key, value in self.final_observations.items()}
+            infos["final_info"] = final_infos
+            infos["_final_observation"] = infos["_final_info"] = finished
+        return self._get_observations(), self.rewards.copy(), self.terminations.copy(), self.truncations.copy(), infos
+
+    def call_async(self, name: str, *args, **kwargs) -> None:
+        self._call = (name, args, kwargs)
+
+    def call_wait(self, **kwargs) -> List[Any]:
+        if self._call is None:
+            raise gym.error.NoAsyncCallError("Calling `call_wait` without a prior call to `call_async`", "call")
+        name, args, call_kwargs = self._call
+        self._call = None
+        results = []
+        for env in self.envs:
+            attr = getattr(env, name)
+            results.append(attr(*args, **call_kwargs) if callable(attr) else attr)
+        return results
+
+    def close_extras(self, **kwargs) -> None:
+        self.world.close()
+
+
+def make_tiled(env_id: str,
+               num_envs: int = 1,
+               copy: bool = True,
+               cell_spacing: float = 3.0,
+               render: bool = False,
+               **kwargs) -> TiledVectorEnv:
+    """Creates a `TiledVectorEnv` of `num_envs` environments made with `gym.make(env_id, sim=cell, **kwargs)`"""
+    if kwargs.get("snapshot_reset"):
+        # goal-conditioned environments already reset while they are created
+        raise ValueError("TiledVectorEnv does not support snapshot resets")
+    env_fn = functools.partial(gym.make, env_id, disable_env_checker=True, **kwargs)
+    return TiledVectorEnv([env_fn] * num_envs, copy=copy, cell_spacing=cell_spacing, render=render)
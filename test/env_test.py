@@ -1,5 +1,6 @@
 import gymnasium as gym
 import numpy as np
+import pytest
 import lanro_gym
 
 
@@ -65,3 +66,145 @@ def test_language_conditioned_envs():
                                 for _action_repair in ["", "AR", "ARN", "ARD", "ARND"]:
                                     id = f'{robot}{lang_task}{obj_count}{_mode}{_obstype}{_use_syn}{_hindsight_instr}{_action_repair}-v0'
                                     run_random_policy(gym.make(id, render=render_mode, action_type=a_type))
+
+
+def test_snapshot_reset():
+    for env_id in ['PandaPush-v0', 'PandaStack2-v0', 'PandaNLPush2ColorShape-v0', 'PandaNLLift2HIAR-v0']:
+        env = gym.make(env_id, snapshot_reset=True)
+        neutral_joints = env.unwrapped.robot.get_current_pos()
+        for _ in range(3):
+            env.reset()
+            assert np.allclose(env.unwrapped.robot.get_current_pos(), neutral_joints)
+            for _ in range(10):
+                env.step(env.action_space.sample())
+        env.close()
+
+
+def test_joint_reset_noise():
+    for env_id in ['PandaReach-v0', 'PandaNLPush2-v0']:
+        env = gym.make(env_id, joint_reset_noise=0.05)
+        robot = env.unwrapped.robot
+        env.reset(seed=1)
+        noisy_joints = robot.get_current_pos()
+        assert not np.allclose(noisy_joints, robot.NEUTRAL_JOINT_VALUES)
+        env.reset(seed=1)
+        assert np.allclose(robot.get_current_pos(), noisy_joints)
+        env.close()
+
+
+def test_visual_shapes():
+    env = gym.make('PandaPush-v0')
+    collision_env = gym.make('PandaPush-v0', visual_shapes=False)
+    robot = collision_env.unwrapped.robot
+    # the collision meshes are used as visual shapes
+    for visual_shape in collision_env.unwrapped.sim.bclient.getVisualShapeData(robot._uid):
+        assert b"collision" in visual_shape[4]
+    env.action_space.seed(0)
+    obs, _ = env.reset(seed=0)
+    collision_obs, _ = collision_env.reset(seed=0)
+    for _ in range(5):
+        assert np.array_equal(obs["observation"], collision_obs["observation"])
+        action = env.action_space.sample()
+        obs = env.step(action)[0]
+        collision_obs = collision_env.step(action)[0]
+    env.close()
+    collision_env.close()
+    with pytest.raises(ValueError):
+        gym.make('PandaNLPush2PixelEgo-v0', visual_shapes=False)
+    with pytest.raises(ValueError):
+        gym.make('PandaNLPush2-v0', visual_shapes=False, info_obs=("pixel", ))
+
+
+def test_step_many():
+    for env_id in ["PandaReach-v0", "PandaNLPush2HIAR-v0"]:
+        env = gym.make(env_id).unwrapped
+        env.action_space.seed(0)
+        actions = np.stack([env.action_space.sample() for _ in range(10)])
+        env.reset(seed=0)
+        steps = [env.step(action) for action in actions]
+        env.reset(seed=0)
+        obs, rewards, terminations, truncations, infos = env.step_many(actions)
+        num_steps = len(rewards)
+        assert 1 <= num_steps <= len(actions)
+        for key in obs:
+            assert obs[key].shape == (num_steps, ) + env.observation_space[key].shape
+            assert np.array_equal(obs[key], np.stack([step[0][key] for step in steps[:num_steps]]))
+        assert np.array_equal(rewards, [step[1] for step in steps[:num_steps]])
+        assert np.array_equal(terminations, [step[2] for step in steps[:num_steps]])
+        assert not np.any(truncations) and len(infos) == num_steps
+        # observation views are not aliased across the steps
+        view_env = gym.make(env_id, copy_obs=False).unwrapped
+        view_env.reset(seed=0)
+        view_obs, *_ = view_env.step_many(actions)
+        for key in obs:
+            assert np.array_equal(view_obs[key], obs[key])
+        view_env.close()
+        # stops early once the episode terminates
+        assert terminations[-1] or num_steps == len(actions)
+        assert not np.any(terminations[:-1])
+        # only the last observation
+        env.reset(seed=0)
+        last_obs, last_rewards, *_ = env.step_many(actions, all_obs=False)
+        assert np.array_equal(last_rewards, rewards)
+        for key in obs:
+            assert np.array_equal(last_obs[key], obs[key][-1])
+        env.task.is_success = lambda *args: True
+        obs, rewards, terminations, *_ = env.step_many(actions)
+        assert len(rewards) == 1 and terminations[0] and obs['observation'].shape[0] == 1
+        with pytest.raises(ValueError):
+            env.step_many(actions[:0])
+        # truncated at the episode length of the spec
+        env.task.is_success = lambda *args: False
+        env.reset(seed=0)
+        env.step_many(actions[:3])
+        obs, rewards, terminations, truncations, infos = env.step_many(np.repeat(actions, 10, axis=0))
+        assert len(rewards) == gym.spec(env_id).max_episode_steps - 3
+        assert truncations[-1] and not np.any(truncations[:-1]) and not np.any(terminations)
+        env.close()
+
+
+def test_observation_buffers():
+    for env_id in ["PandaReach-v0", "PandaPush-v0", "PandaSlide-v0", "PandaStack2-v0", "PandaNLPush2HIAR-v0"]:
+        env = gym.make(env_id).unwrapped
+        view_env = gym.make(env_id, copy_obs=False).unwrapped
+        for seed in range(2):
+            obs, _ = env.reset(seed=seed)
+            view_obs, _ = view_env.reset(seed=seed)
+            robot_obs = env.robot.get_obs()
+            task_obs = env.task.get_obs()
+            assert obs['observation'].dtype == np.float32
+            assert np.array_equal(obs['observation'], np.concatenate([robot_obs, task_obs]).astype(np.float32))
+            for key in obs:
+                assert np.array_equal(obs[key], view_obs[key])
+                assert obs[key].flags.writeable and not view_obs[key].flags.writeable
+            # copies are not overwritten by the next step, views are
+            action = np.ones(env.action_space.shape)
+            next_obs, *_ = env.step(action)
+            view_env.step(action)
+            assert not np.array_equal(obs['observation'], next_obs['observation'])
+            assert np.array_equal(view_obs['observation'], next_obs['observation'])
+        env.close()
+        view_env.close()
+
+
+def test_lazy_obs_components():
+    state_env = gym.make("PandaNLPush2-v0", info_obs=("pixel", )).unwrapped
+    pixel_env = gym.make("PandaNLPush2PixelEgo-v0").unwrapped
+    obs, info = state_env.reset(seed=0)
+    pixel_obs, pixel_info = pixel_env.reset(seed=0)
+    assert np.array_equal(info["pixel"], pixel_obs["observation"])
+    assert "state" not in pixel_info
+    # the state observation is not computed for pixel observations
+    pixel_env.robot.get_obs = pixel_env.task.get_obs = None
+    action = np.ones(pixel_env.action_space.shape)
+    pixel_obs, *_, pixel_info = pixel_env.step(action)
+    pixel_env.close()
+    obs, *_, info = state_env.step(action)
+    assert np.array_equal(info["pixel"], pixel_obs["observation"])
+    state_env.close()
+    pixel_env = gym.make("PandaNLPush2PixelEgo-v0", info_obs=("state", "pixel")).unwrapped
+    pixel_obs, pixel_info = pixel_env.reset(seed=0)
+    assert pixel_info["pixel"] is pixel_obs["observation"]
+    pixel_obs, *_, pixel_info = pixel_env.step(action)
+    assert np.array_equal(pixel_info["state"], obs["observation"])
+    pixel_env.close()
@@ -98,3 +98,108 @@ def test_pixel_envs():
             assert env.observation_space['observation'].shape == (84, 84, 3)
             assert env.observation_space['observation'].dtype == np.uint8
             env.close()
+
+
+def test_object_pool():
+    for lang_task in ['NLReach', 'NLPush', 'NLGrasp', 'NLLift']:
+        env = gym.make(f"Panda{lang_task}3ColorShape-v0", use_object_pool=True)
+        task = env.unwrapped.task
+        num_bodies = len(env.unwrapped.sim._bodies_idx)
+        for _ in range(5):
+            env.reset()
+            # objects are never removed or recreated
+            assert len(env.unwrapped.sim._bodies_idx) == num_bodies
+            for obj_idx in range(len(task.task_object_list)):
+                obj_key = f"object{obj_idx}"
+                in_scene = obj_idx in task.obj_indices_selection
+                assert env.unwrapped.sim.is_parked(obj_key) != in_scene
+                assert (env.unwrapped.sim.get_base_position(obj_key)[-1] > -1) == in_scene
+            for _ in range(5):
+                env.step(env.action_space.sample())
+        env.close()
+
+
+def test_sentence_tables():
+    from lanro_gym.language_utils import create_commands
+    env = gym.make("PandaNLGrasp3ColorShapeSynonymsARN-v0")
+    task = env.unwrapped.task
+    for obj_idx, task_object in enumerate(task.task_object_list):
+        commands = task.get_commands("instruction", obj_idx)
+        assert set(commands) == set(
+            create_commands("instruction",
+                            task_object.get_properties(),
+                            action_verbs=task.action_verbs,
+                            use_synonyms=True))
+        # tables are created once and reused
+        assert task.get_commands("instruction", obj_idx) is commands
+        assert set(task.get_commands("negation", obj_idx)) == set(
+            create_commands("negation", task_object.get_properties(), use_synonyms=True))
+    for _ in range(5):
+        env.reset()
+        assert task.current_instruction[0] in task.get_commands("instruction", task.goal_obj_idx)
+    env.close()
+
+
+def test_cached_instruction_encoding():
+    env = gym.make("PandaNLReach2AR-v0")
+    obs, _ = env.reset(seed=0)
+    assert obs['instruction'].dtype == env.observation_space['instruction'].dtype
+    assert obs['instruction'] in env.observation_space['instruction']
+    obs, *_ = env.step(env.action_space.sample())
+    check_instruction(env.unwrapped, obs)
+    # action repair changes the instruction and therefore its encoding
+    env.unwrapped.task.merge_instruction_action_repair("repair", env.unwrapped.task.goal_obj_idx)
+    obs, *_ = env.step(env.action_space.sample())
+    check_instruction(env.unwrapped, obs)
+    assert set(obs['instruction']) <= env.unwrapped.discovered_word_idxs
+    env.close()
+
+
+def test_language_env_ids():
+    env_spec = gym.spec("PandaNLPush3ColorShapePixelEgoHIARD-v0")
+    assert env_spec.entry_point == "lanro_gym.environments:PandaNLPushEnv"
+    assert env_spec.max_episode_steps == 100
+    assert env_spec.kwargs == {
+        'num_obj': 3,
+        'mode': 'colorshape',
+        'obs_type': 'pixel',
+        'use_hindsight_instructions': True,
+        'use_action_repair': True,
+        'delay_action_repair': True,
+        'use_negations_action_repair': False,
+        'camera_mode': 'ego',
+        'use_synonyms': False,
+    }
+    env_spec = gym.spec("PandaNLLift2-v0")
+    assert env_spec.max_episode_steps == 50
+    assert env_spec.kwargs['mode'] == 'default'
+    assert env_spec.kwargs['obs_type'] == 'state'
+    assert gym.spec("PandaNLGrasp2SizeShapePixelStaticSynonymsARND-v0").kwargs['camera_mode'] == 'static'
+    language_env_ids = [env_id for env_id in gym.envs.registry.keys() if env_id.startswith("PandaNL")]
+    assert len(language_env_ids) == 4800
+    for env_id in ["PandaNLLift1-v0", "PandaNLLift4-v0", "PandaNLLift2ARNHI-v0", "PandaNLGrasp2Unknown-v0"]:
+        assert env_id not in gym.envs.registry
+
+
+def test_finger_contacts():
+    env = gym.make("PandaNLLift3Color-v0")
+    unwrapped_env = env.unwrapped
+    sim, robot, task = unwrapped_env.sim, unwrapped_env.robot, unwrapped_env.task
+    env.reset(seed=0)
+    num_contacts = 0
+    for _ in range(100):
+        # move the gripper into the goal object to touch it with the fingers
+        action = np.zeros(env.action_space.shape)
+        goal_pos = np.array(sim.get_base_position(task.goal_object_body_key))
+        action[:3] = np.clip((goal_pos - robot.get_ee_position()) * 20, -1, 1)
+        env.step(action)
+        for obj_idx in task.obj_indices_selection:
+            obj_key = f"object{obj_idx}"
+            expected_contacts = [
+                bool(sim.bclient.getContactPoints(sim.get_object_id(obj_key), sim.get_object_id(robot.body_name),
+                                                  linkIndexB=finger_idx)) for finger_idx in robot.ee_joints[:2]
+            ]
+            assert list(task.get_contact_with_fingers(obj_key)) == expected_contacts
+            num_contacts += sum(expected_contacts)
+    assert num_contacts > 0
+    env.close()
@@ -1,5 +1,5 @@
 import numpy as np
-from lanro_gym.language_utils import parse_instructions, create_commands, Vocabulary, word_in_string
+from lanro_gym.language_utils import parse_instructions, create_commands, Vocabulary, word_in_string, InstructionSpace
 from lanro_gym.env_utils import SHAPES, RGBCOLORS
 
 
@@ -103,3 +103,28 @@ def test_vocabulary():
     assert vocab.word_to_idx("hello") == 1
     assert vocab.word_to_idx("sunny") == 2
     assert len(vocab) == 5
+
+
+def test_instruction_space():
+    instructions = create_commands("instruction", (RGBCOLORS.RED, SHAPES.CUBE), action_verbs=["pick", "tick"])
+    repairs = create_commands("repair", (RGBCOLORS.BLUE, SHAPES.CUBE))
+    instruction_space = InstructionSpace(instructions, repairs)
+    assert len(instruction_space) == 2 + 2 * 6
+    all_instructions = list(instruction_space)
+    assert len(set(all_instructions)) == len(instruction_space)
+    for idx, instruction in enumerate(all_instructions):
+        assert instruction_space[idx] == instruction
+        assert instruction_space.index(instruction) == idx
+        assert instruction in instruction_space
+    assert "pick the blue cube" not in instruction_space
+    assert parse_instructions(instruction_space) == parse_instructions(all_instructions)
+    # "no i meant the blue cube"
+    assert instruction_space.max_instruction_len == 4 + 6
+
+
+def test_instruction_space_without_repairs():
+    instructions = create_commands("instruction", (RGBCOLORS.RED, SHAPES.CUBE), action_verbs=["pick", "tick"])
+    instruction_space = InstructionSpace(instructions)
+    assert len(instruction_space) == 2
+    assert sorted(instruction_space) == sorted(instructions)
+    assert parse_instructions(instruction_space) == ({"pick", "tick", "the", "red", "cube"}, 4)
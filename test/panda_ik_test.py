@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from lanro_gym.simulation import PyBulletSimulation
+from lanro_gym.robots import Panda
+from lanro_gym.robots.panda_ik import (panda_forward_kinematics, panda_inverse_kinematics, PANDA_LOWER_LIMITS,
+                                       PANDA_UPPER_LIMITS)
+from lanro_gym.utils import quaternion_to_rotation_matrix
+
+
+def test_panda_forward_kinematics():
+    sim = PyBulletSimulation()
+    panda = Panda(sim)
+    joint_angles = np.random.default_rng(0).uniform(PANDA_LOWER_LIMITS, PANDA_UPPER_LIMITS, (10, 7))
+    positions, rotations = panda_forward_kinematics(joint_angles)
+    for angles, pos, rot in zip(joint_angles, positions, rotations):
+        sim.set_joint_angles(panda.body_name, panda.arm_joints, angles)
+        link_state = sim.get_link_state(panda.body_name, panda.ee_link)
+        base_pos, base_orn = sim.bclient.multiplyTransforms(*panda._world_to_link_base, link_state[4], link_state[5])
+        assert np.allclose(base_pos, pos, atol=1e-5)
+        assert np.allclose(quaternion_to_rotation_matrix(base_orn), rot, atol=1e-5)
+    sim.close()
+
+
+def test_panda_inverse_kinematics_round_trip():
+    sim = PyBulletSimulation()
+    panda = Panda(sim)
+    joint_angles = np.random.default_rng(0).uniform(PANDA_LOWER_LIMITS, PANDA_UPPER_LIMITS, (50, 7))
+    positions, rotations = panda_forward_kinematics(joint_angles)
+    # quaternions of the rotations via the simulation, in single precision
+    orientations = []
+    for angles in joint_angles:
+        sim.set_joint_angles(panda.body_name, panda.arm_joints, angles)
+        orientations.append(sim.bclient.multiplyTransforms(*panda._world_to_link_base, [0, 0, 0],
+                                                           sim.get_link_state(panda.body_name, panda.ee_link)[5])[1])
+    orientations = np.array(orientations)
+    for angles, pos, orn in zip(joint_angles, positions, orientations):
+        # the known q7 and the original angles as reference recover the original solution
+        assert np.allclose(panda_inverse_kinematics(pos, orn, angles[6], angles), angles, atol=1e-3)
+    # vectorized over targets with sampled values of q7
+    solutions = panda_inverse_kinematics(positions, orientations, np.linspace(-2.9, 2.9, 8), joint_angles)
+    solved = ~np.isnan(solutions[:, 0])
+    assert solved.mean() > 0.8
+    assert np.all(solutions[solved] >= PANDA_LOWER_LIMITS) and np.all(solutions[solved] <= PANDA_UPPER_LIMITS)
+    solved_positions, solved_rotations = panda_forward_kinematics(solutions[solved])
+    assert np.allclose(solved_positions, positions[solved], atol=1e-5)
+    assert np.allclose(solved_rotations, rotations[solved], atol=1e-5)
+    # out of reach
+    assert np.all(np.isnan(panda_inverse_kinematics([2, 0, 0], [1, 0, 0, 0], 0.0)))
+    sim.close()
+
+
+def test_panda_analytic_goto():
+    sim = PyBulletSimulation()
+    panda = Panda(sim, fixed_gripper=True, action_type='end_effector', ik_solver='analytic')
+    panda.reset()
+    target_pos = panda.get_ee_position() + [0.05, -0.05, -0.05]
+    joint_angles = panda.inverse_kinematics(target_pos, panda.default_arm_orn_RPY)
+    sim.set_joint_angles(panda.body_name, panda.arm_joints, joint_angles)
+    link_state = sim.get_link_state(panda.body_name, panda.ee_link)
+    assert np.allclose(link_state[4], target_pos, atol=1e-5)
+    assert abs(np.dot(link_state[5], panda.default_arm_orn_RPY)) > 1 - 1e-5
+    # batch of poses in the world frame
+    targets = target_pos + np.random.default_rng(0).uniform(-0.1, 0.1, (20, 3))
+    solutions = panda.analytic_inverse_kinematics(targets, np.broadcast_to(panda.default_arm_orn_RPY, (20, 4)))
+    assert solutions.shape == (20, 7) and not np.any(np.isnan(solutions))
+    with pytest.raises(ValueError):
+        Panda(sim, ik_solver='unknown')
+    sim.close()
@@ -1,3 +1,5 @@
+from collections import Counter
+import numpy as np
 from lanro_gym.simulation import PyBulletSimulation
 from lanro_gym.robots import Panda
 
@@ -45,3 +47,141 @@ def test_panda_robot_state_obs():
     assert panda2.get_obs().shape == (7, )
     assert panda3.get_obs().shape == (19, )
     assert panda4.get_obs().shape == (20, )
+
+
+def test_panda_gripper_rays():
+    sim = PyBulletSimulation()
+    panda = Panda(sim, full_state=False, fixed_gripper=False, tactile_rays=5)
+    # open the gripper
+    for finger_id in [panda.left_finger_id, panda.right_finger_id]:
+        sim.set_joint_angle(panda.body_name, finger_id, 0.04)
+    sim.create_box(body_name="box",
+                   half_extents=[0.005, 0.005, 0.005],
+                   mass=0.0,
+                   position=panda.get_link_position(panda.left_finger_id) / 2 +
+                   panda.get_link_position(panda.right_finger_id) / 2 - [0, 0, panda.gripper_obs_left_z_offset],
+                   rgba_color=[0, 0, 0, 1])
+    assert panda.get_obs().size == 7 + 5
+    assert panda.get_tactile_obs().shape == (5, )
+    assert panda.gripper_ray_obs()[0] == sim.get_object_id("box")
+    assert list(panda.get_gripper_ray_hits()) == [sim.get_object_id("box")]
+    # the fan hits the box in the center and passes above and below it
+    tactile_obs = panda.get_tactile_obs()
+    assert tactile_obs[2] < 1.0 and tactile_obs[0] == tactile_obs[-1] == 1.0
+    # all rays are cast at once and reused until the state changes
+    assert panda.gripper_ray_batch() is panda.gripper_ray_batch()
+
+
+class CountingClient:
+    """Wraps a bullet client and counts the calls of its functions"""
+
+    def __init__(self, bclient):
+        self.bclient = bclient
+        self.calls = Counter()
+
+    def __getattr__(self, name):
+        attribute = getattr(self.bclient, name)
+        if not callable(attribute):
+            return attribute
+
+        def counted(*args, **kwargs):
+            self.calls[name] += 1
+            return attribute(*args, **kwargs)
+
+        return counted
+
+
+def test_panda_obs_call_count():
+    for use_cache in [True, False]:
+        sim = PyBulletSimulation(use_cache=use_cache)
+        panda = Panda(sim, full_state=True, fixed_gripper=False)
+        sim.bclient = CountingClient(sim.bclient)
+        for _ in range(3):
+            sim.step()
+            sim.bclient.calls.clear()
+            panda.get_obs()
+            assert sim.bclient.calls == {"getLinkState": 1, "getJointStates": 1, "getEulerFromQuaternion": 1}
+
+
+def test_panda_reset():
+    sim = PyBulletSimulation()
+    panda = Panda(sim, full_state=True, fixed_gripper=False)
+    sim.set_joint_angles(panda.body_name, panda.reset_joints, np.ones(len(panda.reset_joints)) * 0.02)
+    panda.reset()
+    assert np.allclose(panda.get_joint_angles(), panda.NEUTRAL_JOINT_VALUES + panda.NEUTRAL_FINGER_VALUES)
+    # noise on the arm joints within the joint limits
+    panda.joint_reset_noise = 0.1
+    panda.reset(np.random.default_rng(0))
+    noisy_angles = panda.get_current_pos()
+    assert not np.allclose(noisy_angles, panda.NEUTRAL_JOINT_VALUES)
+    assert np.all(np.abs(noisy_angles - panda.NEUTRAL_JOINT_VALUES) <= 0.1)
+    assert np.all(noisy_angles >= panda.arm_lower_limits) and np.all(noisy_angles <= panda.arm_upper_limits)
+    assert np.allclose(panda.get_joint_angles()[-2:], panda.NEUTRAL_FINGER_VALUES)
+    panda.reset(np.random.default_rng(0))
+    assert np.allclose(panda.get_current_pos(), noisy_angles)
+
+
+def test_panda_inverse_kinematics():
+    sim = PyBulletSimulation()
+    panda = Panda(sim, fixed_gripper=True, action_type='end_effector', ik_max_iterations=20, ik_residual_threshold=1e-4)
+    assert panda.ik_max_iterations == 20 and panda.ik_residual_threshold == 1e-4
+    panda.reset()
+    target_pos = panda.get_ee_position() + [0.02, -0.02, -0.02]
+    joint_angles = panda.inverse_kinematics(target_pos, panda.default_arm_orn_RPY)
+    assert joint_angles.shape == (panda.num_DOF, )
+    # a warm start from the read joint angles gives the same solution
+    panda.ik_warm_start = True
+    assert np.allclose(panda.inverse_kinematics(target_pos, panda.default_arm_orn_RPY), joint_angles, atol=1e-3)
+    sim.set_joint_angles(panda.body_name, panda.arm_joints, joint_angles)
+    assert np.linalg.norm(panda.get_ee_position() - target_pos) < 0.01
+
+
+def test_panda_end_effector_dls():
+    sim = PyBulletSimulation()
+    panda = Panda(sim, fixed_gripper=True, action_type='end_effector_dls')
+    assert panda.action_space.shape == (3, )
+    panda.reset()
+    ee_state = sim.get_link_state(panda.body_name, panda.ee_link)
+    target_pos = panda.get_ee_position() + [0.01, -0.01, -0.01]
+    joint_angles = panda.dls_joint_poses(np.array([0.01, -0.01, -0.01, 0, 0, 0]), ee_state)
+    assert joint_angles.shape == (panda.num_DOF, )
+    assert np.all(joint_angles >= panda.arm_lower_limits) and np.all(joint_angles <= panda.arm_upper_limits)
+    sim.set_joint_angles(panda.body_name, panda.arm_joints, joint_angles)
+    assert np.linalg.norm(panda.get_ee_position() - target_pos) < 0.002
+    # the end effector follows relative actions
+    panda.reset()
+    start_pos = panda.get_ee_position()
+    for _ in range(20):
+        panda.set_action(np.array([0, 0, 1]))
+        sim.step()
+    assert panda.get_ee_position()[2] - start_pos[2] > 0.1
+
+
+def test_panda_ik_cache():
+    sim = PyBulletSimulation()
+    panda = Panda(sim, fixed_gripper=True, action_type='end_effector', ik_cache_size=2)
+    panda.reset()
+    target_pos = panda.get_ee_position() + [0.02, -0.02, -0.02]
+    solution = panda.cached_inverse_kinematics(target_pos, panda.default_arm_orn_RPY)
+    assert np.allclose(solution, panda.inverse_kinematics(target_pos, panda.default_arm_orn_RPY))
+    # the same target from the same joint angles is a hit
+    assert np.array_equal(panda.cached_inverse_kinematics(target_pos, panda.default_arm_orn_RPY), solution)
+    assert panda.ik_cache.get_stats() == {'hits': 1, 'misses': 1, 'warm_starts': 0, 'size': 1, 'hit_rate': 0.5}
+    # hits return copies, changing them does not change the cached solution
+    panda.cached_inverse_kinematics(target_pos, panda.default_arm_orn_RPY)[:] = 0
+    assert np.array_equal(panda.cached_inverse_kinematics(target_pos, panda.default_arm_orn_RPY), solution)
+    # a close target is a miss, seeded with the closest cached solution
+    panda.cached_inverse_kinematics(target_pos + 0.005, panda.default_arm_orn_RPY)
+    assert panda.ik_cache.misses == 2 and panda.ik_cache.warm_starts == 1
+    # the least recently used solution is evicted
+    panda.cached_inverse_kinematics(target_pos, panda.default_arm_orn_RPY)
+    panda.cached_inverse_kinematics(target_pos - 0.005, panda.default_arm_orn_RPY)
+    assert len(panda.ik_cache) == 2
+    panda.cached_inverse_kinematics(target_pos, panda.default_arm_orn_RPY)
+    assert panda.ik_cache.hits == 5
+    panda.cached_inverse_kinematics(target_pos + 0.005, panda.default_arm_orn_RPY)
+    assert panda.ik_cache.hits == 5 and panda.ik_cache.misses == 4
+    # goto uses the cache
+    panda.set_action(np.zeros(3))
+    assert panda.ik_cache.misses == 5
+    sim.close()
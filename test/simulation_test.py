@@ -1,5 +1,6 @@
+import pytest
 import numpy as np
-from lanro_gym.simulation import PyBulletSimulation
+from lanro_gym.simulation import PyBulletSimulation, TiledSimulation
 
 
 def test_init_step_close():
@@ -71,3 +72,83 @@ def test_get_link_state():
     sim = PyBulletSimulation()
     sphere_id = sim.create_sphere("test", 0.5, 1.0, [0, 0, 0], [1, 0, 0, 1])
     assert sim.get_link_state("test", 0) == None
+
+
+def test_get_bodies_state():
+    sim = PyBulletSimulation()
+    sim.create_box("box", [0.5, 0.5, 0.5], 1.0, [1, 2, 3], [1, 0, 0, 0])
+    sim.create_sphere("sphere", 0.5, 1.0, [4, 5, 6], [1, 0, 0, 1])
+    sim.step()
+    bodies_state = sim.get_bodies_state(["box", "sphere"])
+    assert bodies_state.shape == (2, 16)
+    for body, body_state in zip(["box", "sphere"], bodies_state):
+        assert np.allclose(body_state[:3], sim.get_base_position(body))
+        assert np.allclose(body_state[3:6], sim.get_base_rotation(body))
+        assert np.allclose(body_state[6:9], sim.get_base_velocity(body))
+        assert np.allclose(body_state[9:12], sim.get_base_angular_velocity(body))
+        assert np.allclose(body_state[12:], sim.get_base_orientation(body))
+    sim.close()
+
+
+def test_query_cache():
+    sim = PyBulletSimulation()
+    sim.create_box("box", [0.5, 0.5, 0.5], 1.0, [0, 0, 1], [1, 0, 0, 0])
+    sim.reset_cache_stats()
+    assert sim.get_base_position("box") == (0, 0, 1)
+    assert sim.get_base_orientation("box") == (0, 0, 0, 1)
+    assert sim.get_cache_stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+    sim.set_base_pose("box", [2, 2, 2], [0, 0, 0, 1])
+    assert sim.get_base_position("box") == (2, 2, 2)
+    sim.step()
+    assert sim.get_base_position("box") != (2, 2, 2)
+    assert sim.get_cache_stats()["misses"] == 3
+    # changing the dynamics or constraints through the simulation drops memoized queries
+    sim.set_lateral_friction("box", -1, 0.5)
+    sim.get_base_position("box")
+    sim.set_spinning_friction("box", -1, 0.01)
+    sim.get_base_position("box")
+    sim.create_constraint("box", -1, "box", -1, sim.bclient.JOINT_FIXED, [0, 0, 0], [0, 0, 0], [0, 0, 0], maxForce=10)
+    sim.get_base_position("box")
+    assert sim.get_cache_stats()["misses"] == 6
+    sim.close()
+
+
+def test_query_cache_disabled():
+    sim = PyBulletSimulation(use_cache=False)
+    sim.create_box("box", [0.5, 0.5, 0.5], 1.0, [0, 0, 1], [1, 0, 0, 0])
+    sim.get_base_position("box")
+    sim.get_base_position("box")
+    assert sim.get_cache_stats() == {"hits": 0, "misses": 0, "hit_rate": 0.0}
+    sim.close()
+
+
+def test_save_restore_state():
+    sim = PyBulletSimulation()
+    sim.create_box("box", [0.5, 0.5, 0.5], 1.0, [0, 0, 1], [1, 0, 0, 0])
+    state_id = sim.save_state()
+    sim.set_base_pose("box", [2, 2, 2], [0, 0, 0, 1])
+    sim.create_sphere("sphere", 0.5, 1.0, [0, 0, 0], [1, 0, 0, 1])
+    sim.restore_state(state_id)
+    assert sim.get_base_position("box") == (0, 0, 1)
+    assert "sphere" not in sim._bodies_idx
+    sim.remove_body("box")
+    with pytest.raises(ValueError):
+        sim.restore_state(state_id)
+    sim.close()
+
+
+def test_tiled_simulation():
+    # the cells overlap, their boxes fall through each other as cells do not collide
+    world = TiledSimulation(num_cells=2, cell_spacing=0.5)
+    for cell in world.cells:
+        cell.create_box("test_box", [0.5, 0.5, 0.5], 1.0, [0, 0, 0.5], [1, 0, 0, 0])
+    box_ids = [cell.get_object_id("test_box") for cell in world.cells]
+    assert world.bclient.getBasePositionAndOrientation(box_ids[1])[0] == (0.5, 0, 0.5)
+    for _ in range(5):
+        world.cells[0].step()
+    positions = [cell.get_base_position("test_box") for cell in world.cells]
+    assert np.allclose(positions[0], positions[1])
+    assert np.allclose(positions[0][:2], [0, 0]) and positions[0][2] < 0.5
+    with pytest.raises(NotImplementedError):
+        world.cells[0].save_state()
+    world.close()
@@ -1,8 +1,10 @@
+import itertools
 import numpy as np
-from lanro_gym.env_utils import RGBCOLORS, SHAPES, TaskObject, valid_task_object_combination, dummys_not_goal_props
+import pytest
+from lanro_gym.env_utils import RGBCOLORS, SHAPES, TaskObject, TaskObjectList, valid_task_object_combination, dummys_not_goal_props, distinguishable_by_primary_or_secondary
 from lanro_gym.env_utils.object_properties import WEIGHTS
 from lanro_gym.simulation import PyBulletSimulation
-from lanro_gym.utils import goal_distance, scale_rgb, get_one_hot_list, get_prop_combinations, expand_enums, get_random_enum_with_exceptions
+from lanro_gym.utils import goal_distance, scale_rgb, get_one_hot_list, get_prop_combinations, expand_enums, get_random_enum_with_exceptions, sample_separated_positions, quaternion_multiply, quaternion_conjugate, quaternion_to_rotation_vector
 
 
 def test_get_prop_combinations():
@@ -168,3 +170,64 @@ def test_dummys_not_goal_primary():
     task_obj5 = TaskObject(sim, primary=SHAPES.CUBOID, onehot_idx=0)
     # 1: red cube and cuboid dummy
     assert dummys_not_goal_props(task_obj1, task_obj5)
+
+
+def test_quaternions():
+    sim = PyBulletSimulation()
+    quat1 = sim.get_quaternion_from_euler([0.3, -0.2, 0.5])
+    quat2 = sim.get_quaternion_from_euler([0.1, 0.4, -0.3])
+    assert np.allclose(quaternion_multiply(quat1, quat2),
+                       sim.bclient.multiplyTransforms([0, 0, 0], quat1, [0, 0, 0], quat2)[1],
+                       atol=1e-6)
+    assert np.allclose(quaternion_multiply(quat1, quaternion_conjugate(quat1)), [0, 0, 0, 1])
+    rotation = sim.bclient.getQuaternionFromAxisAngle([0, 1, 0], 0.5)
+    assert np.allclose(quaternion_to_rotation_vector(rotation), [0, 0.5, 0], atol=1e-6)
+    assert np.allclose(quaternion_to_rotation_vector(-np.array(rotation)), [0, 0.5, 0], atol=1e-6)
+    assert np.allclose(quaternion_to_rotation_vector([0, 0, 0, 1]), 0)
+    sim.close()
+
+
+def test_sample_separated_positions():
+    np_random = np.random.default_rng(0)
+    low, high = np.array([-0.15, -0.15, 0]), np.array([0.15, 0.15, 0])
+    # from sparse layouts solved by rejection sampling to dense layouts solved by the grid
+    for num_positions in range(1, 10):
+        for _ in range(20):
+            positions = sample_separated_positions(np_random, low, high, num_positions, 0.12)
+            assert positions.shape == (num_positions, 3)
+            assert np.all(positions >= low) and np.all(positions <= high)
+            for pos1, pos2 in itertools.combinations(positions, 2):
+                assert goal_distance(pos1, pos2) > 0.12
+    with pytest.raises(ValueError):
+        sample_separated_positions(np_random, low, high, 10, 0.12)
+
+
+def test_sample_valid_selection():
+    sim = PyBulletSimulation()
+    obj_list = TaskObjectList(sim, color_mode=True, shape_mode=True, size_mode=True)
+    np_random = np.random.default_rng(0)
+    for num_obj in [2, 3, 4]:
+        for unique in [False, True]:
+            for _ in range(50):
+                selection, goal_obj_idx = obj_list.sample_valid_selection(np_random, num_obj, unique=unique)
+                assert len(set(selection)) == num_obj
+                assert goal_obj_idx in selection
+                non_goal_indices = [idx for idx in selection if idx != goal_obj_idx]
+                for non_goal_idx in non_goal_indices:
+                    assert valid_task_object_combination(obj_list[goal_obj_idx], obj_list[non_goal_idx])
+                if unique:
+                    objs = [obj_list[goal_obj_idx]] + [obj_list[idx] for idx in non_goal_indices]
+                    for obj1, obj2 in itertools.combinations(objs, 2):
+                        assert distinguishable_by_primary_or_secondary(obj1, obj2)
+
+
+def test_shared_catalog_tables():
+    sim = PyBulletSimulation()
+    obj_list = TaskObjectList(sim, color_mode=True, shape_mode=True)
+    other_obj_list = TaskObjectList(sim, color_mode=True, shape_mode=True)
+    # the matrices are computed once per process and cannot be modified
+    assert other_obj_list.compatibility_matrix is obj_list.compatibility_matrix
+    assert not obj_list.compatibility_matrix.flags.writeable
+    assert other_obj_list.get_sentences(0, "repair") is obj_list.get_sentences(0, "repair")
+    assert TaskObjectList(sim, color_mode=True).compatibility_matrix.shape != obj_list.compatibility_matrix.shape
+    sim.close()
@@ -0,0 +1,122 @@
+import functools
+import gymnasium as gym
+import numpy as np
+import pytest
+from lanro_gym import vector
+
+ENV_ID = "PandaNLReach2HI-v0"
+
+
+def make_hindsight_env():
+    """Environment that creates a hindsight instruction and terminates on every step"""
+    env = gym.make(ENV_ID, max_episode_steps=3)
+
+    def compute_reward():
+        env.unwrapped.task.generate_hindsight_instruction(env.unwrapped.task.goal_obj_idx)
+        return -10.0
+
+    env.unwrapped.compute_reward = compute_reward
+    return env
+
+
+def test_shared_memory_vector_env():
+    env_fns = [functools.partial(gym.make, ENV_ID, max_episode_steps=3), make_hindsight_env]
+    envs = [env_fn() for env_fn in env_fns]
+    vec_env = vector.SharedMemoryVectorEnv(env_fns)
+    assert vec_env.observation_space["observation"].shape == (2, ) + envs[0].observation_space["observation"].shape
+    obs, infos = vec_env.reset(seed=0)
+    for index, env in enumerate(envs):
+        env_obs, env_info = env.reset(seed=index)
+        for key in obs:
+            assert np.array_equal(obs[key][index], env_obs[key])
+        assert infos["is_success"][index] == env_info["is_success"]
+    actions = np.random.default_rng(0).uniform(-1, 1, (4, 2) + envs[0].action_space.shape).astype(np.float32)
+    # resets without seed are random, so the environments are compared up to their first auto-reset
+    in_sync = [True, True]
+    for step_actions in actions:
+        obs, rewards, terminations, truncations, infos = vec_env.step(step_actions)
+        # the info of an auto-reset is the reset info, which contains no hindsight instruction
+        assert np.all(infos["_is_success"]) and "hindsight_instruction" not in infos
+        final_info = infos["final_info"]
+        for index, env in enumerate(envs):
+            if not in_sync[index]:
+                continue
+            env_obs, env_reward, env_terminated, env_truncated, env_info = env.step(step_actions[index])
+            assert rewards[index] == env_reward
+            assert terminations[index] == env_terminated and truncations[index] == env_truncated
+            assert infos["_final_observation"][index] == (env_terminated or env_truncated)
+            if env_terminated or env_truncated:
+                for key in obs:
+                    assert np.array_equal(infos["final_observation"][key][index], env_obs[key])
+                assert final_info["is_success"][index] == env_info["is_success"]
+                in_sync[index] = False
+            else:
+                for key in obs:
+                    assert np.array_equal(obs[key][index], env_obs[key])
+                assert infos["is_success"][index] == env_info["is_success"]
+            if index == 1:
+                assert np.array_equal(final_info["hindsight_instruction"][1], env_info["hindsight_instruction"])
+        # hindsight instructions are only reported by the second environment, which terminates on every step
+        assert np.array_equal(final_info["_hindsight_instruction"], [False, True])
+        assert np.array_equal(final_info["_hindsight_instruction_language"], [False, True])
+        assert final_info["hindsight_instruction_language"][1] == envs[1].unwrapped.decode_instruction(
+            final_info["hindsight_instruction"][1])
+    assert not any(in_sync)
+    assert vec_env.call("get_max_instruction_len") == [env.unwrapped.get_max_instruction_len() for env in envs]
+    vec_env.close()
+    for env in envs:
+        env.close()
+
+
+def make_failing_env():
+    env = gym.make(ENV_ID)
+
+    def compute_reward():
+        raise ValueError("reward")
+
+    env.unwrapped.compute_reward = compute_reward
+    return env
+
+
+def test_shared_memory_vector_env_worker_error():
+    vec_env = vector.SharedMemoryVectorEnv([functools.partial(gym.make, ENV_ID), make_failing_env])
+    vec_env.reset(seed=0)
+    actions = np.zeros(vec_env.action_space.shape, dtype=np.float32)
+    with pytest.raises(RuntimeError, match="Worker 1 failed"):
+        vec_env.step(actions)
+    with pytest.raises(gym.error.ClosedEnvironmentError):
+        vec_env.step(actions)
+    vec_env.close()
+
+
+def test_tiled_vector_env():
+    env_id = "PandaPush-v0"
+    envs = [gym.make(env_id, max_episode_steps=3) for _ in range(2)]
+    vec_env = vector.make_tiled(env_id, num_envs=2, max_episode_steps=3)
+    obs, _ = vec_env.reset(seed=0)
+    for index, env in enumerate(envs):
+        env_obs, _ = env.reset(seed=index)
+        for key in obs:
+            assert np.allclose(obs[key][index], env_obs[key], atol=1e-6)
+    actions = np.random.default_rng(0).uniform(-1, 1, (3, 2) + envs[0].action_space.shape).astype(np.float32)
+    for step_actions in actions:
+        obs, rewards, terminations, truncations, infos = vec_env.step(step_actions)
+        for index, env in enumerate(envs):
+            env_obs, env_reward, env_terminated, env_truncated, _ = env.step(step_actions[index])
+            assert rewards[index] == env_reward
+            assert terminations[index] == env_terminated and truncations[index] == env_truncated
+            # the observation of the last step is the final observation of an auto-reset
+            step_obs = infos["final_observation"] if env_terminated or env_truncated else obs
+            for key in obs:
+                assert np.allclose(step_obs[key][index], env_obs[key], atol=1e-6)
+    # episodes are truncated after `max_episode_steps`
+    assert np.all(truncations) and np.all(infos["_final_observation"])
+    assert vec_env.call("_elapsed_steps") == [0, 0]
+    vec_env.close()
+    for env in envs:
+        env.close()
+
+
+def test_tiled_vector_env_snapshot_reset():
+    with pytest.raises(ValueError, match="snapshot resets"):
+        vector.make_tiled("PandaReach-v0", num_envs=2, snapshot_reset=True)